@@ -0,0 +1,9 @@
+"""
+Benchmark suite for the microgrid simulator.
+
+Run from backend/:
+
+    python -m benchmarks                      # time every case
+    python -m benchmarks --save               # store a JSON baseline
+    python -m benchmarks --compare            # flag regressions against it
+"""
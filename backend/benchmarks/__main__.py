@@ -0,0 +1,70 @@
+"""
+Benchmark command line.
+
+Usage (from backend/):
+    python -m benchmarks [--group NAME ...] [-k SUBSTRING] [--repeat N]
+                         [--min-time SECONDS] [--save [PATH]] [--compare [PATH]]
+                         [--threshold FRACTION]
+
+Exits with status 1 when --compare finds a regression.
+"""
+
+import argparse
+import os
+import sys
+
+from benchmarks.cases import GROUPS
+from benchmarks.harness import (
+    compare, format_comparison, format_results, format_time, load_results, run_suite, save_results
+)
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Microgrid simulator benchmarks")
+    parser.add_argument("--group", action="append", choices=sorted(GROUPS),
+                        help="Benchmark group to run (repeatable; default: all)")
+    parser.add_argument("-k", dest="keyword", help="Only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed rounds per case (default 5)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per round (default 0.2)")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, metavar="PATH",
+                        help="Write results as a JSON baseline (default benchmarks/baseline.json)")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, metavar="PATH",
+                        help="Compare against a JSON baseline (default benchmarks/baseline.json)")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative slowdown reported as a regression (default 0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    cases = [case for name in (args.group or GROUPS) for case in GROUPS[name]()]
+    if args.keyword:
+        cases = [case for case in cases if args.keyword in case.name]
+    if not cases:
+        parser.error("no benchmarks selected")
+
+    def report(name, result):
+        print(f"  {name:<36} {format_time(result['median']):>10}", file=sys.stderr)
+
+    results = run_suite(cases, repeat=args.repeat, min_time=args.min_time, progress=report)
+    print(format_results(results))
+
+    if args.save:
+        save_results(results, args.save)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        rows = compare(results, load_results(args.compare), args.threshold)
+        # Only judge the cases that were run
+        rows = [row for row in rows if row["status"] != "missing"]
+        print(f"\nAgainst {args.compare} (threshold {args.threshold:.0%}):")
+        print(format_comparison(rows))
+        regressions = [row["name"] for row in rows if row["status"] == "regression"]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Benchmark Cases
+Component, engine and API benchmarks for the microgrid simulator.
+
+Layers, from the innermost loop outwards:
+- battery: Battery.charge / discharge step throughput
+- scheduler: RuleBasedScheduler.schedule_hour over a day
+- simulation: run_simulation (legacy) and the vectorized engine for
+  1-day, 1-year and sub-hourly horizons
+- api: POST /simulate through an in-process ASGI client, uncached and
+  served from the result cache
+- startup: cold start of the API in a fresh interpreter (import main,
+  and import main plus the first POST /simulate)
+
+main (FastAPI and every subsystem) is imported only by the groups that
+need it, so component benchmarks run without the app.
+"""
+
+import asyncio
+from typing import List
+
+from benchmarks.harness import Case
+from models.battery import Battery
+from scheduler.rule_engine import RuleBasedScheduler
+from data.load_profile import get_load_profile
+from data.solar_profile import get_solar_profile
+from data.price_profile import get_price_profile
+
+
+# Battery charge/discharge pairs per call
+BATTERY_CYCLES = 500
+
+# (name suffix, horizon_days, timestep_minutes) per simulation benchmark
+SIMULATION_HORIZONS = (
+    ("1d", 1, 60),
+    ("1y", 365, 60),
+    ("1d.5min", 1, 5),
+    ("30d.15min", 30, 15)
+)
+
+
+def battery_cases() -> List[Case]:
+    """Battery step throughput."""
+    battery = Battery(capacity=10.0)
+
+    def cycle():
+        battery.reset(0.5)
+        for _ in range(BATTERY_CYCLES):
+            battery.charge(1.0)
+            battery.discharge(1.0)
+
+    return [Case("battery.charge_discharge", cycle, units=2 * BATTERY_CYCLES, unit="step")]
+
+
+def scheduler_cases() -> List[Case]:
+    """Rule-based decisions for one day, with and without explanations."""
+    loads = get_load_profile()
+    solars = get_solar_profile()
+    prices = get_price_profile()
+    scheduler = RuleBasedScheduler(price_profile=prices)
+    battery = Battery(capacity=10.0)
+
+    def day(explain: bool):
+        def run():
+            battery.reset(0.5)
+            for hour in range(24):
+                scheduler.schedule_hour(
+                    hour, loads[hour], solars[hour], battery, prices[hour],
+                    explain=explain, legacy_fields=explain
+                )
+        return run
+
+    return [
+        Case("scheduler.schedule_hour", day(True), units=24, unit="step"),
+        Case("scheduler.schedule_hour.numeric", day(False), units=24, unit="step")
+    ]
+
+
+def simulation_cases() -> List[Case]:
+    """Full simulations on both engines."""
+    from main import SimulationRequest, run_simulation, run_simulation_vectorized
+
+    cases = []
+    for suffix, days, minutes in SIMULATION_HORIZONS:
+        request = SimulationRequest(horizon_days=days, timestep_minutes=minutes)
+        steps = days * 24 * 60 // minutes
+        cases.append(Case(
+            f"simulation.legacy.{suffix}", lambda request=request: run_simulation(request),
+            units=steps, unit="step"
+        ))
+        cases.append(Case(
+            f"simulation.vectorized.{suffix}", lambda request=request: run_simulation_vectorized(request),
+            units=steps, unit="step"
+        ))
+    return cases
+
+
+def api_cases() -> List[Case]:
+    """POST /simulate through httpx's in-process ASGI transport (no sockets)."""
+    import httpx
+    from main import app
+    from simulator.cache import configure_cache
+    from simulator.executor import configure_executor
+
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark")
+
+    def post(payload: dict):
+        def run():
+            response = loop.run_until_complete(client.post("/simulate", json=payload))
+            if response.status_code != 200:
+                raise RuntimeError(f"/simulate returned {response.status_code}: {response.text[:200]}")
+        return run
+
+    def uncached():
+        configure_executor(0)
+        configure_cache(0)
+
+    def cached():
+        configure_executor(0)
+        configure_cache(128)
+
+    return [
+        Case("api.simulate.1d", post({}), unit="request", setup=uncached),
+        Case("api.simulate.1d.uncertainty", post({"enable_weather_uncertainty": True, "seed": 7}),
+             unit="request", setup=uncached),
+        Case("api.simulate.1d.legacy", post({"engine": "legacy"}), unit="request", setup=uncached),
+        Case("api.simulate.30d.columnar", post({"horizon_days": 30, "response_format": "columnar"}),
+             unit="request", setup=uncached),
+        Case("api.simulate.1d.cached", post({}), unit="request", setup=cached)
+    ]
+
+
+def startup_cases() -> List[Case]:
+    """Cold starts, one fresh process per call (times include interpreter start)."""
+    from benchmarks.coldstart import run_probe
+
+    return [
+        Case("startup.import", lambda: run_probe(first_request=False), unit="process"),
+        Case("startup.first_request", run_probe, unit="process")
+    ]
+
+
+# Benchmark groups by layer
+GROUPS = {
+    "battery": battery_cases,
+    "scheduler": scheduler_cases,
+    "simulation": simulation_cases,
+    "api": api_cases,
+    "startup": startup_cases
+}
+
+
+def all_cases() -> List[Case]:
+    """Every benchmark, innermost layer first."""
+    return [case for build in GROUPS.values() for case in build()]
@@ -0,0 +1,247 @@
+"""
+Cold Start
+Startup time of the API in fresh interpreters, and where it goes.
+
+A serverless deployment pays for interpreter start, `import main` (the
+app factory, FastAPI and every eagerly imported subsystem) and the
+first request (building the request and response validators that are
+deferred at import) before the first dashboard load is answered. Each
+measurement runs in a new process so nothing is already imported.
+
+The import profile comes from `python -X importtime`: per-module self
+and cumulative import times, plus self time summed per top-level
+package, so a slow new import shows up by name.
+
+Usage (from backend/):
+    python -m benchmarks.coldstart                 # timings and import profile
+    python -m benchmarks.coldstart --runs 10 --top 25
+    python -m benchmarks.coldstart --json
+
+The startup benchmark group (python -m benchmarks --group startup)
+times the same probe for baselines and regression checks.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in a fresh interpreter: import the app, then send it one POST /simulate
+# (the dashboard's first request) straight through ASGI, without an HTTP client
+PROBE = """
+import time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+if FIRST_REQUEST:
+    import asyncio
+    import json
+
+    async def request():
+        status = []
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "POST", "scheme": "http", "path": "/simulate", "raw_path": b"/simulate",
+            "root_path": "", "query_string": b"", "headers": [(b"content-type", b"application/json")],
+            "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 80)
+        }
+
+        async def receive():
+            return {"type": "http.request", "body": b"{}", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+
+        await main.app(scope, receive, send)
+        return status[0]
+
+    status = asyncio.run(request())
+    if status != 200:
+        raise SystemExit(f"POST /simulate returned {status}")
+done = time.perf_counter()
+print(json.dumps({"import": imported - start, "first_request": done - imported}) if FIRST_REQUEST
+      else '{"import": %r}' % (imported - start))
+"""
+
+# Modules listed by `python -X importtime`: "import time: self | cumulative | name"
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+def run_probe(first_request: bool = True, env: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Start a fresh interpreter that imports main and (optionally) serves one request.
+
+    Args:
+        first_request: Also send POST /simulate once the app is imported
+        env: Extra environment variables for the process
+
+    Returns:
+        Dictionary with import, first_request (when sent) and process
+        (wall time from spawn to exit, including interpreter start) in seconds
+    """
+    code = f"FIRST_REQUEST = {first_request!r}\n{PROBE}"
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True,
+        env={**os.environ, **(env or {})}
+    )
+    elapsed = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"Cold-start probe failed: {completed.stderr.strip()[-500:]}")
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    timings["process"] = elapsed
+    return timings
+
+
+def measure_cold_start(runs: int = 5, env: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Time several cold starts.
+
+    Args:
+        runs: Fresh processes to start
+        env: Extra environment variables for the processes
+
+    Returns:
+        Dictionary with runs and, per phase (import, first_request,
+        process), the median and min in seconds
+    """
+    samples = [run_probe(env=env) for _ in range(runs)]
+    return {
+        "runs": runs,
+        "phases": {
+            phase: {
+                "median": statistics.median(sample[phase] for sample in samples),
+                "min": min(sample[phase] for sample in samples)
+            }
+            for phase in ("import", "first_request", "process")
+        }
+    }
+
+
+def import_profile(module: str = "main") -> List[Dict]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module: Module to import
+
+    Returns:
+        One row per imported module, in import completion order, with
+        name, depth (0 = imported by the command itself), self and
+        cumulative import time in seconds
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed: {completed.stderr.strip()[-500:]}")
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            rows.append({
+                "name": match.group(4),
+                "depth": len(match.group(3)) // 2,
+                "self": int(match.group(1)) / 1e6,
+                "cumulative": int(match.group(2)) / 1e6
+            })
+    return rows
+
+
+def summarize_profile(rows: List[Dict], module: str = "main", top: int = 15) -> Dict:
+    """
+    Condense an import profile.
+
+    Args:
+        rows: Output of import_profile()
+        module: Module the profile was taken for
+        top: Entries per list
+
+    Returns:
+        Dictionary with total (cumulative time of the module), the
+        module's own direct imports by cumulative time, modules by
+        self time, and self time summed per top-level package
+    """
+    target = next((row for row in rows if row["name"] == module), None)
+    by_package: Dict[str, float] = {}
+    for row in rows:
+        package = row["name"].split(".")[0]
+        by_package[package] = by_package.get(package, 0.0) + row["self"]
+
+    # Direct imports of the module are listed one level deeper, before it
+    direct = []
+    if target is not None:
+        index = rows.index(target)
+        for row in reversed(rows[:index]):
+            if row["depth"] <= target["depth"]:
+                break
+            if row["depth"] == target["depth"] + 1:
+                direct.append(row)
+
+    def ranked(items: List[Dict], key: str) -> List[Dict]:
+        return sorted(items, key=lambda row: row[key], reverse=True)[:top]
+
+    return {
+        "module": module,
+        "total": target["cumulative"] if target is not None else None,
+        "direct_imports": ranked(direct, "cumulative"),
+        "slowest_modules": ranked(rows, "self"),
+        "packages": dict(sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top])
+    }
+
+
+def format_report(cold_start: Dict, profile: Dict) -> str:
+    """Cold-start timings and import profile as text."""
+    lines = [f"Cold start (median of {cold_start['runs']} fresh processes)"]
+    lines.append(f"{'phase':<16} {'median':>10} {'min':>10}")
+    for phase, stats in cold_start["phases"].items():
+        lines.append(f"{phase:<16} {stats['median'] * 1000:>8.1f}ms {stats['min'] * 1000:>8.1f}ms")
+
+    lines.append("")
+    lines.append(f"import {profile['module']}: {profile['total'] * 1000:.1f}ms")
+    lines.append(f"\n{'direct import':<44} {'cumulative':>10}")
+    for row in profile["direct_imports"]:
+        lines.append(f"{row['name']:<44} {row['cumulative'] * 1000:>8.1f}ms")
+    lines.append(f"\n{'package':<44} {'self':>10}")
+    for package, seconds in profile["packages"].items():
+        lines.append(f"{package:<44} {seconds * 1000:>8.1f}ms")
+    lines.append(f"\n{'module':<44} {'self':>10}")
+    for row in profile["slowest_modules"]:
+        lines.append(f"{row['name']:<44} {row['self'] * 1000:>8.1f}ms")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.coldstart",
+                                     description="Cold-start time and import profile of the API")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes to time (default 5)")
+    parser.add_argument("--top", type=int, default=15, help="Entries per profile list (default 15)")
+    parser.add_argument("--module", default="main", help="Module to profile (default main)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    # Compile bytecode first, as a deployment would ship it, so the first run isn't an outlier
+    import_profile(args.module)
+    cold_start = measure_cold_start(args.runs)
+    profile = summarize_profile(import_profile(args.module), args.module, args.top)
+
+    if args.json:
+        print(json.dumps({"cold_start": cold_start, "import_profile": profile}, indent=2))
+    else:
+        print(format_report(cold_start, profile))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
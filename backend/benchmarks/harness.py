@@ -0,0 +1,254 @@
+"""
+Benchmark Harness
+Timing, JSON baselines and regression checks for the benchmark suite.
+
+Each case is timed like timeit: the number of calls per round is
+calibrated so a round lasts at least min_time, garbage collection is
+off during rounds, and the per-call time of every round is kept. Random
+sources are reseeded before each case so every run does the same work.
+Results are compared on the median per-call time.
+"""
+
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+
+class Case:
+    """
+    One benchmark.
+
+    Attributes:
+        name: Dotted name, e.g. "simulation.legacy.1d"
+        fn: Function timed per call
+        units: Units of work per call (e.g. 24 time steps)
+        unit: Name of one unit of work
+        setup: Optional function run once before timing (not timed)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[], object],
+        units: int = 1,
+        unit: str = "call",
+        setup: Optional[Callable[[], object]] = None
+    ):
+        self.name = name
+        self.fn = fn
+        self.units = units
+        self.unit = unit
+        self.setup = setup
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, min_time: float = 0.2) -> Dict:
+    """
+    Time a function.
+
+    Args:
+        fn: Function to time
+        repeat: Timed rounds
+        min_time: Minimum duration of one round (s)
+
+    Returns:
+        Dictionary with number (calls per round), repeat and per-call
+        min, median, mean and stdev (s)
+    """
+    fn()  # warm-up (imports, caches, lazily built state)
+
+    number = 1
+    while True:
+        elapsed = _round(fn, number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.1))
+
+    times = [_round(fn, number) / number for _ in range(repeat)]
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0
+    }
+
+
+def _round(fn: Callable[[], object], number: int) -> float:
+    """Seconds for number calls, with garbage collection off."""
+    gc.collect()
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        return time.perf_counter() - start
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def run_suite(
+    cases: List[Case],
+    repeat: int = 5,
+    min_time: float = 0.2,
+    progress: Optional[Callable[[str, Dict], None]] = None
+) -> Dict:
+    """
+    Time every case.
+
+    Args:
+        cases: Benchmarks to run
+        repeat: Timed rounds per case
+        min_time: Minimum duration of one round (s)
+        progress: Optional callback(name, result) after each case
+
+    Returns:
+        Dictionary with "environment" and "results" (per case: timing
+        statistics, units per call, and median time and throughput per unit)
+    """
+    results = {}
+    for case in cases:
+        random.seed(0)
+        np.random.seed(0)
+        if case.setup is not None:
+            case.setup()
+        result = measure(case.fn, repeat, min_time)
+        result["units"] = case.units
+        result["unit"] = case.unit
+        result["per_unit"] = result["median"] / case.units
+        result["units_per_second"] = case.units / result["median"]
+        results[case.name] = result
+        if progress is not None:
+            progress(case.name, result)
+    return {"environment": environment(), "results": results}
+
+
+def environment() -> Dict:
+    """Interpreter, library versions, machine and commit the results were taken on."""
+    import fastapi
+    import pydantic
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+        "pydantic": pydantic.VERSION,
+        "fastapi": fastapi.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    }
+
+
+def save_results(results: Dict, path: str):
+    """Write results as a JSON baseline."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict:
+    """Read a JSON baseline."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = 0.1) -> List[Dict]:
+    """
+    Compare median per-call times against a baseline.
+
+    Args:
+        current: Output of run_suite()
+        baseline: Earlier output of run_suite()
+        threshold: Relative slowdown flagged as a regression (0.1 = 10%)
+
+    Returns:
+        One row per case with name, baseline and current medians (s),
+        relative change and status ("ok", "regression", "improvement",
+        "new" or "missing")
+    """
+    rows = []
+    old = baseline.get("results", {})
+    new = current.get("results", {})
+    for name in sorted(set(old) | set(new)):
+        if name not in old or name not in new:
+            rows.append({
+                "name": name,
+                "baseline": old[name]["median"] if name in old else None,
+                "current": new[name]["median"] if name in new else None,
+                "change": None,
+                "status": "new" if name in new else "missing"
+            })
+            continue
+        change = new[name]["median"] / old[name]["median"] - 1
+        if change > threshold:
+            status = "regression"
+        elif change < -threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({
+            "name": name,
+            "baseline": old[name]["median"],
+            "current": new[name]["median"],
+            "change": change,
+            "status": status
+        })
+    return rows
+
+
+def format_time(seconds: Optional[float]) -> str:
+    """Duration with a readable unit, e.g. "12.3 us"."""
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def format_results(results: Dict) -> str:
+    """Table of median time per call and per unit of work."""
+    lines = [f"{'benchmark':<36} {'per call':>10} {'+-':>9} {'per unit':>10}  unit"]
+    for name, result in results["results"].items():
+        lines.append(
+            f"{name:<36} {format_time(result['median']):>10} {format_time(result['stdev']):>9} "
+            f"{format_time(result['per_unit']):>10}  {result['unit']}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[Dict]) -> str:
+    """Table of baseline vs current medians with change and status."""
+    lines = [f"{'benchmark':<36} {'baseline':>10} {'current':>10} {'change':>8}  status"]
+    for row in rows:
+        change = "-" if row["change"] is None else f"{row['change'] * 100:+.1f}%"
+        lines.append(
+            f"{row['name']:<36} {format_time(row['baseline']):>10} {format_time(row['current']):>10} "
+            f"{change:>8}  {row['status']}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,371 @@
+"""
+Load Test
+Concurrent /simulate load against a locally started server.
+
+Starts uvicorn on a free local port for each server configuration
+(uvicorn worker processes, simulation process-pool workers, handler
+mode), keeps a fixed number of requests in flight for a set duration
+(closed loop: each client sends its next request when the previous one
+returns) and reports throughput, latency percentiles and error rates,
+overall and per request scenario.
+
+Usage (from backend/):
+    python -m benchmarks.loadtest --concurrency 16 --duration 20
+    python -m benchmarks.loadtest --workers 1,2,4 --mode async,sync
+    python -m benchmarks.loadtest --mix uncertainty=1,battery=3 --no-cache
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000   # existing server
+
+The load generator runs in this process, so for high request rates give
+it a core of its own (compare client CPU with server workers).
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Latency percentiles reported (%)
+PERCENTILES = (50, 95, 99)
+
+
+def _random_battery(rng: random.Random) -> Dict:
+    """Battery configuration drawn from realistic residential ranges."""
+    min_soc = rng.uniform(0.05, 0.3)
+    return {
+        "capacity": rng.choice((5.0, 10.0, 13.5, 20.0)),
+        "min_soc": round(min_soc, 3),
+        "max_soc": round(rng.uniform(0.85, 1.0), 3),
+        "max_charge_rate": rng.choice((3.0, 5.0, 7.0)),
+        "max_discharge_rate": rng.choice((3.0, 5.0, 7.0)),
+        "efficiency": round(rng.uniform(0.88, 0.97), 3),
+        "initial_soc": round(rng.uniform(min_soc, 0.9), 3)
+    }
+
+
+# Request scenarios: name -> payload factory given a seeded RNG
+SCENARIOS: Dict[str, Callable[[random.Random], Dict]] = {
+    # Default request (a cache hit after the first, unless the cache is off)
+    "baseline": lambda rng: {},
+    # Varied battery and solar sizes, uncertainty off
+    "battery": lambda rng: {
+        "battery": _random_battery(rng),
+        "solar_capacity": rng.choice((3.0, 4.5, 6.0, 8.0))
+    },
+    # Weather uncertainty on, unseeded (never cached)
+    "uncertainty": lambda rng: {
+        "battery": _random_battery(rng),
+        "enable_weather_uncertainty": True,
+        "forecast_error_range": rng.choice((0.1, 0.2, 0.3))
+    },
+    # One week at 15-minute steps, columnar
+    "week": lambda rng: {
+        "battery": _random_battery(rng),
+        "horizon_days": 7,
+        "timestep_minutes": 15,
+        "response_format": "columnar"
+    }
+}
+
+DEFAULT_MIX = "baseline=1,battery=4,uncertainty=4,week=1"
+
+
+def parse_mix(text: str) -> List[Tuple[str, float]]:
+    """
+    Parse a scenario mix such as "battery=3,uncertainty=1".
+
+    Args:
+        text: Comma-separated name=weight pairs (weight defaults to 1)
+
+    Returns:
+        List of (scenario, weight)
+
+    Raises:
+        ValueError: If a scenario is unknown or a weight is not positive
+    """
+    mix = []
+    for item in text.split(","):
+        name, _, weight = item.strip().partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario {name!r} (expected one of {', '.join(SCENARIOS)})")
+        value = float(weight) if weight else 1.0
+        if value <= 0:
+            raise ValueError(f"Scenario weight must be positive: {item!r}")
+        mix.append((name, value))
+    return mix
+
+
+def free_port() -> int:
+    """An unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Server:
+    """uvicorn serving main:app in a subprocess, for one load-test configuration."""
+
+    def __init__(self, workers: int = 1, pool_workers: int = 0, mode: str = "async", cache: bool = True):
+        """
+        Initialize server settings.
+
+        Args:
+            workers: uvicorn worker processes
+            pool_workers: Simulation process-pool workers per server process (MICROGRID_WORKERS)
+            mode: /simulate handler mode (MICROGRID_HANDLER_MODE)
+            cache: Keep the result cache enabled
+        """
+        self.workers = workers
+        self.pool_workers = pool_workers
+        self.mode = mode
+        self.cache = cache
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.process = None
+
+    def __enter__(self) -> "Server":
+        env = dict(os.environ)
+        env["MICROGRID_WORKERS"] = str(self.pool_workers)
+        env["MICROGRID_HANDLER_MODE"] = self.mode
+        if not self.cache:
+            env["MICROGRID_CACHE_SIZE"] = "0"
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+             "--port", str(self.port), "--workers", str(self.workers), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env
+        )
+        self._wait_ready()
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+    def _wait_ready(self, timeout: float = 60.0):
+        """Poll /health until the server answers."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {self.process.returncode}")
+            try:
+                if httpx.get(f"{self.url}/health", timeout=1.0).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.1)
+        raise RuntimeError(f"Server did not start within {timeout:g} s")
+
+
+async def run_load(
+    url: str,
+    mix: List[Tuple[str, float]],
+    concurrency: int = 8,
+    duration: float = 10.0,
+    warmup: float = 2.0,
+    seed: int = 0,
+    timeout: float = 60.0
+) -> List[Dict]:
+    """
+    Keep concurrency requests in flight against /simulate.
+
+    Args:
+        url: Server base URL
+        mix: Scenario weights (parse_mix())
+        concurrency: Requests in flight
+        duration: Measured seconds (after warm-up)
+        warmup: Seconds of load before measuring
+        seed: Seed for scenario choice and payloads
+        timeout: Per-request timeout (s)
+
+    Returns:
+        One record per measured request: scenario, latency (s), status
+        (HTTP status, or 0 for a transport error) and error message
+    """
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    records = []
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+
+        async def user(index: int):
+            rng = random.Random(seed * 100_003 + index)
+            while True:
+                sent = time.perf_counter()
+                if sent >= stop_at:
+                    return
+                scenario = rng.choices(names, weights)[0]
+                payload = SCENARIOS[scenario](rng)
+                error = None
+                try:
+                    response = await client.post("/simulate", json=payload)
+                    status = response.status_code
+                    if status != 200:
+                        error = response.text[:200]
+                except httpx.HTTPError as e:
+                    status = 0
+                    error = f"{type(e).__name__}: {e}"
+                received = time.perf_counter()
+                if sent >= measure_from and received <= stop_at:
+                    records.append({
+                        "scenario": scenario,
+                        "latency": received - sent,
+                        "status": status,
+                        "error": error
+                    })
+
+        await asyncio.gather(*(user(index) for index in range(concurrency)))
+    return records
+
+
+def summarize(records: List[Dict], duration: float) -> Dict:
+    """
+    Throughput, latency percentiles and error rates.
+
+    Args:
+        records: Output of run_load()
+        duration: Measured seconds
+
+    Returns:
+        Dictionary with overall stats and per-scenario stats
+    """
+    def stats(subset: List[Dict]) -> Dict:
+        if not subset:
+            return {"requests": 0}
+        latencies = np.array([record["latency"] for record in subset])
+        errors = sum(record["status"] != 200 for record in subset)
+        result = {
+            "requests": len(subset),
+            "throughput_rps": round(len(subset) / duration, 2),
+            "error_rate": round(errors / len(subset), 4),
+            "mean_ms": round(float(latencies.mean()) * 1000, 2),
+            "max_ms": round(float(latencies.max()) * 1000, 2)
+        }
+        for p in PERCENTILES:
+            result[f"p{p}_ms"] = round(float(np.percentile(latencies, p)) * 1000, 2)
+        return result
+
+    statuses: Dict[str, int] = {}
+    for record in records:
+        statuses[str(record["status"])] = statuses.get(str(record["status"]), 0) + 1
+    scenarios = sorted({record["scenario"] for record in records})
+    return {
+        **stats(records),
+        "statuses": statuses,
+        "sample_errors": sorted({record["error"] for record in records if record["error"]})[:5],
+        "scenarios": {name: stats([r for r in records if r["scenario"] == name]) for name in scenarios}
+    }
+
+
+def format_report(runs: List[Dict]) -> str:
+    """Table with one row per server configuration, then per-scenario rows."""
+    header = (f"{'workers':>7} {'pool':>4} {'mode':>5} {'conc':>4} {'requests':>8} {'req/s':>8} "
+              f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+    lines = [header]
+    for run in runs:
+        config, summary = run["config"], run["summary"]
+        if not summary["requests"]:
+            lines.append(f"{config['workers']:>7} {config['pool_workers']:>4} {config['mode']:>5} "
+                         f"{config['concurrency']:>4} {0:>8}  (no completed requests)")
+            continue
+        lines.append(
+            f"{config['workers']:>7} {config['pool_workers']:>4} {config['mode']:>5} {config['concurrency']:>4} "
+            f"{summary['requests']:>8} {summary['throughput_rps']:>8.1f} {summary['p50_ms']:>8.1f} "
+            f"{summary['p95_ms']:>8.1f} {summary['p99_ms']:>8.1f} {summary['max_ms']:>8.1f} "
+            f"{summary['error_rate']:>7.2%}"
+        )
+        for name, stats in summary["scenarios"].items():
+            lines.append(
+                f"{'':>7} {'':>4} {'':>5} {'':>4} {stats['requests']:>8} {stats['throughput_rps']:>8.1f} "
+                f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} "
+                f"{stats['max_ms']:>8.1f} {stats['error_rate']:>7.2%}  {name}"
+            )
+        for error in summary["sample_errors"]:
+            lines.append(f"{'':>7} error: {error}")
+    return "\n".join(lines)
+
+
+def _int_list(text: str) -> List[int]:
+    return [int(value) for value in text.split(",")]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest", description="/simulate load test")
+    parser.add_argument("--url", help="Test an already running server instead of starting one")
+    parser.add_argument("--workers", type=_int_list, default=[1],
+                        help="uvicorn worker processes, comma-separated to compare (default 1)")
+    parser.add_argument("--pool-workers", type=_int_list, default=[0],
+                        help="Simulation process-pool workers per server process (MICROGRID_WORKERS; default 0)")
+    parser.add_argument("--mode", default="async",
+                        help="/simulate handler mode: async, sync or both as async,sync (default async)")
+    parser.add_argument("--concurrency", type=_int_list, default=[8],
+                        help="Requests in flight, comma-separated to compare (default 8)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per run (default 10)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Warm-up seconds per run (default 2)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the server's result cache")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for scenarios and payloads")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    modes = [mode.strip() for mode in args.mode.split(",")]
+    if any(mode not in ("async", "sync") for mode in modes):
+        parser.error("--mode must be async, sync or async,sync")
+
+    runs = []
+    if args.url:
+        configs = [(None, None, None)]
+    else:
+        configs = list(itertools.product(args.workers, args.pool_workers, modes))
+    for workers, pool_workers, mode in configs:
+        for concurrency in args.concurrency:
+            config = {
+                "workers": workers if workers is not None else "-",
+                "pool_workers": pool_workers if pool_workers is not None else "-",
+                "mode": mode or "-",
+                "concurrency": concurrency,
+                "mix": args.mix,
+                "cache": not args.no_cache
+            }
+            print(f"Running {config} for {args.warmup:g}+{args.duration:g} s", file=sys.stderr)
+            load = dict(mix=mix, concurrency=concurrency, duration=args.duration,
+                        warmup=args.warmup, seed=args.seed)
+            if args.url:
+                records = asyncio.run(run_load(args.url, **load))
+            else:
+                with Server(workers, pool_workers, mode, cache=not args.no_cache) as server:
+                    records = asyncio.run(run_load(server.url, **load))
+            runs.append({"config": config, "summary": summarize(records, args.duration)})
+
+    print(format_report(runs))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(runs, f, indent=2)
+            f.write("\n")
+    return 1 if any(run["summary"].get("error_rate", 0) for run in runs) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,14 @@ Provides deterministic hourly load demand for 24 hours.
 Represents typical household/small commercial daily pattern.
 """
 
-def get_load_profile() -> list[float]:
+from typing import Optional
+
+import numpy as np
+
+from data.profile_store import ProfileStore, require_profile_store
+
+
+def get_load_profile(hours: int = 24, start_hour: int = 0) -> list[float]:
     """
     Returns 24-hour load demand in kWh per hour.
     
@@ -15,8 +22,12 @@ def get_load_profile() -> list[float]:
     - Evening peak (17-22): 3.0-4.5 kWh
     - Night decline (23): 1.5 kWh
     
+    Args:
+        hours: Number of hours to return (the daily pattern repeats)
+        start_hour: Hour offset from the start of day 1
+    
     Returns:
-        List of 24 hourly load values (kWh)
+        List of hourly load values (kWh), 24 by default
     """
     load_profile = [
         # Hour 0-5: Night (low consumption)
@@ -36,9 +47,39 @@ def get_load_profile() -> list[float]:
     ]
     
     assert len(load_profile) == 24, "Load profile must have exactly 24 hours"
-    return load_profile
+    
+    if hours == 24 and start_hour == 0:
+        return load_profile
+    
+    # Longer horizons repeat the daily pattern
+    return [load_profile[(start_hour + i) % 24] for i in range(hours)]
 
 
 def get_total_daily_load() -> float:
     """Calculate total daily energy demand."""
     return sum(get_load_profile())
+
+
+def get_stored_load_profile(
+    hours: Optional[int] = 24,
+    start_hour: int = 0,
+    site: Optional[str] = None,
+    store: Optional[ProfileStore] = None
+) -> np.ndarray:
+    """
+    Load demand per stored time step, from the profile store.
+    
+    Store-backed counterpart of get_load_profile() for long measured
+    series: returns a read-only slice of the memory-mapped file (no copy),
+    at the stored resolution (e.g. four values per hour for 15-minute data).
+    
+    Args:
+        hours: Number of hours to return (None = to the end of the series)
+        start_hour: Hour offset from the start of the stored series
+        site: Site name, or None for the shared series
+        store: Profile store (default: MICROGRID_PROFILE_DIR)
+    
+    Returns:
+        float32 array of load (kWh) per time step
+    """
+    return require_profile_store(store).read("load", start_hour, hours, site)
@@ -4,7 +4,14 @@ Provides deterministic hourly grid electricity prices for 24 hours.
 Based on typical Time-of-Use (TOU) pricing structure.
 """
 
-def get_price_profile() -> list[float]:
+from typing import Optional
+
+import numpy as np
+
+from data.profile_store import ProfileStore, require_profile_store
+
+
+def get_price_profile(hours: int = 24, start_hour: int = 0) -> list[float]:
     """
     Returns 24-hour grid electricity price in $/kWh.
     
@@ -15,8 +22,12 @@ def get_price_profile() -> list[float]:
     
     Higher prices during evening peak demand (18-21) to reflect grid stress.
     
+    Args:
+        hours: Number of hours to return (the daily pattern repeats)
+        start_hour: Hour offset from the start of day 1
+    
     Returns:
-        List of 24 hourly prices ($/kWh)
+        List of hourly prices ($/kWh), 24 by default
     """
     price_profile = [
         # Hour 0-6: Off-peak
@@ -39,9 +50,39 @@ def get_price_profile() -> list[float]:
     ]
     
     assert len(price_profile) == 24, "Price profile must have exactly 24 hours"
-    return price_profile
+    
+    if hours == 24 and start_hour == 0:
+        return price_profile
+    
+    # Longer horizons repeat the daily pattern
+    return [price_profile[(start_hour + i) % 24] for i in range(hours)]
 
 
 def get_average_price() -> float:
     """Calculate average daily price."""
     return sum(get_price_profile()) / 24
+
+
+def get_stored_price_profile(
+    hours: Optional[int] = 24,
+    start_hour: int = 0,
+    site: Optional[str] = None,
+    store: Optional[ProfileStore] = None
+) -> np.ndarray:
+    """
+    Grid price per stored time step, from the profile store.
+    
+    Store-backed counterpart of get_price_profile() for long measured
+    series: returns a read-only slice of the memory-mapped file (no copy),
+    at the stored resolution (e.g. four values per hour for 15-minute data).
+    
+    Args:
+        hours: Number of hours to return (None = to the end of the series)
+        start_hour: Hour offset from the start of the stored series
+        site: Site name, or None for the shared series
+        store: Profile store (default: MICROGRID_PROFILE_DIR)
+    
+    Returns:
+        float32 array of prices ($/kWh) per time step
+    """
+    return require_profile_store(store).read("price", start_hour, hours, site)
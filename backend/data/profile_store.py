@@ -0,0 +1,307 @@
+"""
+Profile Store
+Memory-mapped binary storage for long load, solar and price time series.
+
+Each series is a float32 .npy file (the .npy header records dtype and
+length) with a small JSON sidecar holding its time step and start time:
+
+    <root>/<kind>.npy               shared series, e.g. price.npy
+    <root>/<kind>.json
+    <root>/<kind>/<site>.npy        per-site series, e.g. load/site-042.npy
+    <root>/<kind>/<site>.json
+
+Files are opened with memory mapping, so reading a date range touches
+only the pages it covers: a year of 15-minute data for thousands of
+sites is never loaded or copied into Python lists.
+
+Solar is stored per kWp of installed capacity (see data.solar_profile).
+
+Configured through environment variables:
+- MICROGRID_PROFILE_DIR: store root directory (unset = no store)
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+PROFILE_KINDS = ("load", "solar", "price")
+DEFAULT_START = "2024-01-01T00:00:00"
+
+# Site names become file names
+_SITE_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+class StoredProfile:
+    """
+    One memory-mapped series.
+
+    Attributes:
+        values: Read-only float32 memmap of the whole series
+        timestep_minutes: Length of one step in minutes
+        start: Timestamp of the first step
+    """
+
+    def __init__(self, path: str, timestep_minutes: int, start: datetime):
+        """
+        Open a series.
+
+        Args:
+            path: Path of the .npy file
+            timestep_minutes: Length of one step in minutes
+            start: Timestamp of the first step
+        """
+        self.values = np.load(path, mmap_mode="r")
+        self.timestep_minutes = timestep_minutes
+        self.start = start
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    @property
+    def steps_per_hour(self) -> int:
+        """Time steps per hour."""
+        return 60 // self.timestep_minutes
+
+    @property
+    def total_hours(self) -> float:
+        """Hours covered by the series."""
+        return len(self) / self.steps_per_hour
+
+    def slice_hours(self, start_hour: int = 0, hours: Optional[int] = None) -> np.ndarray:
+        """
+        Steps covering a range of whole hours from the series start.
+
+        Args:
+            start_hour: First hour
+            hours: Number of hours (default: to the end of the series)
+
+        Returns:
+            Read-only view of the stored values (no copy)
+
+        Raises:
+            ValueError: If the range is outside the series
+        """
+        first = start_hour * self.steps_per_hour
+        last = len(self) if hours is None else first + hours * self.steps_per_hour
+        if first < 0 or last > len(self) or last < first:
+            raise ValueError(
+                f"Hours {start_hour}..{start_hour + (hours or 0)} outside the stored "
+                f"{self.total_hours:g} hours"
+            )
+        return self.values[first:last]
+
+    def slice_dates(self, start: datetime, end: datetime) -> np.ndarray:
+        """
+        Steps from start (inclusive) to end (exclusive).
+
+        Args:
+            start: First timestamp, on a step boundary
+            end: Timestamp after the last step, on a step boundary
+
+        Returns:
+            Read-only view of the stored values (no copy)
+
+        Raises:
+            ValueError: If the range is off the step grid or outside the series
+        """
+        step = timedelta(minutes=self.timestep_minutes)
+        offset, remainder = divmod(start - self.start, step)
+        length, remainder_end = divmod(end - start, step)
+        if remainder or remainder_end:
+            raise ValueError(f"Dates must fall on {self.timestep_minutes}-minute step boundaries")
+        if offset < 0 or length < 0 or offset + length > len(self):
+            raise ValueError(f"Dates {start} - {end} outside the stored series")
+        return self.values[offset:offset + length]
+
+
+class ProfileStore:
+    """
+    Directory of memory-mapped profile series.
+
+    Opened series are kept, so repeated requests share one mapping per
+    file; the operating system pages data in and out as needed.
+    """
+
+    def __init__(self, root: str):
+        """
+        Initialize store.
+
+        Args:
+            root: Store root directory (created on first write)
+        """
+        self.root = root
+        self._open: Dict[str, StoredProfile] = {}
+        self._lock = threading.Lock()
+
+    def write(
+        self,
+        kind: str,
+        values: Sequence[float],
+        timestep_minutes: int = 60,
+        start: str = DEFAULT_START,
+        site: Optional[str] = None
+    ) -> str:
+        """
+        Store a series as float32, replacing any existing one.
+
+        Args:
+            kind: "load" (kWh per step), "solar" (kWh per kWp per step) or
+                  "price" ($/kWh)
+            values: Values per time step
+            timestep_minutes: Length of one step in minutes (must divide an hour)
+            start: ISO timestamp of the first step
+            site: Site name, or None for the shared series
+
+        Returns:
+            Path of the .npy file
+
+        Raises:
+            ValueError: If the kind, site, time step or values are invalid
+        """
+        if timestep_minutes < 1 or 60 % timestep_minutes:
+            raise ValueError("timestep_minutes must divide an hour")
+        data = np.asarray(values, dtype=np.float32)
+        if data.ndim != 1 or not np.all(np.isfinite(data)):
+            raise ValueError("Profile values must be a finite 1-D series")
+        datetime.fromisoformat(start)
+
+        path = self._path(kind, site)
+        meta_path = path[:-len(".npy")] + ".json"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock:
+            # Write aside and rename, so existing mappings of the old file stay valid
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, data)
+            with open(meta_path + ".tmp", "w") as f:
+                json.dump({"timestep_minutes": timestep_minutes, "start": start}, f)
+            os.replace(path + ".tmp", path)
+            os.replace(meta_path + ".tmp", meta_path)
+            self._open.pop(path, None)
+        return path
+
+    def open(self, kind: str, site: Optional[str] = None) -> StoredProfile:
+        """
+        Memory-map a series.
+
+        Args:
+            kind: Profile kind (see write())
+            site: Site name, or None for the shared series
+
+        Returns:
+            Stored profile
+
+        Raises:
+            FileNotFoundError: If the series is not in the store
+        """
+        path = self._path(kind, site)
+        with self._lock:
+            profile = self._open.get(path)
+            if profile is None:
+                if not os.path.exists(path):
+                    name = kind if site is None else f"{kind}/{site}"
+                    raise FileNotFoundError(f"No stored {name} profile in {self.root}")
+                with open(path[:-len(".npy")] + ".json") as f:
+                    meta = json.load(f)
+                profile = StoredProfile(path, meta["timestep_minutes"], datetime.fromisoformat(meta["start"]))
+                self._open[path] = profile
+        return profile
+
+    def read(
+        self,
+        kind: str,
+        start_hour: int = 0,
+        hours: Optional[int] = None,
+        site: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Slice a series by hours from its start.
+
+        Args:
+            kind: Profile kind (see write())
+            start_hour: First hour
+            hours: Number of hours (default: to the end of the series)
+            site: Site name, or None for the shared series
+
+        Returns:
+            Read-only float32 view, one value per stored time step
+        """
+        return self.open(kind, site).slice_hours(start_hour, hours)
+
+    def sites(self, kind: str) -> List[str]:
+        """Names of the per-site series stored for a kind."""
+        directory = os.path.join(self.root, self._check_kind(kind))
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-len(".npy")] for name in os.listdir(directory) if name.endswith(".npy"))
+
+    def _path(self, kind: str, site: Optional[str]) -> str:
+        """File path of a series."""
+        kind = self._check_kind(kind)
+        if site is None:
+            return os.path.join(self.root, f"{kind}.npy")
+        if not _SITE_NAME.match(site):
+            raise ValueError(f"Invalid site name: {site!r}")
+        return os.path.join(self.root, kind, f"{site}.npy")
+
+    @staticmethod
+    def _check_kind(kind: str) -> str:
+        if kind not in PROFILE_KINDS:
+            raise ValueError(f"Unknown profile kind {kind!r} (expected one of {', '.join(PROFILE_KINDS)})")
+        return kind
+
+
+_store: Optional[ProfileStore] = None
+_configured = False
+
+
+def configure_profile_store(root: Optional[str]) -> Optional[ProfileStore]:
+    """
+    Replace the shared profile store.
+
+    Args:
+        root: Store root directory (None disables the store)
+
+    Returns:
+        The new store, or None if disabled
+    """
+    global _store, _configured
+    _store = ProfileStore(root) if root else None
+    _configured = True
+    return _store
+
+
+def get_profile_store() -> Optional[ProfileStore]:
+    """
+    Get the shared profile store, configuring it from the environment on first call.
+
+    Returns:
+        Shared store, or None if no store directory is configured
+    """
+    if not _configured:
+        configure_profile_store(os.environ.get("MICROGRID_PROFILE_DIR"))
+    return _store
+
+
+def require_profile_store(store: Optional[ProfileStore] = None) -> ProfileStore:
+    """
+    The given store, or the shared one.
+
+    Args:
+        store: Store to use (None = the shared store)
+
+    Returns:
+        Profile store
+
+    Raises:
+        ValueError: If neither is available
+    """
+    store = store if store is not None else get_profile_store()
+    if store is None:
+        raise ValueError("No profile store configured (set MICROGRID_PROFILE_DIR)")
+    return store
@@ -2,9 +2,27 @@
 Solar Generation Profile
 Provides deterministic hourly solar generation for 24 hours.
 Assumes a typical clear sunny day with bell curve pattern.
+
+The daily pattern is stored for a reference system and normalized per kW
+of installed capacity (kWh per kWp); profiles for any system size are the
+normalized shape times solar_capacity.
 """
 
-def get_solar_profile() -> list[float]:
+from typing import Optional
+
+import numpy as np
+
+from data.profile_store import ProfileStore, require_profile_store
+
+# Installed capacity of the system the daily pattern was recorded for (kW)
+REFERENCE_CAPACITY_KW = 6.0
+
+
+def get_solar_profile(
+    hours: int = 24,
+    start_hour: int = 0,
+    solar_capacity: float = REFERENCE_CAPACITY_KW
+) -> list[float]:
     """
     Returns 24-hour solar generation in kWh per hour.
     
@@ -16,11 +34,43 @@ def get_solar_profile() -> list[float]:
     - Afternoon (14-17): 3.5-2.0 kWh
     - Sunset (18-19): 1.0-0.3 kWh
     
-    Assumes ~6kW solar panel system with good sun exposure.
+    Values above are for the ~6kW reference system with good sun
+    exposure; other sizes scale linearly with solar_capacity.
+    
+    Args:
+        hours: Number of hours to return (the daily pattern repeats)
+        start_hour: Hour offset from the start of day 1
+        solar_capacity: Installed PV capacity in kW
     
     Returns:
-        List of 24 hourly solar generation values (kWh)
+        List of hourly solar generation values (kWh), 24 by default
+    """
+    return [value * solar_capacity for value in get_solar_shape(hours, start_hour)]
+
+
+def get_solar_shape(hours: int = 24, start_hour: int = 0) -> list[float]:
     """
+    Returns hourly solar generation per kW of installed capacity.
+    
+    Multiply by solar_capacity (kW) for a system's generation; batched
+    runs scale one shared shape by an array of capacities.
+    
+    Args:
+        hours: Number of hours to return (the daily pattern repeats)
+        start_hour: Hour offset from the start of day 1
+    
+    Returns:
+        List of hourly generation values (kWh per kWp), 24 by default
+    """
+    if hours == 24 and start_hour == 0:
+        return list(_SOLAR_SHAPE)
+    
+    # Longer horizons repeat the daily pattern
+    return [_SOLAR_SHAPE[(start_hour + i) % 24] for i in range(hours)]
+
+
+def _reference_profile() -> list[float]:
+    """Daily generation of the reference system (kWh per hour)."""
     solar_profile = [
         # Hour 0-5: Night (no solar)
         0.0, 0.0, 0.0, 0.0, 0.0, 0.0,
@@ -45,9 +95,64 @@ def get_solar_profile() -> list[float]:
     ]
     
     assert len(solar_profile) == 24, "Solar profile must have exactly 24 hours"
+    
     return solar_profile
 
 
-def get_total_daily_solar() -> float:
-    """Calculate total daily solar generation."""
-    return sum(get_solar_profile())
+# Normalized once at import (kWh per kWp per hour)
+_SOLAR_SHAPE = tuple(value / REFERENCE_CAPACITY_KW for value in _reference_profile())
+
+
+def get_total_daily_solar(solar_capacity: float = REFERENCE_CAPACITY_KW) -> float:
+    """Calculate total daily solar generation (kWh) for a system size."""
+    return sum(get_solar_profile(solar_capacity=solar_capacity))
+
+
+def get_stored_solar_shape(
+    hours: Optional[int] = 24,
+    start_hour: int = 0,
+    site: Optional[str] = None,
+    store: Optional[ProfileStore] = None
+) -> np.ndarray:
+    """
+    Solar generation per kWp per stored time step, from the profile store.
+    
+    Store-backed counterpart of get_solar_shape(): returns a read-only
+    slice of the memory-mapped file (no copy), at the stored resolution.
+    
+    Args:
+        hours: Number of hours to return (None = to the end of the series)
+        start_hour: Hour offset from the start of the stored series
+        site: Site name, or None for the shared series
+        store: Profile store (default: MICROGRID_PROFILE_DIR)
+    
+    Returns:
+        float32 array of generation (kWh per kWp) per time step
+    """
+    return require_profile_store(store).read("solar", start_hour, hours, site)
+
+
+def get_stored_solar_profile(
+    hours: Optional[int] = 24,
+    start_hour: int = 0,
+    solar_capacity: float = REFERENCE_CAPACITY_KW,
+    site: Optional[str] = None,
+    store: Optional[ProfileStore] = None
+) -> np.ndarray:
+    """
+    Solar generation per stored time step, from the profile store.
+    
+    Store-backed counterpart of get_solar_profile(): the stored per-kWp
+    slice scaled by solar_capacity (only the requested range is read).
+    
+    Args:
+        hours: Number of hours to return (None = to the end of the series)
+        start_hour: Hour offset from the start of the stored series
+        solar_capacity: Installed PV capacity in kW
+        site: Site name, or None for the shared series
+        store: Profile store (default: MICROGRID_PROFILE_DIR)
+    
+    Returns:
+        Array of generation (kWh) per time step
+    """
+    return get_stored_solar_shape(hours, start_hour, site, store) * np.float64(solar_capacity)
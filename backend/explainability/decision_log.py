@@ -3,21 +3,57 @@ Decision Logger
 Creates human-readable explanations for scheduling decisions.
 """
 
+from functools import lru_cache
 from typing import Dict, List
 
 
+@lru_cache(maxsize=24 * 60)
+def _format_clock(minute_of_day: int) -> str:
+    """Format minutes since midnight as a clock time (e.g. "6:15 AM")."""
+    hour, minute = divmod(minute_of_day, 60)
+    return f"{hour % 12 or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def format_time(hour: float) -> str:
+    """
+    Format hour as readable time.
+    
+    Args:
+        hour: Hours from the start of the simulation (fractional
+              for sub-hourly time steps, e.g. 6.25 = 6:15 AM)
+        
+    Returns:
+        Formatted time string (e.g., "8:00 AM", or "Day 2 8:15 AM"
+        after the first day)
+    """
+    day, minute_of_day = divmod(round(hour * 60), 24 * 60)
+    time_str = _format_clock(minute_of_day)
+    
+    if day > 0:
+        return f"Day {day + 1} {time_str}"
+    return time_str
+
+
 class DecisionLogger:
     """
     Logs and formats explainable decisions for each time step.
     """
     
-    def __init__(self):
-        """Initialize decision logger."""
+    def __init__(self, include_explanations: bool = True):
+        """
+        Initialize decision logger.
+        
+        Args:
+            include_explanations: Build explanation text for each decision.
+                                  When False, records keep time, SoC and
+                                  price only (explanation is None).
+        """
+        self.include_explanations = include_explanations
         self.decisions = []
     
     def log_decision(
         self,
-        hour: int,
+        hour: float,
         decision: Dict,
         energy_balance: Dict,
         battery_soc: float,
@@ -26,10 +62,10 @@ class DecisionLogger:
         solar: float
     ):
         """
-        Log a decision for one hour.
+        Log a decision for one time step.
         
         Args:
-            hour: Hour number (0-23)
+            hour: Hours from start of simulation (fractional for sub-hourly steps)
             decision: Scheduling decision dictionary
             energy_balance: Energy balance dictionary
             battery_soc: Battery state of charge (%)
@@ -38,9 +74,11 @@ class DecisionLogger:
             solar: Solar generation (kWh)
         """
         # Create explanation
-        explanation = self._create_explanation(
-            hour, decision, energy_balance, battery_soc, price, load, solar
-        )
+        explanation = None
+        if self.include_explanations:
+            explanation = self._create_explanation(
+                hour, decision, energy_balance, battery_soc, price, load, solar
+            )
         
         self.decisions.append({
             "hour": hour,
@@ -50,6 +88,59 @@ class DecisionLogger:
             "price_per_kwh": round(price, 3)
         })
     
+    def log_series(self, series: Dict):
+        """
+        Log decisions for every time step of a vectorized engine run.
+        
+        Args:
+            series: Per-hour arrays returned by VectorizedEngine.run()
+        """
+        if not self.include_explanations:
+            self.decisions.extend(
+                {
+                    "hour": hour,
+                    "explanation": None,
+                    "decision_reason": "",
+                    "battery_soc_pct": round(battery_soc, 1),
+                    "price_per_kwh": round(price, 3)
+                }
+                for hour, battery_soc, price in zip(
+                    series["hour"].tolist(),
+                    series["battery_soc_pct"].tolist(),
+                    series["price_per_kwh"].tolist()
+                )
+            )
+            return
+        
+        columns = zip(
+            series["hour"].tolist(),
+            series["load_kwh"].tolist(),
+            series["forecast_solar_kwh"].tolist(),
+            series["solar_used_kwh"].tolist(),
+            series["battery_charge_kwh"].tolist(),
+            series["battery_discharge_kwh"].tolist(),
+            series["grid_import_kwh"].tolist(),
+            series["battery_soc_pct"].tolist(),
+            series["price_per_kwh"].tolist(),
+            series["balanced"].tolist(),
+            series["balance_error_kwh"].tolist()
+        )
+        
+        for (hour, load, solar, solar_to_load, battery_charge, battery_discharge,
+             grid_import, battery_soc, price, balanced, balance_error) in columns:
+            explanation = self.explain_values(
+                hour, load, solar, solar_to_load, battery_charge, battery_discharge,
+                grid_import, battery_soc, price, balanced, balance_error
+            )
+            
+            self.decisions.append({
+                "hour": hour,
+                "explanation": explanation,
+                "decision_reason": "",
+                "battery_soc_pct": round(battery_soc, 1),
+                "price_per_kwh": round(price, 3)
+            })
+    
     def _create_explanation(
         self,
         hour: int,
@@ -72,6 +163,56 @@ class DecisionLogger:
             load: Load demand
             solar: Solar generation
             
+        Returns:
+            Human-readable explanation string
+        """
+        return self.explain_values(
+            hour=hour,
+            load=load,
+            solar=solar,
+            solar_to_load=decision.get("solar_used_kwh", 0),
+            battery_charge=decision.get("battery_charged_kwh", 0),
+            battery_discharge=decision.get("battery_discharged_kwh", 0),
+            grid_import=energy_balance.get("grid_import_kwh", 0),
+            battery_soc=battery_soc,
+            price=price,
+            balanced=energy_balance.get("balanced", False),
+            balance_error=energy_balance.get("balance_error_kwh", 0)
+        )
+    
+    def explain_values(
+        self,
+        hour: int,
+        load: float,
+        solar: float,
+        solar_to_load: float,
+        battery_charge: float,
+        battery_discharge: float,
+        grid_import: float,
+        battery_soc: float,
+        price: float,
+        balanced: bool,
+        balance_error: float
+    ) -> str:
+        """
+        Create human-readable explanation from plain values.
+        
+        Used by the vectorized engine, which has no per-hour decision
+        or energy balance dicts.
+        
+        Args:
+            hour: Hour number
+            load: Load demand (kWh)
+            solar: Solar generation (kWh)
+            solar_to_load: Solar used directly by load (kWh)
+            battery_charge: Energy charged to battery (kWh)
+            battery_discharge: Energy discharged from battery (kWh)
+            grid_import: Energy imported from grid (kWh)
+            battery_soc: Battery SoC (%)
+            price: Grid price ($/kWh)
+            balanced: Whether the energy balance holds
+            balance_error: Energy balance error (kWh)
+            
         Returns:
             Human-readable explanation string
         """
@@ -84,11 +225,6 @@ class DecisionLogger:
         parts.append(f"At {time_str}, load is {load:.2f} kWh and solar is {solar:.2f} kWh.")
         
         # Energy flow summary
-        solar_to_load = decision.get("solar_to_load", 0)
-        battery_charge = decision.get("battery_charge", 0)
-        battery_discharge = decision.get("battery_discharge", 0)
-        grid_import = energy_balance.get("grid_import_kwh", 0)
-        
         if solar_to_load > 0:
             parts.append(f"Solar directly meets {solar_to_load:.2f} kWh of load.")
         
@@ -105,31 +241,16 @@ class DecisionLogger:
         parts.append(f"Battery SoC: {battery_soc:.1f}%.")
         
         # Energy balance check
-        if energy_balance.get("balanced", False):
+        if balanced:
             parts.append("Energy balanced.")
         else:
-            parts.append(f"⚠️ Balance error: {energy_balance.get('balance_error_kwh', 0):.3f} kWh")
+            parts.append(f"⚠️ Balance error: {balance_error:.3f} kWh")
         
         return " ".join(parts)
     
-    def _format_hour(self, hour: int) -> str:
-        """
-        Format hour as readable time.
-        
-        Args:
-            hour: Hour (0-23)
-            
-        Returns:
-            Formatted time string (e.g., "8:00 AM")
-        """
-        if hour == 0:
-            return "12:00 AM"
-        elif hour < 12:
-            return f"{hour}:00 AM"
-        elif hour == 12:
-            return "12:00 PM"
-        else:
-            return f"{hour - 12}:00 PM"
+    def _format_hour(self, hour: float) -> str:
+        """Format hour as readable time (see format_time())."""
+        return format_time(hour)
     
     def get_all_decisions(self) -> List[Dict]:
         """
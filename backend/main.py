@@ -1,54 +1,127 @@
 """
 Microgrid Simulator + Daily Energy Scheduler
 FastAPI Backend - Phase 1 (Rule-based scheduling)
+
+Startup is kept short for serverless cold starts: the app is built by
+create_app(), models build their validators on first use, and optional
+subsystems (LP optimizer / scipy, Monte Carlo, background jobs, uvicorn)
+are imported when first needed. See benchmarks/coldstart.py.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
-import uvicorn
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse, PlainTextResponse, Response
+from contextlib import asynccontextmanager
+import asyncio
+import json
+import os
+import random
+from pydantic import BaseModel, ConfigDict, Field, RootModel, model_validator
+import numpy as np
+from typing import Optional, List, Dict, Literal, Annotated, Callable, Iterator, Union
 
 # Import modules
 from models.battery import Battery
 from models.microgrid import Microgrid
+from models.degradation import DegradationModel
+from models.fleet import Fleet
 from simulator.time_engine import TimeEngine
 from simulator.energy_balance import EnergyBalance
+from simulator.vectorized import VectorizedEngine, DECISION_TYPES, sequential_sum, round_half
+from simulator.columnar import SimulationColumns
+from simulator.batch import run_batch_chunk
+from simulator.fleet import run_fleet_chunk, merge_fleet_series, fleet_totals
+from simulator.executor import SimulationExecutor, get_executor, shutdown_executor
+from simulator.cache import get_cache, request_key
+from simulator.instrumentation import (
+    STAGE_SAMPLE_STEPS, StageTimer, MetricsMiddleware, get_registry, request_elapsed
+)
 from scheduler.rule_engine import RuleBasedScheduler
+from scheduler.price_index import rolling_mean
+from scheduler.dp import DPScheduler
+from scheduler.mpc import MPCScheduler
 from metrics.cost import CostCalculator
 from metrics.carbon import CarbonCalculator
-from explainability.decision_log import DecisionLogger
-from data.load_profile import get_load_profile
-from data.solar_profile import get_solar_profile
-from data.price_profile import get_price_profile
+from metrics.running import RunningTotals
+from explainability.decision_log import DecisionLogger, format_time
+from data.load_profile import get_load_profile, get_stored_load_profile
+from data.solar_profile import get_solar_profile, get_solar_shape, get_stored_solar_profile, get_stored_solar_shape
+from data.price_profile import get_price_profile, get_stored_price_profile
+from data.profile_store import PROFILE_KINDS, require_profile_store
 
 
-# Initialize FastAPI
-app = FastAPI(
-    title="Microgrid Simulator API",
-    description="Clean, explainable, time-based microgrid simulation with rule-based scheduling",
-    version="1.0.0"
-)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Stop simulation worker processes and background jobs on shutdown."""
+    yield
+    from simulator.jobs import shutdown_jobs
+    shutdown_jobs()
+    shutdown_executor()
+
+
+# Origins allowed to call the API from a browser
+CORS_ORIGINS = [
+    "http://localhost:3000",
+    "http://localhost:3001",
+    "http://localhost:3002",
+    "http://localhost:3003",
+    "http://localhost:3004",
+    "https://microgridsimulator.vercel.app"
+]
+
+# API endpoints (added to the app by create_app())
+router = APIRouter()
+
+
+# Upper bound on Monte Carlo samples per request
+MAX_MONTE_CARLO_SAMPLES = 100_000
+
+# Optional output groups for /simulate (numeric results are always included)
+OUTPUT_GROUPS = ("explanations", "legacy", "forecast")
+
+# Upper bound on the simulation horizon, and hours simulated per block
+MAX_HORIZON_DAYS = 3660
+SIMULATION_CHUNK_HOURS = 24 * 7
+
+# Upper bound on time steps for schedulers that plan the whole horizon at once
+# (LP, DP and MPC hold full-horizon arrays): one year of hourly steps
+MAX_PLAN_STEPS = 366 * 24
+
+# Upper bound on time steps /simulate returns as hourly_results records (one
+# year of 15-minute steps); longer runs use columnar or /simulate/stream
+MAX_ROWS_STEPS = 366 * 24 * 4
+
+# How /simulate runs simulations (MICROGRID_HANDLER_MODE): "async" hands them
+# to the threadpool or process pool and keeps the event loop free; "sync" runs
+# them in the handler, blocking the event loop, so each server process
+# serves one simulation at a time (for comparison in load tests)
+SIMULATE_HANDLER_MODE = os.environ.get("MICROGRID_HANDLER_MODE", "async").strip().lower()
+
+
+def _lp_optimizer():
+    """LP Optimizer, imported on first use (scipy.optimize is slow to import)."""
+    from scheduler.optimizer import Optimizer
+    return Optimizer()
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "http://localhost:3001",
-        "http://localhost:3002",
-        "http://localhost:3003",
-        "http://localhost:3004",
-        "https://microgridsimulator.vercel.app"
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],  # Allow all HTTP methods
-    allow_headers=["*"],  # Allow all headers
-)
+
+# Schedulers that plan the whole horizon up front (SimulationRequest.scheduler)
+PLAN_SCHEDULERS = {"lp": _lp_optimizer, "dp": DPScheduler, "mpc": MPCScheduler}
+
+
+class APIModel(BaseModel):
+    """
+    Base of the request and response models.
+    
+    Validators and serializers are built on first use rather than at
+    import, so models only needed by rarely used endpoints don't slow
+    down cold starts.
+    """
+    model_config = ConfigDict(defer_build=True, experimental_defer_build_mode=("model", "type_adapter"))
 
 
 # Request models
-class BatteryConfig(BaseModel):
+class BatteryConfig(APIModel):
     """Battery configuration parameters."""
     capacity: float = Field(10.0, gt=0, description="Battery capacity in kWh")
     min_soc: float = Field(0.2, ge=0, le=1, description="Minimum state of charge (0-1)")
@@ -59,19 +132,218 @@ class BatteryConfig(BaseModel):
     initial_soc: float = Field(0.5, ge=0, le=1, description="Initial state of charge (0-1)")
 
 
-class SimulationRequest(BaseModel):
+class DegradationConfig(APIModel):
+    """Battery degradation model parameters."""
+    cycle_life: float = Field(6000.0, gt=0, description="Full 100%-depth cycles until end of life")
+    depth_exponent: float = Field(1.5, ge=1, le=3, description="Cycle damage grows with depth^exponent")
+    calendar_life_years: float = Field(15.0, gt=0, description="Years until end of life with no cycling")
+    end_of_life_capacity: float = Field(0.8, gt=0, lt=1, description="Remaining capacity fraction at end of life")
+    replacement_cost_per_kwh: float = Field(300.0, ge=0, description="Battery replacement cost ($/kWh)")
+
+
+class SimulationRequest(APIModel):
     """Simulation request parameters."""
     solar_capacity: float = Field(6.0, gt=0, description="Solar PV capacity in kW")
     battery: BatteryConfig = Field(default_factory=BatteryConfig, description="Battery configuration")
     grid_carbon_intensity: float = Field(0.42, gt=0, description="Grid carbon intensity (kg CO2/kWh)")
     enable_weather_uncertainty: bool = Field(False, description="Enable weather forecast uncertainty")
     forecast_error_range: float = Field(0.15, ge=0, le=0.5, description="Forecast error range (0-0.5 = 0-50%)")
+    engine: Literal["vectorized", "legacy"] = Field("vectorized", description="Simulation engine (array-based or hour-by-hour dicts)")
+    seed: Optional[int] = Field(None, description="Random seed for weather uncertainty (omit for a fresh draw)")
+    horizon_days: int = Field(1, ge=1, le=MAX_HORIZON_DAYS, description="Simulation horizon in days (365 = one year)")
+    timestep_minutes: Literal[60, 30, 15, 5] = Field(60, description="Time step length in minutes")
+    profile_source: Literal["builtin", "store"] = Field(
+        "builtin", description="builtin = repeating daily profiles, store = measured series from the "
+                               "profile store (MICROGRID_PROFILE_DIR), converted to timestep_minutes"
+    )
+    profile_start_hour: int = Field(
+        0, ge=0, description="Hour of the stored series the horizon starts at (profile_source=store)"
+    )
+    scheduler: Literal["rule_based", "lp", "dp", "mpc"] = Field(
+        "rule_based", description="rule_based = price rules per step, lp / dp = cost-optimal plan over the "
+                                  "horizon (linear program / dynamic programming over SoC levels), "
+                                  "mpc = DP re-planned every step with measured solar; lp, dp and mpc "
+                                  f"allow at most {MAX_PLAN_STEPS} time steps"
+    )
+    reference_window_hours: Optional[int] = Field(
+        None, ge=1, le=MAX_HORIZON_DAYS * 24,
+        description="Rolling window (hours) for the rule-based reference price; omit for the horizon average"
+    )
+    reference_window_mode: Literal["trailing", "centered"] = Field(
+        "trailing", description="Rolling window position: trailing (ending at each step) or centered"
+    )
+    degradation: Optional[DegradationConfig] = Field(
+        None, description="Battery degradation accounting (cycles, calendar aging, capacity fade); omit to disable"
+    )
+    response_format: Literal["rows", "columnar"] = Field(
+        "rows", description="rows = hourly_results list of records, columnar = hourly_columns arrays"
+    )
+    outputs: List[Literal[OUTPUT_GROUPS]] = Field(
+        default_factory=lambda: list(OUTPUT_GROUPS),
+        description="Output groups to compute besides numeric results: explanations, "
+                    "legacy (scheduler legacy-format fields), forecast (forecast error fields); "
+                    "[] = numeric only"
+    )
+    include_timing: bool = Field(False, description="Return a per-stage timing breakdown (ms) in the response")
+    
+    @model_validator(mode="after")
+    def check_plan_horizon(self) -> "SimulationRequest":
+        """Keep full-horizon planning (lp, dp, mpc) within MAX_PLAN_STEPS time steps."""
+        steps = self.horizon_days * 24 * 60 // self.timestep_minutes
+        if self.scheduler in PLAN_SCHEDULERS and steps > MAX_PLAN_STEPS:
+            raise ValueError(
+                f"scheduler '{self.scheduler}' plans the whole horizon at once and supports at most "
+                f"{MAX_PLAN_STEPS} time steps ({MAX_PLAN_STEPS // 24} days at 60-minute steps); "
+                f"this request has {steps}"
+            )
+        return self
+    
+    @model_validator(mode="after")
+    def check_reference_window(self) -> "SimulationRequest":
+        """Only the rule-based scheduler classifies prices against a reference."""
+        if self.reference_window_hours is not None and self.scheduler in PLAN_SCHEDULERS:
+            raise ValueError(
+                f"reference_window_hours only applies to the rule_based scheduler, not '{self.scheduler}'"
+            )
+        return self
+    
+    @model_validator(mode="after")
+    def check_profile_start(self) -> "SimulationRequest":
+        """Only stored series have a start hour; the builtin profiles start at midnight."""
+        if self.profile_source == "builtin" and self.profile_start_hour:
+            raise ValueError("profile_start_hour requires profile_source 'store'")
+        return self
+
+
+class MonteCarloRequest(APIModel):
+    """Monte Carlo weather-uncertainty parameters."""
+    solar_capacity: float = Field(6.0, gt=0, description="Solar PV capacity in kW")
+    battery: BatteryConfig = Field(default_factory=BatteryConfig, description="Battery configuration")
+    grid_carbon_intensity: float = Field(0.42, gt=0, description="Grid carbon intensity (kg CO2/kWh)")
+    forecast_error_range: float = Field(0.15, ge=0, le=0.5, description="Forecast error range (0-0.5 = 0-50%)")
+    samples: int = Field(1000, ge=1, le=MAX_MONTE_CARLO_SAMPLES, description="Number of forecast-error samples")
+    seed: Optional[int] = Field(None, ge=0, description="Random seed (omit to draw one; it is returned)")
+
+
+# Batch request models
+PositiveValue = Annotated[float, Field(gt=0)]
+FractionValue = Annotated[float, Field(ge=0, le=1)]
+
+# Battery parameters in the order used for batch expansion
+BATTERY_PARAMS = (
+    "capacity", "min_soc", "max_soc", "max_charge_rate",
+    "max_discharge_rate", "efficiency", "initial_soc"
+)
+
+# Upper bound on configurations per batch request, and per engine pass
+MAX_BATCH_CONFIGS = 100_000
+BATCH_CHUNK_SIZE = 4096
+
+
+class ScenarioConfig(APIModel):
+    """One solar/battery configuration in a batch."""
+    solar_capacity: float = Field(6.0, gt=0, description="Solar PV capacity in kW")
+    battery: BatteryConfig = Field(default_factory=BatteryConfig, description="Battery configuration")
+
+
+class BatteryGrid(APIModel):
+    """Values to sweep for each battery parameter (omitted = default only)."""
+    capacity: Optional[List[PositiveValue]] = None
+    min_soc: Optional[List[FractionValue]] = None
+    max_soc: Optional[List[FractionValue]] = None
+    max_charge_rate: Optional[List[PositiveValue]] = None
+    max_discharge_rate: Optional[List[PositiveValue]] = None
+    efficiency: Optional[List[FractionValue]] = None
+    initial_soc: Optional[List[FractionValue]] = None
+
+
+class SweepGrid(APIModel):
+    """Cartesian grid of configurations."""
+    solar_capacity: List[PositiveValue] = Field(default_factory=lambda: [6.0], description="Solar PV capacities in kW")
+    battery: BatteryGrid = Field(default_factory=BatteryGrid, description="Battery parameter values")
+
+
+class BatchSimulationRequest(APIModel):
+    """Batch of configurations evaluated against the shared profiles."""
+    configurations: Optional[List[ScenarioConfig]] = Field(None, description="Explicit list of configurations")
+    grid: Optional[SweepGrid] = Field(None, description="Cartesian grid of configurations")
+    grid_carbon_intensity: float = Field(0.42, gt=0, description="Grid carbon intensity (kg CO2/kWh)")
+
+
+# Upper bound on sites per fleet request; sites per engine pass, and hours per block
+MAX_FLEET_SITES = 100_000
+FLEET_CHUNK_SIZE = 1024
+FLEET_BLOCK_HOURS = 24
+
+
+class FleetSite(APIModel):
+    """One site of a fleet."""
+    battery: BatteryConfig = Field(default_factory=BatteryConfig, description="Battery configuration")
+    solar_capacity: float = Field(6.0, ge=0, description="Solar PV capacity in kW")
+    load_scale: float = Field(1.0, ge=0, description="Multiplier on the shared load profile")
+
+
+class FleetSimulationRequest(APIModel):
+    """Portfolio of sites simulated together against the shared profiles."""
+    sites: List[FleetSite] = Field(..., min_length=1, max_length=MAX_FLEET_SITES, description="Sites in the fleet")
+    grid_carbon_intensity: float = Field(0.42, gt=0, description="Grid carbon intensity (kg CO2/kWh)")
+    horizon_days: int = Field(1, ge=1, le=MAX_HORIZON_DAYS, description="Simulation horizon in days")
+    timestep_minutes: Literal[60, 30, 15, 5] = Field(60, description="Time step length in minutes")
+    profile_source: Literal["builtin", "store"] = Field(
+        "builtin", description="builtin = repeating daily profiles, store = measured series from the "
+                               "profile store (MICROGRID_PROFILE_DIR), converted to timestep_minutes"
+    )
+    profile_start_hour: int = Field(
+        0, ge=0, description="Hour of the stored series the horizon starts at (profile_source=store)"
+    )
+    
+    @model_validator(mode="after")
+    def check_profile_start(self) -> "FleetSimulationRequest":
+        """Only stored series have a start hour; the builtin profiles start at midnight."""
+        if self.profile_source == "builtin" and self.profile_start_hour:
+            raise ValueError("profile_start_hour requires profile_source 'store'")
+        return self
+
+
+class SimulateJob(APIModel):
+    """Job running one /simulate request."""
+    kind: Literal["simulate"] = "simulate"
+    request: SimulationRequest = Field(..., description="Simulation configuration")
+
+
+class BatchJob(APIModel):
+    """Job running one /simulate/batch request."""
+    kind: Literal["batch"] = "batch"
+    request: BatchSimulationRequest = Field(..., description="Batch of configurations")
+
+
+class FleetJob(APIModel):
+    """Job running one /simulate/fleet request."""
+    kind: Literal["fleet"] = "fleet"
+    request: FleetSimulationRequest = Field(..., description="Fleet configuration")
+
+
+class MonteCarloJob(APIModel):
+    """Job running one /simulate/monte-carlo request."""
+    kind: Literal["monte-carlo"] = "monte-carlo"
+    request: MonteCarloRequest = Field(..., description="Monte Carlo configuration")
+
+
+# A root model rather than a bare union, so its validator is deferred like the others
+class JobRequest(RootModel):
+    """Background job of any kind, tagged by "kind"."""
+    model_config = APIModel.model_config
+    root: Annotated[
+        Union[SimulateJob, BatchJob, FleetJob, MonteCarloJob],
+        Field(discriminator="kind")
+    ]
 
 
 # Response models
-class HourlyResult(BaseModel):
-    """Results for one hour of simulation."""
+class HourlyResult(APIModel):
+    """Results for one time step of simulation (one hour by default)."""
     hour: int
+    minute: int = 0  # Start of the step within the hour (sub-hourly steps)
     time: str
     load_kwh: float
     solar_kwh: float
@@ -83,37 +355,103 @@ class HourlyResult(BaseModel):
     cost_usd: float
     emissions_kg: float
     decision_type: str
-    explanation: str
+    explanation: Optional[str] = None
     forecast_solar_kwh: Optional[float] = None
     actual_solar_kwh: Optional[float] = None
     forecast_error_pct: Optional[float] = None
     forecast_correction: Optional[str] = None
 
 
-class SimulationResponse(BaseModel):
+class SimulationResponse(APIModel):
     """Complete simulation results."""
     success: bool
     message: str
     config: Dict
-    hourly_results: List[HourlyResult]
+    hourly_results: List[HourlyResult] = []
+    hourly_columns: Optional[Dict[str, List]] = None  # response_format="columnar"
     summary: Dict
     baseline_total_cost: float
     optimized_total_cost: float
     total_cost_savings: float
     savings_percentage: float
+    timing: Optional[Dict[str, float]] = None  # include_timing=true: milliseconds per stage
+
+
+class BatchSimulationResponse(APIModel):
+    """Compact per-configuration summary metrics (columnar)."""
+    success: bool
+    message: str
+    count: int
+    baseline_total_cost: float
+    parameters: Dict[str, List[float]]
+    metrics: Dict[str, List[float]]
+
+
+class FleetSimulationResponse(APIModel):
+    """Fleet totals, fleet-wide series and per-site summary metrics (columnar)."""
+    success: bool
+    message: str
+    count: int
+    config: Dict
+    fleet: Dict[str, float]
+    sites: Dict[str, List[float]]
+    series: Dict[str, List[float]]
+
+
+class MonteCarloResponse(APIModel):
+    """Percentile bands across forecast-error samples."""
+    success: bool
+    message: str
+    samples: int
+    seed: int
+    forecast_error_range: float
+    hourly_bands: Dict[str, Dict[str, List[float]]]
+    totals: Dict[str, Dict[str, float]]
+
+
+class JobProgress(APIModel):
+    """Latest progress report (time steps, configurations, sites or samples)."""
+    done: int
+    total: int
+    fraction: float
+
+
+class JobStatus(APIModel):
+    """State of a background job; result holds the endpoint's response once succeeded."""
+    id: str
+    kind: str
+    status: Literal["queued", "running", "succeeded", "failed", "cancelled"]
+    progress: JobProgress
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    error: Optional[str] = None
+    result: Optional[Dict] = None
 
 
 # Core simulation function
-def run_simulation(config: SimulationRequest) -> Dict:
+def run_simulation(
+    config: SimulationRequest,
+    progress: Optional[Callable[[int, int], None]] = None,
+    timer: Optional[StageTimer] = None
+) -> Dict:
     """
-    Run 24-hour microgrid simulation.
+    Run microgrid simulation over the configured horizon (24 hours by default).
     
     Args:
         config: Simulation configuration
+        progress: Optional callback(done, total) in time steps, called
+                  after each block of SIMULATION_CHUNK_HOURS
+        timer: Optional stage timer (setup, inputs, scheduler,
+               energy_balance, forecast, cost, carbon, decision_log,
+               results, summary)
         
     Returns:
         Dictionary with complete simulation results
     """
+    timer = timer if timer is not None else StageTimer()
+    timer.mark()
+    
     # Initialize components
     battery = Battery(
         capacity=config.battery.capacity,
@@ -131,86 +469,127 @@ def run_simulation(config: SimulationRequest) -> Dict:
         grid_connected=True
     )
     
-    time_engine = TimeEngine()
+    microgrid_config = microgrid.get_config()
+    
+    total_hours = config.horizon_days * 24
+    time_engine = TimeEngine(total_hours=total_hours, timestep_minutes=config.timestep_minutes)
     cost_calc = CostCalculator()
     carbon_calc = CarbonCalculator(grid_intensity=config.grid_carbon_intensity)
-    decision_logger = DecisionLogger()
+    decision_logger = DecisionLogger(include_explanations="explanations" in config.outputs)
     
-    # Get profiles
-    loads = get_load_profile()
-    solars = get_solar_profile()
-    prices = get_price_profile()
+    # Get profiles (energy per time step, price per kWh), as lists for the step loop
+    loads = _profile(config, time_engine, "load", total_hours).tolist()
+    solars = _profile(config, time_engine, "solar", total_hours, solar_capacity=config.solar_capacity).tolist()
+    prices = _profile(config, time_engine, "price", total_hours).tolist()
     
     # Validate profiles
-    assert len(loads) == 24, "Load profile must have 24 hours"
-    assert len(solars) == 24, "Solar profile must have 24 hours"
-    assert len(prices) == 24, "Price profile must have 24 hours"
+    total_steps = time_engine.total_steps
+    assert len(loads) == total_steps, "Load profile must cover the horizon"
+    assert len(solars) == total_steps, "Solar profile must cover the horizon"
+    assert len(prices) == total_steps, "Price profile must cover the horizon"
     
     # Weather uncertainty setup (additive feature)
-    import random
     weather_uncertainty_enabled = config.enable_weather_uncertainty
     forecast_error_sigma = config.forecast_error_range if weather_uncertainty_enabled else 0.0
+    forecast_fields = _forecast_fields_enabled(config)
+    rng = _weather_rng(config.seed)
     
     # Initialize scheduler with price profile for dynamic analysis
-    scheduler = RuleBasedScheduler(price_profile=prices)
-    daily_avg_price = scheduler.get_daily_avg_price()
+    if config.scheduler in PLAN_SCHEDULERS:
+        # Plan the whole horizon up front on forecast solar
+        scheduler = PLAN_SCHEDULERS[config.scheduler]()
+        scheduler.optimize_schedule(loads, solars, prices, battery, time_engine.timestep_hours)
+        daily_avg_price = sum(prices) / total_steps
+    else:
+        scheduler = RuleBasedScheduler(
+            price_profile=prices,
+            reference_window=_reference_window_steps(config),
+            centered_window=config.reference_window_mode == "centered"
+        )
+        daily_avg_price = scheduler.get_daily_avg_price()
+    
+    # Battery aging; capacity fades at the same block boundaries as iter_simulation()
+    degradation = _degradation_model(config, battery)
+    block_steps = SIMULATION_CHUNK_HOURS * time_engine.steps_per_hour
     
     # Storage for results
     hourly_results = []
+    timer.lap("setup")
+    
+    # Per-step stages are timed on sampled steps and scaled to the loop's total
+    sample = StageTimer()
     
-    # Simulate each hour
-    for hour in time_engine.iterate_hours():
-        load = loads[hour]
-        forecast_solar = solars[hour]  # Original solar profile = forecast
-        price = prices[hour]
+    # Simulate each time step
+    for step in time_engine.iterate_steps():
+        probe = sample if step % STAGE_SAMPLE_STEPS == 0 else None
+        if probe:
+            probe.mark()
+        
+        hour = time_engine.get_time_hours()
+        load = loads[step]
+        forecast_solar = solars[step]  # Original solar profile = forecast
+        price = prices[step]
         
         # Apply weather uncertainty (if enabled)
         if weather_uncertainty_enabled:
             # Generate random forecast error
-            error = random.normalvariate(0, forecast_error_sigma)
+            error = rng.normalvariate(0, forecast_error_sigma)
             actual_solar = forecast_solar * (1 + error)
             actual_solar = max(0.0, actual_solar)  # Solar cannot be negative
-            forecast_error_pct = ((actual_solar - forecast_solar) / forecast_solar * 100) if forecast_solar > 0 else 0.0
         else:
             # No uncertainty - forecast = actual
             actual_solar = forecast_solar
-            forecast_error_pct = 0.0
         
-        # Make scheduling decision using FORECAST solar
+        forecast_error_pct = None
+        if forecast_fields:
+            forecast_error_pct = ((actual_solar - forecast_solar) / forecast_solar * 100) if forecast_solar > 0 else 0.0
+        if probe:
+            probe.lap("inputs")
+        
+        # Make scheduling decision using FORECAST solar (MPC measures ACTUAL solar)
         decision = scheduler.schedule_hour(
             hour=hour,
             load=load,
-            solar=forecast_solar,  # Decisions use forecast
+            solar=actual_solar if config.scheduler == "mpc" else forecast_solar,
             battery=battery,
             price=price,
-            look_ahead_hours=time_engine.get_hours_remaining()
+            look_ahead_hours=time_engine.get_hours_remaining(),
+            timestep_hours=time_engine.timestep_hours,
+            explain="explanations" in config.outputs,
+            legacy_fields="legacy" in config.outputs,
+            step=step
         )
+        if probe:
+            probe.lap("scheduler")
         
         # Calculate energy balance using ACTUAL solar (reality)
         grid_energy = EnergyBalance.calculate_required_grid(
             load=load,
             solar=actual_solar,  # Reality uses actual
-            battery_discharge=decision["battery_discharge"],
-            battery_charge=decision["battery_charge"]
+            battery_discharge=decision["battery_discharged_kwh"],
+            battery_charge=decision["battery_charged_kwh"]
         )
         
         energy_balance = EnergyBalance.calculate_balance(
             load=load,
             solar=actual_solar,  # Reality uses actual
-            battery_charge=decision["battery_charge"],
-            battery_discharge=decision["battery_discharge"],
+            battery_charge=decision["battery_charged_kwh"],
+            battery_discharge=decision["battery_discharged_kwh"],
             grid=grid_energy
         )
+        if probe:
+            probe.lap("energy_balance")
         
         # Detect forecast correction (if weather uncertainty enabled)
         forecast_correction = None
-        if weather_uncertainty_enabled and abs(forecast_error_pct) > 5.0:  # Significant error threshold
-            if forecast_error_pct < -10:  # Actual < Forecast (shortfall)
-                if energy_balance["grid_import_kwh"] > 0.1:
-                    forecast_correction = f"Unexpected grid import due to solar shortfall ({forecast_error_pct:.1f}% below forecast)"
-            elif forecast_error_pct > 10:  # Actual > Forecast (excess)
-                if energy_balance["grid_export_kwh"] > 0.1:
-                    forecast_correction = f"Extra grid export due to solar excess ({forecast_error_pct:.1f}% above forecast)"
+        if forecast_fields:
+            forecast_correction = _detect_forecast_correction(
+                forecast_error_pct,
+                energy_balance["grid_import_kwh"],
+                energy_balance["grid_export_kwh"]
+            )
+            if probe:
+                probe.lap("forecast")
         
         # Calculate cost
         cost_info = cost_calc.calculate_hourly_cost(
@@ -218,12 +597,16 @@ def run_simulation(config: SimulationRequest) -> Dict:
             grid_export=energy_balance["grid_export_kwh"],
             price=price
         )
+        if probe:
+            probe.lap("cost")
         
         # Calculate emissions
         carbon_info = carbon_calc.calculate_hourly_emissions(
             grid_import=energy_balance["grid_import_kwh"],
             grid_export=energy_balance["grid_export_kwh"]
         )
+        if probe:
+            probe.lap("carbon")
         
         # Log decision (using forecast solar for decision context)
         decision_logger.log_decision(
@@ -235,15 +618,17 @@ def run_simulation(config: SimulationRequest) -> Dict:
             load=load,
             solar=forecast_solar  # Log forecast solar for decision context
         )
+        if probe:
+            probe.lap("decision_log")
         
         # Store result (including decision_type from scheduler)
         hourly_results.append({
             "hour": hour,
             "load_kwh": load,
             "solar_kwh": actual_solar,  # Store actual solar as primary value
-            "forecast_solar_kwh": forecast_solar if weather_uncertainty_enabled else None,
-            "actual_solar_kwh": actual_solar if weather_uncertainty_enabled else None,
-            "forecast_error_pct": forecast_error_pct if weather_uncertainty_enabled else None,
+            "forecast_solar_kwh": forecast_solar if forecast_fields else None,
+            "actual_solar_kwh": actual_solar if forecast_fields else None,
+            "forecast_error_pct": forecast_error_pct,
             "forecast_correction": forecast_correction,
             "price_per_kwh": price,
             "decision": decision,
@@ -253,24 +638,803 @@ def run_simulation(config: SimulationRequest) -> Dict:
             "carbon": carbon_info,
             "battery_soc_pct": battery.get_soc_percentage()
         })
+        
+        if degradation is not None:
+            degradation.add_step(
+                battery.get_soc_percentage(),
+                decision["battery_charged_kwh"],
+                decision["battery_discharged_kwh"]
+            )
+            if (step + 1) % block_steps == 0 or step + 1 == total_steps:
+                degradation.advance(battery, (step % block_steps + 1) // time_engine.steps_per_hour)
+        
+        if progress is not None and ((step + 1) % block_steps == 0 or step + 1 == total_steps):
+            progress(step + 1, total_steps)
+        if probe:
+            probe.lap("results")
+    
+    timer.lap("loop")
+    timer.apportion("loop", sample)
     
     # Calculate summary metrics
     total_cost_info = cost_calc.calculate_total_cost(hourly_results)
     total_carbon_info = carbon_calc.calculate_total_emissions(hourly_results)
+    baselines = {
+        # PURE GRID-ONLY baseline (no solar, no battery, no optimization)
+        "baseline_cost": cost_calc.calculate_baseline_cost(loads, prices),
+        # Baseline WITH solar but WITHOUT battery (for comparison)
+        "baseline_with_solar_cost": cost_calc.calculate_baseline_with_solar_cost(loads, solars, prices),
+        # Carbon baseline (grid-only scenario)
+        "baseline_emissions": carbon_calc.calculate_baseline_emissions(loads, solars),
+        "total_load": sum(loads),
+        "total_solar": sum(solars)
+    }
+    
+    summary = _build_summary(
+        cost_calc, carbon_calc, total_cost_info, total_carbon_info,
+        baselines, daily_avg_price, degradation
+    )
+    if config.scheduler in PLAN_SCHEDULERS:
+        summary["scheduler_stats"] = scheduler.solve_stats()
+    timer.lap("summary")
+    
+    return {
+        "config": microgrid_config,
+        "hourly_results": hourly_results,
+        "decisions": decision_logger.export_decisions(),
+        "summary": summary
+    }
+
+
+def iter_simulation(
+    config: SimulationRequest,
+    chunk_hours: int = SIMULATION_CHUNK_HOURS,
+    timer: Optional[StageTimer] = None
+) -> Iterator[Dict]:
+    """
+    Run the vectorized simulation incrementally, one block of hours at a time.
+    
+    Battery state carries over from block to block, and summary metrics
+    are accumulated as running totals, so memory stays bounded by the
+    block size however long the horizon is.
+    
+    Args:
+        config: Simulation configuration
+        chunk_hours: Hours simulated per block
+        timer: Optional stage timer (setup, plan, inputs, engine,
+               aggregation, decision_log, forecast, summary); time spent
+               by the consumer between blocks is not charged
+        
+    Yields:
+        {"type": "block", ...} records with start_hour, start_step, per-step series,
+        decisions (None without explanations) and forecast corrections (None
+        without forecast fields) for each block, then one {"type": "summary", ...}
+        record with config and summary
+    """
+    timer = timer if timer is not None else StageTimer()
+    timer.mark()
+    
+    battery = Battery(
+        capacity=config.battery.capacity,
+        min_soc=config.battery.min_soc,
+        max_soc=config.battery.max_soc,
+        max_charge_rate=config.battery.max_charge_rate,
+        max_discharge_rate=config.battery.max_discharge_rate,
+        efficiency=config.battery.efficiency,
+        initial_soc=config.battery.initial_soc
+    )
+    
+    microgrid = Microgrid(
+        solar_capacity=config.solar_capacity,
+        battery=battery,
+        grid_connected=True
+    )
+    
+    microgrid_config = microgrid.get_config()
+    
+    time_engine = TimeEngine(
+        total_hours=config.horizon_days * 24,
+        timestep_minutes=config.timestep_minutes
+    )
+    cost_calc = CostCalculator()
+    carbon_calc = CarbonCalculator(grid_intensity=config.grid_carbon_intensity)
+    decision_logger = DecisionLogger() if "explanations" in config.outputs else None
+    totals = RunningTotals(grid_intensity=config.grid_carbon_intensity)
+    engine = VectorizedEngine(
+        battery,
+        grid_intensity=config.grid_carbon_intensity,
+        timestep_minutes=config.timestep_minutes
+    )
+    
+    # Reference price over the whole horizon, summed block by block
+    price_total = 0.0
+    for start, hours in time_engine.iterate_chunks(chunk_hours):
+        prices = _profile(config, time_engine, "price", hours, start)
+        price_total = float(sequential_sum(prices, price_total))
+    avg_price = price_total / time_engine.total_steps
+    
+    # Rolling reference price, computed once over the whole horizon
+    reference_prices = None
+    reference_window = _reference_window_steps(config)
+    if reference_window is not None and config.scheduler == "rule_based":
+        reference_prices = rolling_mean(
+            _profile(config, time_engine, "price", time_engine.total_hours),
+            reference_window,
+            centered=config.reference_window_mode == "centered"
+        )
+    
+    # Planning schedulers: one plan over the whole horizon, applied block by
+    # block (MPC re-plans each step of a block once its solar is measured)
+    planner = None
+    plan = None
+    timer.lap("setup")
+    if config.scheduler in PLAN_SCHEDULERS:
+        total_hours = time_engine.total_hours
+        planner = PLAN_SCHEDULERS[config.scheduler]()
+        plan = planner.optimize_schedule(
+            _profile(config, time_engine, "load", total_hours),
+            _profile(config, time_engine, "solar", total_hours, solar_capacity=config.solar_capacity),
+            _profile(config, time_engine, "price", total_hours),
+            battery,
+            time_engine.timestep_hours
+        )
+        timer.lap("plan")
+    
+    # Battery aging; capacity fades at the end of each block
+    degradation = _degradation_model(config, battery)
+    
+    # Weather uncertainty: same per-hour draws as the dict-based loop
+    rng = _weather_rng(config.seed)
+    sigma = config.forecast_error_range
+    timer.lap("setup")
+    
+    for start, hours in time_engine.iterate_chunks(chunk_hours):
+        loads = _profile(config, time_engine, "load", hours, start)
+        solars = _profile(config, time_engine, "solar", hours, start, config.solar_capacity)
+        prices = _profile(config, time_engine, "price", hours, start)
+        start_step = start * time_engine.steps_per_hour
+        steps = hours * time_engine.steps_per_hour
+        
+        assert len(loads) == steps, "Load profile must cover the horizon"
+        assert len(solars) == steps, "Solar profile must cover the horizon"
+        assert len(prices) == steps, "Price profile must cover the horizon"
+        
+        actual_solars = None
+        if config.enable_weather_uncertainty:
+            actual_solars = [
+                max(0.0, forecast * (1 + rng.normalvariate(0, sigma)))
+                for forecast in solars
+            ]
+        timer.lap("inputs")
+        
+        block_plan = None
+        if config.scheduler == "mpc":
+            block_plan = planner.plan_block(
+                loads, solars if actual_solars is None else actual_solars, prices,
+                battery, time_engine.timestep_hours
+            )
+            timer.lap("plan")
+        elif plan is not None:
+            block_plan = {name: values[start_step:start_step + steps] for name, values in plan.items()}
+        
+        reference = avg_price
+        if reference_prices is not None:
+            reference = reference_prices[start_step:start_step + steps]
+        
+        series = engine.run(loads, solars, prices, reference,
+                            actual_solars=actual_solars, start_step=start_step, plan=block_plan,
+                            decide_on_actual=config.scheduler == "mpc")
+        timer.lap("engine")
+        totals.add(series, loads, solars, prices)
+        
+        if degradation is not None:
+            degradation.add_series(
+                series["battery_soc_pct"], series["battery_charge_kwh"], series["battery_discharge_kwh"]
+            )
+            degradation.advance(battery, hours)
+        timer.lap("aggregation")
+        
+        decisions = None
+        if decision_logger is not None:
+            decision_logger.reset()
+            decision_logger.log_series(series)
+            decisions = decision_logger.export_decisions()
+            timer.lap("decision_log")
+        
+        forecast_corrections = None
+        if _forecast_fields_enabled(config):
+            forecast = series["forecast_solar_kwh"]
+            series["forecast_error_pct"] = np.divide(
+                (series["solar_kwh"] - forecast) * 100, forecast,
+                out=np.zeros_like(forecast), where=forecast > 0
+            )
+            forecast_corrections = [
+                _detect_forecast_correction(error_pct, grid_import, grid_export)
+                for error_pct, grid_import, grid_export in zip(
+                    series["forecast_error_pct"].tolist(),
+                    series["grid_import_kwh"].tolist(),
+                    series["grid_export_kwh"].tolist()
+                )
+            ]
+            timer.lap("forecast")
+        
+        yield {
+            "type": "block",
+            "start_hour": start,
+            "start_step": start_step,
+            "series": series,
+            "decisions": decisions,
+            "forecast_corrections": forecast_corrections
+        }
+        timer.mark()
+    
+    summary = _build_summary(
+        cost_calc, carbon_calc, totals.cost_info(), totals.carbon_info(),
+        totals.baselines(), avg_price, degradation
+    )
+    if planner is not None:
+        summary["scheduler_stats"] = planner.solve_stats()
+    timer.lap("summary")
+    
+    yield {
+        "type": "summary",
+        "config": microgrid_config,
+        "summary": summary
+    }
+
+
+def run_simulation_vectorized(
+    config: SimulationRequest,
+    progress: Optional[Callable[[int, int], None]] = None,
+    timer: Optional[StageTimer] = None
+) -> Dict:
+    """
+    Run microgrid simulation on the vectorized engine.
+    
+    Produces the same numbers as run_simulation(), but stored as one
+    typed array per metric (SimulationColumns) instead of one dict per
+    hour. Use iter_simulation() to consume long horizons without holding
+    every step in memory.
+    
+    Args:
+        config: Simulation configuration
+        progress: Optional callback(done, total) in time steps, called
+                  after each block
+        timer: Optional stage timer (stages of iter_simulation(), plus
+               collect for storing each block)
+        
+    Returns:
+        Dictionary with config, per-step columns, decisions (None without
+        explanations), forecast corrections (None without forecast fields)
+        and summary
+    """
+    forecast_fields = _forecast_fields_enabled(config)
+    steps = config.horizon_days * 24 * 60 // config.timestep_minutes
+    columns = SimulationColumns(steps, forecast_error=forecast_fields)
+    decisions = [] if "explanations" in config.outputs else None
+    forecast_corrections = [] if forecast_fields else None
+    timer = timer if timer is not None else StageTimer()
+    
+    for record in iter_simulation(config, timer=timer):
+        if record["type"] == "block":
+            timer.mark()
+            columns.extend(record["series"])
+            if decisions is not None:
+                decisions.extend(record["decisions"])
+            if forecast_corrections is not None:
+                forecast_corrections.extend(record["forecast_corrections"])
+            if progress is not None:
+                progress(record["start_step"] + len(record["series"]["hour"]), steps)
+            timer.lap("collect")
+        else:
+            final = record
+    
+    return {
+        "config": final["config"],
+        "series": columns,
+        "forecast_corrections": forecast_corrections,
+        "weather_uncertainty_enabled": config.enable_weather_uncertainty,
+        "forecast_fields_enabled": forecast_fields,
+        "decisions": decisions,
+        "summary": final["summary"]
+    }
+
+
+def run_simulation_batch(
+    request: BatchSimulationRequest,
+    executor: Optional[SimulationExecutor] = None,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Dict:
+    """
+    Evaluate many configurations in one pass over the shared profiles.
+    
+    Configurations are simulated together, batched across the
+    configuration axis, and reduced to summary metrics. Each metric
+    equals the matching /simulate summary value for that configuration.
+    
+    Args:
+        request: Batch request (explicit list or cartesian grid)
+        executor: Process pool to spread chunks over (None = in-process)
+        progress: Optional callback(done, total) in configurations
+        
+    Returns:
+        Dictionary with count, shared baseline cost, per-configuration
+        parameters and metrics (one array per field)
+    """
+    parameters = _expand_batch(request)
+    count = parameters["solar_capacity"].size
+    
+    loads = get_load_profile()
+    solar_shape = get_solar_shape()  # per kWp, scaled per configuration in the engine
+    prices = get_price_profile()
+    
+    assert len(loads) == 24, "Load profile must have 24 hours"
+    assert len(solar_shape) == 24, "Solar profile must have 24 hours"
+    assert len(prices) == 24, "Price profile must have 24 hours"
+    
+    daily_avg_price = RuleBasedScheduler(price_profile=prices).get_daily_avg_price()
+    baseline_cost = CostCalculator.calculate_baseline_cost(loads, prices)
+    
+    # Chunked so memory stays bounded at (chunk, hours) per array, and
+    # so each worker gets a few chunks when running on a process pool
+    chunk_size = BATCH_CHUNK_SIZE
+    if executor is not None:
+        chunk_size = min(chunk_size, executor.get_chunk_size(count))
+    tasks = [
+        {
+            "battery": {name: parameters[name][start:start + chunk_size] for name in BATTERY_PARAMS},
+            "solar_capacity": parameters["solar_capacity"][start:start + chunk_size],
+            "grid_intensity": request.grid_carbon_intensity,
+            "loads": loads,
+            "solar_shape": solar_shape,
+            "prices": prices,
+            "avg_price": daily_avg_price,
+            "baseline_cost": baseline_cost
+        }
+        for start in range(0, count, chunk_size)
+    ]
+    
+    def report(done_tasks: int, total_tasks: int):
+        if progress is not None:
+            progress(min(done_tasks * chunk_size, count), count)
+    
+    if executor is not None:
+        chunks = executor.map(run_batch_chunk, tasks, chunk_size=1, progress=report)
+    else:
+        chunks = []
+        for task in tasks:
+            chunks.append(run_batch_chunk(task))
+            report(len(chunks), len(tasks))
+    
+    metrics = {
+        name: np.concatenate([chunk[name] for chunk in chunks])
+        for name in chunks[0]
+    }
+    
+    return {
+        "count": count,
+        "baseline_total_cost": baseline_cost,
+        "parameters": parameters,
+        "metrics": metrics
+    }
+
+
+def run_simulation_fleet(
+    request: FleetSimulationRequest,
+    executor: Optional[SimulationExecutor] = None,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Dict:
+    """
+    Simulate a portfolio of sites together.
+    
+    Sites are split into chunks, and each chunk advances all of its sites
+    in the same vectorized time steps, one day per block with SoC carried
+    over. Each site's summary equals the /simulate summary of the same
+    site (rule-based scheduler, load_scale of 1).
+    
+    Args:
+        request: Fleet request
+        executor: Process pool to spread site chunks over (None = in-process)
+        progress: Optional callback(done, total) in sites
+        
+    Returns:
+        Dictionary with count, config, fleet totals, fleet-wide per-step
+        series and per-site metrics (one array per field)
+    """
+    fleet = Fleet(
+        solar_capacity=[site.solar_capacity for site in request.sites],
+        load_scale=[site.load_scale for site in request.sites],
+        **{name: [getattr(site.battery, name) for site in request.sites] for name in BATTERY_PARAMS}
+    )
+    
+    time_engine = TimeEngine(
+        total_hours=request.horizon_days * 24,
+        timestep_minutes=request.timestep_minutes
+    )
+    total_hours = time_engine.total_hours
+    loads = _profile(request, time_engine, "load", total_hours)
+    solar_shape = _profile(request, time_engine, "solar", total_hours)  # per kWp
+    prices = _profile(request, time_engine, "price", total_hours)
+    avg_price = float(sequential_sum(prices)) / time_engine.total_steps
+    
+    chunk_size = FLEET_CHUNK_SIZE
+    if executor is not None:
+        chunk_size = min(chunk_size, executor.get_chunk_size(fleet.size))
+    tasks = []
+    for start in range(0, fleet.size, chunk_size):
+        sites = fleet.subset(start, start + chunk_size)
+        tasks.append({
+            "sites": {"solar_capacity": sites.solar_capacity, "load_scale": sites.load_scale, **sites.battery_params()},
+            "grid_intensity": request.grid_carbon_intensity,
+            "timestep_minutes": request.timestep_minutes,
+            "loads": loads,
+            "solar_shape": solar_shape,
+            "prices": prices,
+            "avg_price": avg_price,
+            "block_steps": FLEET_BLOCK_HOURS * time_engine.steps_per_hour
+        })
+    
+    def report(done_tasks: int, total_tasks: int):
+        if progress is not None:
+            progress(min(done_tasks * chunk_size, fleet.size), fleet.size)
+    
+    if executor is not None and len(tasks) > 1:
+        chunks = executor.map(run_fleet_chunk, tasks, chunk_size=1, progress=report)
+    else:
+        chunks = []
+        for task in tasks:
+            chunks.append(run_fleet_chunk(task))
+            report(len(chunks), len(tasks))
+    
+    sites = {
+        name: np.concatenate([chunk["sites"][name] for chunk in chunks])
+        for name in chunks[0]["sites"]
+    }
+    series = merge_fleet_series([chunk["series"] for chunk in chunks])
+    
+    return {
+        "count": fleet.size,
+        "config": fleet.get_config(),
+        "fleet": fleet_totals(series, sites, time_engine.timestep_hours),
+        "series": series,
+        "sites": sites
+    }
+
+
+def run_monte_carlo(
+    request: MonteCarloRequest,
+    executor: Optional[SimulationExecutor] = None,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> Dict:
+    """
+    Run many seeded forecast-error samples in one batched pass.
+    
+    Forecast errors are drawn as (samples, hours) arrays and simulated
+    together. Samples are split into fixed-size blocks with child seeds,
+    so a given seed reproduces the same results with or without a
+    process pool.
+    
+    Args:
+        request: Monte Carlo configuration
+        executor: Process pool to spread blocks over (None = in-process)
+        progress: Optional callback(done, total) in samples
+        
+    Returns:
+        Dictionary with seed, per-hour percentile bands and percentiles
+        of the summary totals
+    """
+    from simulator.monte_carlo import MONTE_CARLO_BLOCK, run_monte_carlo_block, percentile_bands
+    
+    loads = get_load_profile()
+    solars = get_solar_profile(solar_capacity=request.solar_capacity)
+    prices = get_price_profile()
+    
+    assert len(loads) == 24, "Load profile must have 24 hours"
+    assert len(solars) == 24, "Solar profile must have 24 hours"
+    assert len(prices) == 24, "Price profile must have 24 hours"
+    
+    daily_avg_price = RuleBasedScheduler(price_profile=prices).get_daily_avg_price()
+    baseline_cost = CostCalculator.calculate_baseline_cost(loads, prices)
+    
+    seed = request.seed
+    if seed is None:
+        seed = int(np.random.SeedSequence().generate_state(1)[0])
+    
+    starts = range(0, request.samples, MONTE_CARLO_BLOCK)
+    block_seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    tasks = [
+        {
+            "battery": request.battery.model_dump(),
+            "grid_intensity": request.grid_carbon_intensity,
+            "loads": loads,
+            "solars": solars,
+            "prices": prices,
+            "avg_price": daily_avg_price,
+            "baseline_cost": baseline_cost,
+            "sigma": request.forecast_error_range,
+            "samples": min(MONTE_CARLO_BLOCK, request.samples - start),
+            "seed": block_seed
+        }
+        for start, block_seed in zip(starts, block_seeds)
+    ]
+    
+    def report(done_tasks: int, total_tasks: int):
+        if progress is not None:
+            progress(min(done_tasks * MONTE_CARLO_BLOCK, request.samples), request.samples)
+    
+    if executor is not None and len(tasks) > 1:
+        blocks = executor.map(run_monte_carlo_block, tasks, chunk_size=1, progress=report)
+    else:
+        blocks = []
+        for task in tasks:
+            blocks.append(run_monte_carlo_block(task))
+            report(len(blocks), len(tasks))
+    
+    samples = {
+        name: np.concatenate([block[name] for block in blocks])
+        for name in blocks[0]
+    }
+    
+    hourly_bands = {
+        "cost_usd": percentile_bands(samples["cost_usd"], 4),
+        "battery_soc_pct": percentile_bands(samples["battery_soc_pct"], 1),
+        "grid_import_kwh": percentile_bands(samples["grid_import_kwh"], 3),
+        "emissions_kg": percentile_bands(samples["emissions_kg"], 3),
+        "solar_kwh": percentile_bands(samples["solar_kwh"], 3)
+    }
+    
+    totals = {}
+    for name in ("optimized_total_cost", "total_cost_savings", "net_emissions_kg",
+                 "total_grid_import_kwh", "renewable_usage_pct"):
+        totals[name] = percentile_bands(samples[name], 2)
+        totals[name]["mean"] = round(float(samples[name].mean()), 2)
+    
+    return {
+        "samples": request.samples,
+        "seed": seed,
+        "hourly_bands": hourly_bands,
+        "totals": totals
+    }
+
+
+def _weather_rng(seed: Optional[int]):
+    """
+    Random source for per-hour forecast errors.
+    
+    Args:
+        seed: Explicit seed, or None to use the global random module
+        
+    Returns:
+        Object with normalvariate()
+    """
+    return random if seed is None else random.Random(seed)
+
+
+def _expand_batch(request: BatchSimulationRequest) -> Dict[str, np.ndarray]:
+    """
+    Expand a batch request into one parameter array per field.
     
-    # Calculate PURE GRID-ONLY baseline (no solar, no battery, no optimization)
-    baseline_cost = cost_calc.calculate_baseline_cost(loads, prices)
+    Args:
+        request: Batch request
+        
+    Returns:
+        Dictionary mapping solar_capacity and BATTERY_PARAMS to arrays
+        
+    Raises:
+        ValueError: If neither or both forms are given, or the batch is too large
+    """
+    if (request.configurations is None) == (request.grid is None):
+        raise ValueError("Provide exactly one of 'configurations' or 'grid'")
     
-    # Optional: Calculate baseline WITH solar but WITHOUT battery (for comparison)
-    baseline_with_solar_cost = cost_calc.calculate_baseline_with_solar_cost(loads, solars, prices)
+    if request.configurations is not None:
+        configs = request.configurations
+        if not configs:
+            raise ValueError("'configurations' must not be empty")
+        if len(configs) > MAX_BATCH_CONFIGS:
+            raise ValueError(f"Batch exceeds {MAX_BATCH_CONFIGS} configurations")
+        parameters = {"solar_capacity": np.array([c.solar_capacity for c in configs])}
+        for name in BATTERY_PARAMS:
+            parameters[name] = np.array([getattr(c.battery, name) for c in configs])
+        return parameters
     
-    # Carbon baseline (grid-only scenario)
-    baseline_emissions = carbon_calc.calculate_baseline_emissions(loads, solars)
+    defaults = BatteryConfig()
+    axes = [request.grid.solar_capacity] + [
+        getattr(request.grid.battery, name) or [getattr(defaults, name)]
+        for name in BATTERY_PARAMS
+    ]
+    count = int(np.prod([len(axis) for axis in axes]))
+    if count == 0:
+        raise ValueError("Grid axes must not be empty")
+    if count > MAX_BATCH_CONFIGS:
+        raise ValueError(f"Grid expands to {count} configurations (max {MAX_BATCH_CONFIGS})")
+    
+    # Same ordering as itertools.product over the axes
+    mesh = np.meshgrid(*(np.asarray(axis, dtype=float) for axis in axes), indexing="ij")
+    names = ("solar_capacity",) + BATTERY_PARAMS
+    return {name: values.ravel() for name, values in zip(names, mesh)}
+
+
+def _simulation_cache_key(request: SimulationRequest) -> Optional[str]:
+    """
+    Result cache key for a /simulate request.
+    
+    Args:
+        request: Simulation configuration
+        
+    Returns:
+        Cache key, or None if the result is not reproducible (weather
+        uncertainty without a seed draws fresh errors every run, and
+        stored series can be replaced between runs)
+    """
+    if request.enable_weather_uncertainty and request.seed is None:
+        return None
+    if request.profile_source == "store":
+        return None
+    # Both engines return identical results, so they share entries (as do
+    # requests differing only in include_timing)
+    return request_key("simulate", request.model_dump(mode="json", exclude={"engine", "include_timing"}))
+
+
+def _reference_window_steps(config: SimulationRequest) -> Optional[int]:
+    """Rolling reference window in time steps, or None for the horizon average."""
+    if config.reference_window_hours is None:
+        return None
+    return config.reference_window_hours * 60 // config.timestep_minutes
+
+
+def _forecast_fields_enabled(config: SimulationRequest) -> bool:
+    """Whether per-step forecast error fields are computed for this request."""
+    return config.enable_weather_uncertainty and "forecast" in config.outputs
+
+
+def _profile(
+    config: Union[SimulationRequest, FleetSimulationRequest],
+    time_engine: TimeEngine,
+    kind: str,
+    hours: int,
+    start: int = 0,
+    solar_capacity: Optional[float] = None
+) -> np.ndarray:
+    """
+    Load, solar or price per time step over a range of hours of the horizon.
+    
+    Builtin profiles repeat the daily pattern; stored series are read
+    from the profile store starting at config.profile_start_hour, at
+    their stored resolution, and converted to the request's time step.
+    
+    Args:
+        config: Simulation or fleet request (profile_source, profile_start_hour)
+        time_engine: Time engine of the run
+        kind: "load" (kWh), "solar" (kWh, or kWh per kWp without a
+              solar_capacity) or "price" ($/kWh)
+        hours: Number of hours
+        start: First hour, counted from the start of the horizon
+        solar_capacity: Installed PV capacity in kW (None = per-kWp shape)
+        
+    Returns:
+        float64 array of per-step values; stored series are converted
+        one block at a time, never to Python lists
+        
+    Raises:
+        ValueError: If a stored series is missing, doesn't cover the
+                    hours or has an incompatible time step
+    """
+    energy = kind != "price"
+    if config.profile_source == "builtin":
+        if kind == "load":
+            hourly = get_load_profile(hours, start)
+        elif kind == "price":
+            hourly = get_price_profile(hours, start)
+        elif solar_capacity is None:
+            hourly = get_solar_shape(hours, start)
+        else:
+            hourly = get_solar_profile(hours, start, solar_capacity)
+        return time_engine.expand_hourly(hourly, energy=energy)
+    
+    store = require_profile_store()
+    try:
+        stored = store.open(kind)
+    except FileNotFoundError as e:
+        raise ValueError(str(e)) from None
+    start += config.profile_start_hour
+    if kind == "load":
+        values = get_stored_load_profile(hours, start, store=store)
+    elif kind == "price":
+        values = get_stored_price_profile(hours, start, store=store)
+    elif solar_capacity is None:
+        values = get_stored_solar_shape(hours, start, store=store)
+    else:
+        values = get_stored_solar_profile(hours, start, solar_capacity, store=store)
+    return time_engine.resample(values, stored.timestep_minutes, energy=energy)
+
+
+def _check_stored_profiles(config: Union[SimulationRequest, FleetSimulationRequest]):
+    """
+    Check that the stored series cover a request's horizon, without reading them.
+    
+    Args:
+        config: Simulation or fleet request with profile_source "store"
+        
+    Raises:
+        ValueError: If a series is missing, too short or has an
+                    incompatible time step
+    """
+    store = require_profile_store()
+    for kind in PROFILE_KINDS:
+        try:
+            stored = store.open(kind)
+        except FileNotFoundError as e:
+            raise ValueError(str(e)) from None
+        stored.slice_hours(config.profile_start_hour, config.horizon_days * 24)
+        if stored.timestep_minutes % config.timestep_minutes and config.timestep_minutes % stored.timestep_minutes:
+            raise ValueError(
+                f"Cannot convert the {stored.timestep_minutes}-minute stored {kind} profile "
+                f"to {config.timestep_minutes}-minute steps"
+            )
+
+
+def _detect_forecast_correction(
+    forecast_error_pct: float,
+    grid_import: float,
+    grid_export: float
+) -> Optional[str]:
+    """
+    Describe a significant forecast deviation that changed grid usage.
+    
+    Args:
+        forecast_error_pct: Actual vs forecast solar deviation (%)
+        grid_import: Grid import for the hour (kWh)
+        grid_export: Grid export for the hour (kWh)
+        
+    Returns:
+        Correction message, or None if the deviation was not significant
+    """
+    if abs(forecast_error_pct) <= 5.0:  # Significant error threshold
+        return None
+    if forecast_error_pct < -10:  # Actual < Forecast (shortfall)
+        if grid_import > 0.1:
+            return f"Unexpected grid import due to solar shortfall ({forecast_error_pct:.1f}% below forecast)"
+    elif forecast_error_pct > 10:  # Actual > Forecast (excess)
+        if grid_export > 0.1:
+            return f"Extra grid export due to solar excess ({forecast_error_pct:.1f}% above forecast)"
+    return None
+
+
+def _build_summary(
+    cost_calc: CostCalculator,
+    carbon_calc: CarbonCalculator,
+    total_cost_info: Dict,
+    total_carbon_info: Dict,
+    baselines: Dict,
+    daily_avg_price: float,
+    degradation: Optional[DegradationModel] = None
+) -> Dict:
+    """
+    Build the summary section shared by both simulation engines.
+    
+    Args:
+        cost_calc: Cost calculator
+        carbon_calc: Carbon calculator
+        total_cost_info: Output of calculate_total_cost()
+        total_carbon_info: Output of calculate_total_emissions()
+        baselines: baseline_cost, baseline_with_solar_cost,
+                   baseline_emissions, total_load and total_solar
+        daily_avg_price: Average price over the horizon ($/kWh)
+        degradation: Battery degradation model, if enabled (adds the
+                     degradation section and cost)
+        
+    Returns:
+        Summary dictionary
+    """
+    baseline_cost = baselines["baseline_cost"]
+    baseline_with_solar_cost = baselines["baseline_with_solar_cost"]
+    baseline_emissions = baselines["baseline_emissions"]
     
     # Calculate savings compared to pure grid-only baseline
     cost_savings = cost_calc.calculate_savings(
         optimized_cost=total_cost_info["net_cost"],
-        baseline_cost=baseline_cost
+        baseline_cost=baseline_cost,
+        degradation_cost=degradation.cost() if degradation is not None else None
     )
     
     carbon_savings = carbon_calc.calculate_savings(
@@ -279,60 +1443,344 @@ def run_simulation(config: SimulationRequest) -> Dict:
     )
     
     # Calculate renewable usage
-    total_load = sum(loads)
-    total_solar = sum(solars)
+    total_load = baselines["total_load"]
+    total_solar = baselines["total_solar"]
     total_grid_import = total_cost_info["total_grid_import_kwh"]
     renewable_used = total_load - total_grid_import
     renewable_percentage = (renewable_used / total_load * 100) if total_load > 0 else 0
     
-    return {
-        "config": microgrid.get_config(),
-        "hourly_results": hourly_results,
-        "decisions": decision_logger.export_decisions(),
-        "summary": {
-            "total_load_kwh": round(total_load, 2),
-            "total_solar_kwh": round(total_solar, 2),
-            "renewable_usage_pct": round(renewable_percentage, 1),
-            "daily_avg_price": round(daily_avg_price, 3),
-            
-            # Explicit baseline comparison metrics (from computed cost_savings)
-            "baseline_total_cost": cost_savings["baseline_total_cost"],
-            "optimized_total_cost": cost_savings["optimized_total_cost"],
-            "total_cost_savings": cost_savings["total_cost_savings"],
-            "savings_percentage": cost_savings["savings_percentage"],
-            
-            "baseline_comparison": {
-                "pure_grid_only_cost": round(baseline_cost, 2),
-                "with_solar_no_battery_cost": round(baseline_with_solar_cost, 2),
-                "with_optimization_cost": round(total_cost_info["net_cost"], 2),
-                "explanation": cost_savings.get("explanation", "")
-            },
-            "cost": cost_savings,
-            "carbon": carbon_savings,
-            "grid": {
-                "total_import_kwh": total_cost_info["total_grid_import_kwh"],
-                "total_export_kwh": total_cost_info["total_grid_export_kwh"]
-            }
+    summary = {
+        "total_load_kwh": round(total_load, 2),
+        "total_solar_kwh": round(total_solar, 2),
+        "renewable_usage_pct": round(renewable_percentage, 1),
+        "daily_avg_price": round(daily_avg_price, 3),
+        
+        # Explicit baseline comparison metrics (from computed cost_savings)
+        "baseline_total_cost": cost_savings["baseline_total_cost"],
+        "optimized_total_cost": cost_savings["optimized_total_cost"],
+        "total_cost_savings": cost_savings["total_cost_savings"],
+        "savings_percentage": cost_savings["savings_percentage"],
+        
+        "baseline_comparison": {
+            "pure_grid_only_cost": round(baseline_cost, 2),
+            "with_solar_no_battery_cost": round(baseline_with_solar_cost, 2),
+            "with_optimization_cost": round(total_cost_info["net_cost"], 2),
+            "explanation": cost_savings.get("explanation", "")
+        },
+        "cost": cost_savings,
+        "carbon": carbon_savings,
+        "grid": {
+            "total_import_kwh": total_cost_info["total_grid_import_kwh"],
+            "total_export_kwh": total_cost_info["total_grid_export_kwh"]
         }
     }
+    if degradation is not None:
+        summary["degradation"] = degradation.summary()
+    return summary
+
+
+def _degradation_model(config: SimulationRequest, battery: Battery) -> Optional[DegradationModel]:
+    """Degradation model for the request, or None when disabled."""
+    if config.degradation is None:
+        return None
+    return DegradationModel(capacity=battery.capacity, **config.degradation.model_dump())
+
+
+def _split_hour(hour: float) -> tuple:
+    """Split hours from start into (whole hour, minute) for HourlyResult."""
+    return divmod(round(hour * 60), 60)
+
+
+def _format_hourly_results(results: Dict) -> List[HourlyResult]:
+    """Format dict-based engine output as HourlyResult models."""
+    hourly_response = []
+    for i, result in enumerate(results["hourly_results"]):
+        decision = results["decisions"][i]
+        hour, minute = _split_hour(result["hour"])
+        hourly_response.append(HourlyResult(
+            hour=hour,
+            minute=minute,
+            time=decision["time"],
+            load_kwh=round(result["load_kwh"], 3),
+            solar_kwh=round(result["solar_kwh"], 3),
+            battery_soc_pct=round(result["battery_soc_pct"], 1),
+            grid_import_kwh=round(result["energy_balance"]["grid_import_kwh"], 3),
+            grid_export_kwh=round(result["energy_balance"]["grid_export_kwh"], 3),
+            battery_charge_kwh=round(result["decision"]["battery_charged_kwh"], 3),
+            battery_discharge_kwh=round(result["decision"]["battery_discharged_kwh"], 3),
+            cost_usd=round(result["cost"]["net_cost"], 4),
+            emissions_kg=round(result["carbon"]["net_emissions_kg"], 3),
+            decision_type=result["decision_type"],  # From scheduler output
+            explanation=decision["explanation"],
+            forecast_solar_kwh=round(result["forecast_solar_kwh"], 3) if result.get("forecast_solar_kwh") is not None else None,
+            actual_solar_kwh=round(result["actual_solar_kwh"], 3) if result.get("actual_solar_kwh") is not None else None,
+            forecast_error_pct=round(result["forecast_error_pct"], 1) if result.get("forecast_error_pct") is not None else None,
+            forecast_correction=result.get("forecast_correction")
+        ))
+    return hourly_response
+
+
+def _rows_to_columns(rows: List[HourlyResult], config: SimulationRequest) -> Dict[str, List]:
+    """Transpose HourlyResult rows into the columnar response shape."""
+    dropped = set()
+    if "explanations" not in config.outputs:
+        dropped.add("explanation")
+    if not _forecast_fields_enabled(config):
+        dropped.update(("forecast_solar_kwh", "actual_solar_kwh", "forecast_error_pct", "forecast_correction"))
+    
+    return {
+        name: [getattr(row, name) for row in rows]
+        for name in HourlyResult.model_fields if name not in dropped
+    }
+
+
+def _format_series_columns(results: Dict) -> Dict[str, List]:
+    """
+    Format vectorized engine output in the columnar response shape.
+    
+    Values are rounded exactly as in HourlyResult rows, one list per
+    field; fields of output groups that were not requested are left out.
+    """
+    series = results["series"]
+    hours = series["hour"].tolist()
+    hour_minute = [_split_hour(hour) for hour in hours]
+    decisions = results["decisions"]
+    
+    columns = {
+        "hour": [hour for hour, _ in hour_minute],
+        "minute": [minute for _, minute in hour_minute],
+        "time": (
+            [decision["time"] for decision in decisions] if decisions is not None
+            else [format_time(hour) for hour in hours]
+        ),
+        "load_kwh": round_half(series["load_kwh"], 3).tolist(),
+        "solar_kwh": round_half(series["solar_kwh"], 3).tolist(),
+        "battery_soc_pct": round_half(series["battery_soc_pct"], 1).tolist(),
+        "grid_import_kwh": series["grid_import_kwh"].tolist(),
+        "grid_export_kwh": series["grid_export_kwh"].tolist(),
+        "battery_charge_kwh": series["battery_charge_kwh"].tolist(),
+        "battery_discharge_kwh": series["battery_discharge_kwh"].tolist(),
+        "cost_usd": series["cost_usd"].tolist(),
+        "emissions_kg": series["emissions_kg"].tolist(),
+        "decision_type": [DECISION_TYPES[code] for code in series["decision_code"].tolist()],
+    }
+    
+    if decisions is not None:
+        columns["explanation"] = [decision["explanation"] for decision in decisions]
+    
+    if results["forecast_fields_enabled"]:
+        columns["forecast_solar_kwh"] = round_half(series["forecast_solar_kwh"], 3).tolist()
+        columns["actual_solar_kwh"] = columns["solar_kwh"]
+        columns["forecast_error_pct"] = round_half(series["forecast_error_pct"], 1).tolist()
+        columns["forecast_correction"] = results["forecast_corrections"]
+    
+    return columns
+
+
+def _format_hourly_series(results: Dict) -> List[HourlyResult]:
+    """Format vectorized engine output as HourlyResult models."""
+    columns = _format_series_columns(results)
+    names = list(columns)
+    return [HourlyResult(**dict(zip(names, values))) for values in zip(*columns.values())]
+
+
+def build_simulation_response(
+    request: SimulationRequest,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> SimulationResponse:
+    """
+    Run a simulation and build the /simulate response model.
+    
+    Module-level so it can be dispatched to SimulationExecutor workers.
+    The per-stage timing is always filled in, so it travels back from
+    worker processes; callers drop it unless include_timing is set.
+    
+    Args:
+        request: Simulation configuration
+        progress: Optional callback(done, total) in time steps
+        
+    Returns:
+        Complete simulation response
+    """
+    timer = StageTimer()
+    hourly_response = []
+    hourly_columns = None
+    if request.engine == "legacy":
+        results = run_simulation(request, progress, timer)
+        timer.mark()
+        hourly_response = _format_hourly_results(results)
+        if request.response_format == "columnar":
+            hourly_columns = _rows_to_columns(hourly_response, request)
+            hourly_response = []
+    else:
+        results = run_simulation_vectorized(request, progress, timer)
+        timer.mark()
+        if request.response_format == "columnar":
+            hourly_columns = _format_series_columns(results)
+        else:
+            hourly_response = _format_hourly_series(results)
+    
+    response = SimulationResponse(
+        success=True,
+        message="Simulation completed successfully",
+        config=results["config"],
+        hourly_results=hourly_response,
+        hourly_columns=hourly_columns,
+        summary=results["summary"],
+        baseline_total_cost=results["summary"]["baseline_total_cost"],
+        optimized_total_cost=results["summary"]["optimized_total_cost"],
+        total_cost_savings=results["summary"]["total_cost_savings"],
+        savings_percentage=results["summary"]["savings_percentage"]
+    )
+    timer.lap("response")
+    response.timing = timer.as_ms()
+    return response
+
+
+def _batch_response(results: Dict) -> BatchSimulationResponse:
+    """Build the /simulate/batch response from run_simulation_batch() results."""
+    return BatchSimulationResponse(
+        success=True,
+        message=f"Simulated {results['count']} configurations",
+        count=results["count"],
+        baseline_total_cost=results["baseline_total_cost"],
+        parameters={name: values.tolist() for name, values in results["parameters"].items()},
+        metrics={name: values.tolist() for name, values in results["metrics"].items()}
+    )
+
+
+def _fleet_response(request: FleetSimulationRequest, results: Dict) -> FleetSimulationResponse:
+    """Build the /simulate/fleet response from run_simulation_fleet() results."""
+    return FleetSimulationResponse(
+        success=True,
+        message=f"Simulated {results['count']} sites over {request.horizon_days} day(s)",
+        count=results["count"],
+        config=results["config"],
+        fleet=results["fleet"],
+        sites={name: values.tolist() for name, values in results["sites"].items()},
+        series={name: values.tolist() for name, values in results["series"].items()}
+    )
+
+
+def _monte_carlo_response(request: MonteCarloRequest, results: Dict) -> MonteCarloResponse:
+    """Build the /simulate/monte-carlo response from run_monte_carlo() results."""
+    return MonteCarloResponse(
+        success=True,
+        message=f"Simulated {results['samples']} forecast-error samples",
+        samples=results["samples"],
+        seed=results["seed"],
+        forecast_error_range=request.forecast_error_range,
+        hourly_bands=results["hourly_bands"],
+        totals=results["totals"]
+    )
+
+
+# Background job functions, called in a job process as fn(request, progress).
+# Each returns the corresponding endpoint's response as a dict.
+def _run_simulate_job(request: SimulationRequest, progress: Callable[[int, int], None]) -> Dict:
+    response = build_simulation_response(request, progress)
+    if not request.include_timing:
+        response.timing = None
+    return response.model_dump()
+
+
+def _run_batch_job(request: BatchSimulationRequest, progress: Callable[[int, int], None]) -> Dict:
+    return _batch_response(run_simulation_batch(request, progress=progress)).model_dump()
+
+
+def _run_fleet_job(request: FleetSimulationRequest, progress: Callable[[int, int], None]) -> Dict:
+    return _fleet_response(request, run_simulation_fleet(request, progress=progress)).model_dump()
+
+
+def _run_monte_carlo_job(request: MonteCarloRequest, progress: Callable[[int, int], None]) -> Dict:
+    return _monte_carlo_response(request, run_monte_carlo(request, progress=progress)).model_dump()
+
+
+JOB_FUNCTIONS = {
+    "simulate": _run_simulate_job,
+    "batch": _run_batch_job,
+    "fleet": _run_fleet_job,
+    "monte-carlo": _run_monte_carlo_job
+}
+
+
+def stream_simulation(request: SimulationRequest) -> Iterator[str]:
+    """
+    Run a simulation and yield NDJSON lines as results become available.
+    
+    Built on iter_simulation(), so only one block of time steps is held
+    in memory at a time and the first lines are sent before the rest of
+    the horizon is simulated. Always uses the vectorized engine, whose
+    results are identical to the legacy one.
+    
+    Args:
+        request: Simulation configuration
+        
+    Yields:
+        Chunks of NDJSON text: one {"type": "step", ...HourlyResult fields}
+        line per time step (a block of steps per chunk), or with
+        response_format="columnar" one {"type": "block", "columns": ...}
+        line per block; then one {"type": "summary", ...} line. If the run
+        fails part way, a final {"type": "error", "detail": ...} line instead
+    """
+    try:
+        for record in iter_simulation(request):
+            if record["type"] == "block":
+                block = {**record, "forecast_fields_enabled": _forecast_fields_enabled(request)}
+                if request.response_format == "columnar":
+                    yield json.dumps({
+                        "type": "block",
+                        "start_step": record["start_step"],
+                        "columns": _format_series_columns(block)
+                    }) + "\n"
+                    continue
+                # One chunk per block keeps per-write overhead off the hot path
+                yield "".join(
+                    json.dumps({"type": "step", **row.model_dump()}) + "\n"
+                    for row in _format_hourly_series(block)
+                )
+            else:
+                summary = record["summary"]
+                yield json.dumps({
+                    "type": "summary",
+                    "success": True,
+                    "message": "Simulation completed successfully",
+                    "config": record["config"],
+                    "summary": summary,
+                    "baseline_total_cost": summary["baseline_total_cost"],
+                    "optimized_total_cost": summary["optimized_total_cost"],
+                    "total_cost_savings": summary["total_cost_savings"],
+                    "savings_percentage": summary["savings_percentage"]
+                }) + "\n"
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band
+        yield json.dumps({"type": "error", "detail": f"Simulation failed: {str(e)}"}) + "\n"
 
 
 # API Endpoints
-@app.get("/")
+@router.get("/")
 def read_root():
     """Root endpoint with API information."""
     return {
         "message": "Microgrid Simulator API - Phase 1",
         "version": "1.0.0",
         "endpoints": {
-            "/simulate": "POST - Run 24-hour simulation",
+            "/simulate": "POST - Run simulation (24 hours by default, multi-day via horizon_days)",
+            "/simulate/stream": "POST - Run simulation, streaming NDJSON records per time step",
+            "/simulate/batch": "POST - Summary metrics for many configurations",
+            "/simulate/monte-carlo": "POST - Percentile bands under forecast uncertainty",
+            "/simulate/fleet": "POST - Portfolio of sites simulated together",
+            "/jobs": "POST - Submit a background simulation job; GET - List jobs",
+            "/jobs/{id}": "GET - Job status, progress and result; DELETE - Cancel or discard",
+            "/cache/stats": "GET - Result cache hit/miss statistics",
+            "/metrics": "GET - Prometheus metrics (latency histograms, stage timings, cache and jobs)",
             "/health": "GET - Health check",
             "/docs": "GET - Interactive API documentation"
         }
     }
 
 
-@app.get("/health")
+@router.get("/health")
 def health_check():
     """Health check endpoint."""
     return {
@@ -342,60 +1790,354 @@ def health_check():
     }
 
 
-@app.post("/simulate", response_model=SimulationResponse)
-def simulate(request: SimulationRequest):
+@router.post("/simulate", response_model=SimulationResponse)
+async def simulate(request: SimulationRequest):
     """
-    Run 24-hour microgrid simulation with rule-based scheduling.
+    Run microgrid simulation with rule-based scheduling over the requested horizon.
     
     Returns complete hourly results with explainable decisions,
     cost analysis, carbon savings, and renewable usage percentage.
+    
+    Runs on the simulation process pool when one is configured
+    (MICROGRID_WORKERS), otherwise on the threadpool (or in the handler
+    itself with MICROGRID_HANDLER_MODE=sync). Repeated
+    deterministic requests are served from the result cache.
+    
+    The rows format is limited to MAX_ROWS_STEPS time steps (422 above
+    it); longer horizons use the columnar format or /simulate/stream.
+    
+    Stage timings are recorded for /metrics; include_timing=true also
+    returns them (milliseconds) in the response.
+    
+    The response is encoded to JSON once and returned as is, so it isn't
+    validated against SimulationResponse again; the cache holds the
+    encoded bytes, so a hit only copies them.
     """
-    try:
-        # Run simulation
-        results = run_simulation(request)
-        
-        # Format hourly results for response
-        hourly_response = []
-        for i, result in enumerate(results["hourly_results"]):
-            decision = results["decisions"][i]
-            hourly_response.append(HourlyResult(
-                hour=result["hour"],
-                time=decision["time"],
-                load_kwh=round(result["load_kwh"], 3),
-                solar_kwh=round(result["solar_kwh"], 3),
-                battery_soc_pct=round(result["battery_soc_pct"], 1),
-                grid_import_kwh=round(result["energy_balance"]["grid_import_kwh"], 3),
-                grid_export_kwh=round(result["energy_balance"]["grid_export_kwh"], 3),
-                battery_charge_kwh=round(result["decision"]["battery_charge"], 3),
-                battery_discharge_kwh=round(result["decision"]["battery_discharge"], 3),
-                cost_usd=round(result["cost"]["net_cost"], 4),
-                emissions_kg=round(result["carbon"]["net_emissions_kg"], 3),
-                decision_type=result["decision_type"],  # From scheduler output
-                explanation=decision["explanation"],
-                forecast_solar_kwh=round(result["forecast_solar_kwh"], 3) if result.get("forecast_solar_kwh") is not None else None,
-                actual_solar_kwh=round(result["actual_solar_kwh"], 3) if result.get("actual_solar_kwh") is not None else None,
-                forecast_error_pct=round(result["forecast_error_pct"], 1) if result.get("forecast_error_pct") is not None else None,
-                forecast_correction=result.get("forecast_correction")
-            ))
-        
-        return SimulationResponse(
-            success=True,
-            message="Simulation completed successfully",
-            config=results["config"],
-            hourly_results=hourly_response,
-            summary=results["summary"],
-            baseline_total_cost=results["summary"]["baseline_total_cost"],
-            optimized_total_cost=results["summary"]["optimized_total_cost"],
-            total_cost_savings=results["summary"]["total_cost_savings"],
-            savings_percentage=results["summary"]["savings_percentage"]
+    steps = request.horizon_days * 24 * 60 // request.timestep_minutes
+    if request.response_format == "rows" and steps > MAX_ROWS_STEPS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"response_format 'rows' returns at most {MAX_ROWS_STEPS} time steps "
+                   f"(this request has {steps}); use response_format 'columnar' or "
+                   f"POST /simulate/stream for longer horizons"
         )
+    
+    timer = StageTimer()
+    elapsed = request_elapsed()
+    if elapsed is not None:
+        timer.add("validation", elapsed)
+    
+    cache = get_cache()
+    key = _simulation_cache_key(request) if cache is not None else None
+    if key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            timer.lap("cache_lookup")
+            get_registry().record_stages("/simulate", timer.as_ms())
+            return _simulation_json(cached, timer.as_ms() if request.include_timing else None)
+    
+    try:
+        executor = get_executor()
+        if SIMULATE_HANDLER_MODE == "sync":
+            if executor is None:
+                response = build_simulation_response(request)
+            else:
+                response = executor.submit(build_simulation_response, request).result()
+        elif executor is None:
+            response = await run_in_threadpool(build_simulation_response, request)
+        else:
+            response = await asyncio.wrap_future(executor.submit(build_simulation_response, request))
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Simulation failed: {str(e)}")
+    
+    # Stages measured where the simulation ran, plus the time around them here
+    # (queueing, dispatch and result transfer)
+    timer.lap("run")
+    for stage, ms in response.timing.items():
+        timer.add(stage, ms / 1000)
+    timer.add("dispatch", timer.stages.pop("run") - sum(response.timing.values()) / 1000)
+    timer.mark()
+    body = response.model_dump_json(exclude={"timing"}).encode()
+    timer.lap("encode")
+    registry = get_registry()
+    registry.record_stages("/simulate", timer.as_ms())
+    registry.inc("microgrid_simulated_steps_total", steps, endpoint="/simulate")
+    
+    if key is not None:
+        cache.put(key, body, weight=steps)
+    return _simulation_json(body, timer.as_ms() if request.include_timing else None)
+
+
+def _simulation_json(body: bytes, timing: Optional[Dict[str, float]]) -> Response:
+    """
+    /simulate response from its JSON encoding.
+    
+    Args:
+        body: SimulationResponse encoded without its timing field
+        timing: Stage timings (ms) to return, or None
+        
+    Returns:
+        JSON response, with timing as the last field
+    """
+    return Response(
+        body[:-1] + b',"timing":' + json.dumps(timing).encode() + b"}",
+        media_type="application/json"
+    )
+
+
+@router.post("/simulate/stream")
+def simulate_stream(request: SimulationRequest):
+    """
+    Run microgrid simulation, streaming results as NDJSON.
+    
+    Sends one line per time step while the simulation runs, then a
+    summary line with the same fields as the /simulate response. Memory
+    stays flat and the first bytes arrive without waiting for the whole
+    horizon. Runs on the threadpool (not the process pool).
+    """
+    if request.profile_source == "store":
+        # Once streaming starts errors can only be sent in-band
+        try:
+            _check_stored_profiles(request)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(stream_simulation(request), media_type="application/x-ndjson")
+
+
+@router.post("/simulate/batch", response_model=BatchSimulationResponse)
+def simulate_batch(request: BatchSimulationRequest):
+    """
+    Run a sizing sweep over many battery/solar configurations.
+    
+    Accepts either an explicit list of configurations or a cartesian
+    grid, and returns only compact summary metrics per configuration.
+    """
+    cache = get_cache()
+    key = request_key("batch", request.model_dump(mode="json")) if cache is not None else None
+    if key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    
+    try:
+        results = run_simulation_batch(request, executor=get_executor())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch simulation failed: {str(e)}")
+    
+    response = _batch_response(results)
+    
+    if key is not None:
+        cache.put(key, response, weight=results["count"])
+    return response
+
+
+@router.post("/simulate/fleet", response_model=FleetSimulationResponse)
+def simulate_fleet(request: FleetSimulationRequest):
+    """
+    Simulate a portfolio of microgrid sites.
+    
+    All sites advance together in vectorized time steps; returns fleet
+    totals, the fleet-wide per-step series and per-site summary metrics.
+    """
+    cache = get_cache()
+    # Not cached with stored series, which can be replaced between runs
+    key = None
+    if cache is not None and request.profile_source == "builtin":
+        key = request_key("fleet", request.model_dump(mode="json"))
+    if key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    
+    try:
+        results = run_simulation_fleet(request, executor=get_executor())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Fleet simulation failed: {str(e)}")
+    
+    response = _fleet_response(request, results)
+    
+    if key is not None:
+        cache.put(key, response, weight=results["count"])
+    return response
+
+
+@router.post("/simulate/monte-carlo", response_model=MonteCarloResponse)
+def simulate_monte_carlo(request: MonteCarloRequest):
+    """
+    Run a Monte Carlo weather-uncertainty study.
+    
+    Simulates many seeded forecast-error samples and returns P5/P50/P95
+    bands for hourly cost, SoC, grid import and emissions, plus the
+    distribution of daily totals.
+    """
+    # Only seeded studies are reproducible, so only those are cached
+    cache = get_cache()
+    key = None
+    if cache is not None and request.seed is not None:
+        key = request_key("monte-carlo", request.model_dump(mode="json"))
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    
+    try:
+        results = run_monte_carlo(request, executor=get_executor())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Monte Carlo simulation failed: {str(e)}")
+    
+    response = _monte_carlo_response(request, results)
+    
+    if key is not None:
+        cache.put(key, response)
+    return response
+
+
+@router.post("/jobs", response_model=JobStatus, status_code=202)
+def submit_job(job: JobRequest):
+    """
+    Submit a long-running simulation as a background job.
+    
+    Takes the request of /simulate, /simulate/batch, /simulate/fleet or
+    /simulate/monte-carlo under "request", tagged by "kind". Returns the
+    queued job at once; poll GET /jobs/{id} for progress and the result.
+    Jobs run in their own processes at lowered priority, so they don't
+    slow interactive requests.
+    """
+    from simulator.jobs import JobQueueFull, get_job_manager
+    try:
+        submitted = get_job_manager().submit(job.root.kind, JOB_FUNCTIONS[job.root.kind], job.root.request)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return submitted.to_dict()
+
+
+@router.get("/jobs")
+def list_jobs():
+    """Retained jobs (without results), oldest first, and job counts by status."""
+    from simulator.jobs import get_job_manager
+    manager = get_job_manager()
+    return {
+        "jobs": [job.to_dict(include_result=False) for job in manager.list()],
+        "stats": manager.stats()
+    }
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+def get_job(job_id: str):
+    """Job status and progress; includes the result once the job has succeeded."""
+    from simulator.jobs import get_job_manager
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict()
+
+
+@router.delete("/jobs/{job_id}", response_model=JobStatus)
+def cancel_job(job_id: str):
+    """Cancel a queued or running job, or discard a finished one."""
+    from simulator.jobs import get_job_manager
+    job = get_job_manager().cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job.to_dict(include_result=False)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Metrics in the Prometheus text format.
+    
+    Request counts and latency histograms per endpoint, per-stage
+    /simulate timings, simulated steps, result cache and job counts.
+    """
+    return PlainTextResponse(get_registry().render(), media_type="text/plain; version=0.0.4")
+
+
+def _cache_metrics():
+    """Result cache statistics as metric families."""
+    cache = get_cache()
+    if cache is None:
+        return []
+    stats = cache.stats()
+    return [
+        (f"microgrid_cache_{name}_total", "counter", f"Result cache {name}", [({}, stats[name])])
+        for name in ("hits", "misses", "evictions", "expirations")
+    ] + [
+        ("microgrid_cache_entries", "gauge", "Result cache entries", [({}, stats["entries"])]),
+        ("microgrid_cache_weight", "gauge", "Result cache total weight", [({}, stats["weight"])])
+    ]
+
+
+def _job_metrics():
+    """Background job counts as metric families."""
+    from simulator.jobs import get_job_manager
+    stats = get_job_manager().stats()
+    return [
+        ("microgrid_jobs", "gauge", "Retained background jobs by status",
+         [({"status": status}, stats[status]) for status in ("queued", "running", "succeeded", "failed", "cancelled")]),
+        ("microgrid_job_evictions_total", "counter", "Finished jobs evicted", [({}, stats["evictions"])])
+    ]
+
+
+get_registry().add_collector(_cache_metrics)
+get_registry().add_collector(_job_metrics)
+
+
+@router.get("/cache/stats")
+def cache_stats():
+    """Result cache statistics (hits, misses, hit rate, evictions, size)."""
+    cache = get_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+def create_app() -> FastAPI:
+    """
+    Build the FastAPI application.
+    
+    Serverless platforms import main and serve the module-level app;
+    tests and benchmarks can call create_app() for a fresh instance.
+    
+    Returns:
+        Application with CORS, request metrics and every endpoint
+    """
+    application = FastAPI(
+        title="Microgrid Simulator API",
+        description="Clean, explainable, time-based microgrid simulation with rule-based scheduling",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+    
+    # Configure CORS
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],  # Allow all HTTP methods
+        allow_headers=["*"],  # Allow all headers
+    )
+    
+    # Request counts and latency histograms per endpoint (served at /metrics)
+    application.add_middleware(MetricsMiddleware)
+    
+    application.include_router(router)
+    return application
+
+
+app = create_app()
 
 
 # Main entry point
 if __name__ == "__main__":
+    import uvicorn
+    
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
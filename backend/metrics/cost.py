@@ -3,7 +3,7 @@ Cost Calculator
 Calculates electricity costs and savings.
 """
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 
 class CostCalculator:
@@ -147,7 +147,8 @@ class CostCalculator:
     @staticmethod
     def calculate_savings(
         optimized_cost: float,
-        baseline_cost: float
+        baseline_cost: float,
+        degradation_cost: Optional[float] = None
     ) -> Dict[str, float]:
         """
         Calculate cost savings compared to baseline.
@@ -155,6 +156,8 @@ class CostCalculator:
         Args:
             optimized_cost: Cost with microgrid optimization
             baseline_cost: Baseline cost (pure grid-only)
+            degradation_cost: Battery wear cost over the same period
+                              (adds the *_with_degradation fields)
             
         Returns:
             Dictionary with savings metrics and explanation
@@ -181,7 +184,7 @@ class CostCalculator:
         else:
             explanation = "Optimized cost equals baseline (no savings achieved)."
         
-        return {
+        savings = {
             "baseline_total_cost": round(baseline_cost, 2),
             "optimized_total_cost": round(optimized_cost, 2),
             "total_cost_savings": round(absolute_savings, 2),
@@ -193,3 +196,14 @@ class CostCalculator:
             "absolute_savings": round(absolute_savings, 2),
             "percentage_savings": round(percentage_savings, 1)
         }
+        
+        # Energy savings net of battery wear
+        if degradation_cost is not None:
+            total_cost = optimized_cost + degradation_cost
+            savings.update({
+                "degradation_cost": round(degradation_cost, 2),
+                "total_cost_with_degradation": round(total_cost, 2),
+                "savings_with_degradation": round(baseline_cost - total_cost, 2)
+            })
+        
+        return savings
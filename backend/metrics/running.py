@@ -0,0 +1,110 @@
+"""
+Running Totals
+Accumulates summary metrics block by block for long simulations.
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+
+from simulator.vectorized import sequential_sum
+
+
+class RunningTotals:
+    """
+    Running sums behind the simulation summary.
+    
+    Long horizons are simulated in blocks of hours; each block is added
+    here and dropped, so memory does not grow with the horizon. Sums run
+    strictly left to right, so a one-day run gives the same rounded totals
+    as CostCalculator.calculate_total_cost() and friends.
+    """
+    
+    FIELDS = (
+        "import_cost", "export_revenue", "grid_import_kwh", "grid_export_kwh",
+        "import_emissions_kg", "export_credit_kg", "load_kwh", "solar_kwh",
+        "baseline_cost", "baseline_with_solar_cost", "baseline_emissions_kg"
+    )
+    
+    def __init__(self, grid_intensity: float):
+        """
+        Initialize running totals at zero.
+        
+        Args:
+            grid_intensity: Grid carbon intensity in kg CO2 per kWh
+        """
+        self.grid_intensity = grid_intensity
+        self.totals = dict.fromkeys(self.FIELDS, 0.0)
+        self.hours = 0
+    
+    def add(
+        self,
+        series: Dict[str, np.ndarray],
+        loads: Sequence[float],
+        solars: Sequence[float],
+        prices: Sequence[float]
+    ):
+        """
+        Add one block of hours.
+        
+        Args:
+            series: Per-hour arrays from VectorizedEngine.run() for the block
+            loads: Load profile for the block (kWh)
+            solars: Forecast solar profile for the block (kWh)
+            prices: Price profile for the block ($/kWh)
+        """
+        load = np.asarray(loads, dtype=float)
+        solar = np.asarray(solars, dtype=float)
+        price = np.asarray(prices, dtype=float)
+        
+        # Baselines: grid-only, and solar without battery (as in the calculators)
+        grid_needed = np.maximum(0, load - np.minimum(solar, load))
+        blocks = {
+            "import_cost": series["import_cost"],
+            "export_revenue": series["export_revenue"],
+            "grid_import_kwh": series["grid_import_kwh"],
+            "grid_export_kwh": series["grid_export_kwh"],
+            "import_emissions_kg": series["import_emissions_kg"],
+            "export_credit_kg": series["export_credit_kg"],
+            "load_kwh": load,
+            "solar_kwh": solar,
+            "baseline_cost": load * price,
+            "baseline_with_solar_cost": grid_needed * price,
+            "baseline_emissions_kg": grid_needed * self.grid_intensity
+        }
+        
+        for name, values in blocks.items():
+            self.totals[name] = float(sequential_sum(values, self.totals[name]))
+        self.hours += load.size
+    
+    def cost_info(self) -> Dict[str, float]:
+        """Totals in the format of CostCalculator.calculate_total_cost()."""
+        t = self.totals
+        return {
+            "total_import_cost": round(t["import_cost"], 2),
+            "total_export_revenue": round(t["export_revenue"], 2),
+            "net_cost": round(t["import_cost"] - t["export_revenue"], 2),
+            "total_grid_import_kwh": round(t["grid_import_kwh"], 2),
+            "total_grid_export_kwh": round(t["grid_export_kwh"], 2)
+        }
+    
+    def carbon_info(self) -> Dict[str, float]:
+        """Totals in the format of CarbonCalculator.calculate_total_emissions()."""
+        t = self.totals
+        return {
+            "total_import_emissions_kg": round(t["import_emissions_kg"], 2),
+            "total_export_credit_kg": round(t["export_credit_kg"], 2),
+            "net_emissions_kg": round(t["import_emissions_kg"] - t["export_credit_kg"], 2),
+            "grid_intensity_kg_per_kwh": self.grid_intensity
+        }
+    
+    def baselines(self) -> Dict[str, float]:
+        """Baseline totals, rounded like the CostCalculator/CarbonCalculator methods."""
+        t = self.totals
+        return {
+            "baseline_cost": round(t["baseline_cost"], 2),
+            "baseline_with_solar_cost": round(t["baseline_with_solar_cost"], 2),
+            "baseline_emissions": round(t["baseline_emissions_kg"], 2),
+            "total_load": t["load_kwh"],
+            "total_solar": t["solar_kwh"]
+        }
@@ -1,8 +1,131 @@
 """
 Battery Energy Storage System Model
 Handles battery state, constraints, and charge/discharge operations.
+
+The step functions at module level are pure: they map the stored energy
+and a requested flow to the new stored energy and the actual flow, using
+only their float arguments. Hot loops bind the battery's limits to local
+variables once and call them (or inline the same arithmetic) without any
+attribute lookups per step; Battery wraps them for object-style use.
 """
 
+from typing import Tuple
+
+
+def available_charge(soc: float, max_energy: float, max_charge: float, efficiency: float) -> float:
+    """
+    Energy that can be charged in one time step.
+
+    Args:
+        soc: Stored energy (kWh)
+        max_energy: Stored energy upper bound (kWh)
+        max_charge: Charge limit for the time step (kWh)
+        efficiency: Charging efficiency (0-1)
+
+    Returns:
+        Available charge capacity in kWh
+    """
+    # Account for efficiency loss during charging
+    available = (max_energy - soc) / efficiency
+    return available if available < max_charge else max_charge
+
+
+def available_discharge(soc: float, min_energy: float, max_discharge: float) -> float:
+    """
+    Energy that can be discharged in one time step.
+
+    Args:
+        soc: Stored energy (kWh)
+        min_energy: Stored energy lower bound (kWh)
+        max_discharge: Discharge limit for the time step (kWh)
+
+    Returns:
+        Available discharge capacity in kWh
+    """
+    available = soc - min_energy
+    return available if available < max_discharge else max_discharge
+
+
+def charge_step(
+    soc: float,
+    energy: float,
+    min_energy: float,
+    max_energy: float,
+    max_charge: float,
+    efficiency: float
+) -> Tuple[float, float]:
+    """
+    Charge for one time step.
+
+    Args:
+        soc: Stored energy before the step (kWh)
+        energy: Requested charge (kWh)
+        min_energy: Stored energy lower bound (kWh)
+        max_energy: Stored energy upper bound (kWh)
+        max_charge: Charge limit for the time step (kWh)
+        efficiency: Charging efficiency (0-1)
+
+    Returns:
+        Tuple of (stored energy after the step, actual charge) in kWh
+    """
+    if energy <= 0:
+        return soc, 0.0
+
+    # Limit by available capacity
+    available = (max_energy - soc) / efficiency
+    if available > max_charge:
+        available = max_charge
+    if energy > available:
+        energy = available
+
+    # Apply efficiency loss and keep SoC within bounds
+    soc += energy * efficiency
+    if soc < min_energy:
+        soc = min_energy
+    elif soc > max_energy:
+        soc = max_energy
+    return soc, energy
+
+
+def discharge_step(
+    soc: float,
+    energy: float,
+    min_energy: float,
+    max_energy: float,
+    max_discharge: float
+) -> Tuple[float, float]:
+    """
+    Discharge for one time step.
+
+    Args:
+        soc: Stored energy before the step (kWh)
+        energy: Requested discharge (kWh)
+        min_energy: Stored energy lower bound (kWh)
+        max_energy: Stored energy upper bound (kWh)
+        max_discharge: Discharge limit for the time step (kWh)
+
+    Returns:
+        Tuple of (stored energy after the step, actual discharge) in kWh
+    """
+    if energy <= 0:
+        return soc, 0.0
+
+    # Limit by available capacity
+    available = soc - min_energy
+    if available > max_discharge:
+        available = max_discharge
+    if energy > available:
+        energy = available
+
+    # Efficiency already factored in; keep SoC within bounds
+    soc -= energy
+    if soc < min_energy:
+        soc = min_energy
+    elif soc > max_energy:
+        soc = max_energy
+    return soc, energy
+
+
 class Battery:
     """
     Battery model with capacity, SoC constraints, and charge/discharge limits.
@@ -15,8 +138,15 @@ class Battery:
         max_discharge_rate: Maximum discharging power (kW)
         efficiency: Round-trip efficiency (0-1)
         current_soc: Current state of charge (kWh)
+        min_energy: Stored energy lower bound, capacity * min_soc (kWh)
+        max_energy: Stored energy upper bound, capacity * max_soc (kWh)
     """
     
+    __slots__ = (
+        "_capacity", "_min_soc", "_max_soc", "min_energy", "max_energy",
+        "max_charge_rate", "max_discharge_rate", "efficiency", "current_soc"
+    )
+    
     def __init__(
         self,
         capacity: float,
@@ -39,9 +169,10 @@ class Battery:
             efficiency: Round-trip efficiency (0.95 = 95%)
             initial_soc: Starting SoC fraction
         """
-        self.capacity = capacity
-        self.min_soc = min_soc
-        self.max_soc = max_soc
+        self._capacity = capacity
+        self._min_soc = min_soc
+        self._max_soc = max_soc
+        self._update_bounds()
         self.max_charge_rate = max_charge_rate
         self.max_discharge_rate = max_discharge_rate
         self.efficiency = efficiency
@@ -52,97 +183,119 @@ class Battery:
         # Validate initial state
         self._validate_soc()
     
+    @property
+    def capacity(self) -> float:
+        return self._capacity
+    
+    @capacity.setter
+    def capacity(self, value: float):
+        # Stored energy above a reduced max_soc bound is lost (capacity fade)
+        self._capacity = value
+        self._update_bounds()
+        self._validate_soc()
+    
+    @property
+    def min_soc(self) -> float:
+        return self._min_soc
+    
+    @min_soc.setter
+    def min_soc(self, value: float):
+        self._min_soc = value
+        self._update_bounds()
+    
+    @property
+    def max_soc(self) -> float:
+        return self._max_soc
+    
+    @max_soc.setter
+    def max_soc(self, value: float):
+        self._max_soc = value
+        self._update_bounds()
+    
+    def _update_bounds(self):
+        """Precompute stored energy bounds (kWh) from capacity and SoC limits."""
+        self.min_energy = self._capacity * self._min_soc
+        self.max_energy = self._capacity * self._max_soc
+    
     def _validate_soc(self):
         """Ensure SoC is within bounds."""
-        min_energy = self.capacity * self.min_soc
-        max_energy = self.capacity * self.max_soc
-        
-        if self.current_soc < min_energy:
-            self.current_soc = min_energy
-        elif self.current_soc > max_energy:
-            self.current_soc = max_energy
+        if self.current_soc < self.min_energy:
+            self.current_soc = self.min_energy
+        elif self.current_soc > self.max_energy:
+            self.current_soc = self.max_energy
     
     def get_soc_percentage(self) -> float:
         """Get current SoC as percentage (0-100)."""
-        return (self.current_soc / self.capacity) * 100
+        return (self.current_soc / self._capacity) * 100
     
     def get_soc_fraction(self) -> float:
         """Get current SoC as fraction (0-1)."""
-        return self.current_soc / self.capacity
+        return self.current_soc / self._capacity
     
-    def get_available_charge_capacity(self) -> float:
+    def get_available_charge_capacity(self, timestep_hours: float = 1.0) -> float:
         """
-        Calculate how much energy can be charged in next hour.
+        Calculate how much energy can be charged in the next time step.
+        
+        Args:
+            timestep_hours: Length of the time step in hours
         
         Returns:
-            Available charge capacity in kWh (limited by max_charge_rate and max_soc)
+            Available charge capacity in kWh (limited by max_charge_rate
+            over the time step and by max_soc)
         """
-        max_energy = self.capacity * self.max_soc
-        available_space = max_energy - self.current_soc
-        
-        # Limited by both available space and max charge rate
-        # Account for efficiency loss during charging
-        return min(available_space / self.efficiency, self.max_charge_rate)
+        return available_charge(
+            self.current_soc, self.max_energy,
+            self.max_charge_rate * timestep_hours, self.efficiency
+        )
     
-    def get_available_discharge_capacity(self) -> float:
+    def get_available_discharge_capacity(self, timestep_hours: float = 1.0) -> float:
         """
-        Calculate how much energy can be discharged in next hour.
+        Calculate how much energy can be discharged in the next time step.
+        
+        Args:
+            timestep_hours: Length of the time step in hours
         
         Returns:
-            Available discharge capacity in kWh (limited by max_discharge_rate and min_soc)
+            Available discharge capacity in kWh (limited by max_discharge_rate
+            over the time step and by min_soc)
         """
-        min_energy = self.capacity * self.min_soc
-        available_energy = self.current_soc - min_energy
-        
-        # Limited by both available energy and max discharge rate
-        # Efficiency loss already accounted for in stored energy
-        return min(available_energy, self.max_discharge_rate)
+        return available_discharge(
+            self.current_soc, self.min_energy, self.max_discharge_rate * timestep_hours
+        )
     
-    def charge(self, energy: float) -> float:
+    def charge(self, energy: float, timestep_hours: float = 1.0) -> float:
         """
         Charge battery with specified energy.
         
         Args:
             energy: Energy to charge in kWh
+            timestep_hours: Length of the time step in hours
             
         Returns:
             Actual energy charged (may be less due to constraints)
         """
-        if energy <= 0:
-            return 0.0
-        
-        # Limit by available capacity
-        max_charge = self.get_available_charge_capacity()
-        actual_charge = min(energy, max_charge)
-        
-        # Apply efficiency loss and update SoC
-        self.current_soc += actual_charge * self.efficiency
-        self._validate_soc()
-        
-        return actual_charge
+        self.current_soc, charged = charge_step(
+            self.current_soc, energy, self.min_energy, self.max_energy,
+            self.max_charge_rate * timestep_hours, self.efficiency
+        )
+        return charged
     
-    def discharge(self, energy: float) -> float:
+    def discharge(self, energy: float, timestep_hours: float = 1.0) -> float:
         """
         Discharge battery by specified energy.
         
         Args:
             energy: Energy to discharge in kWh
+            timestep_hours: Length of the time step in hours
             
         Returns:
             Actual energy discharged (may be less due to constraints)
         """
-        if energy <= 0:
-            return 0.0
-        
-        # Limit by available capacity
-        max_discharge = self.get_available_discharge_capacity()
-        actual_discharge = min(energy, max_discharge)
-        
-        # Update SoC (efficiency already factored in)
-        self.current_soc -= actual_discharge
-        self._validate_soc()
-        
-        return actual_discharge
+        self.current_soc, discharged = discharge_step(
+            self.current_soc, energy, self.min_energy, self.max_energy,
+            self.max_discharge_rate * timestep_hours
+        )
+        return discharged
     
     def reset(self, initial_soc: float = 0.5):
         """Reset battery to initial state."""
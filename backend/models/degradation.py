@@ -0,0 +1,276 @@
+"""
+Battery Degradation Model
+Cycle counting, throughput and calendar aging with capacity fade.
+
+Cycle depths are counted with a streaming rainflow algorithm (ASTM
+E1049 three-point rule): SoC samples are fed one at a time or in blocks,
+and only the unclosed reversals (the residue) are kept, so a year-long
+SoC trace needs neither a second pass nor its full history.
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from models.battery import Battery
+
+
+class RainflowCounter:
+    """
+    Incremental rainflow cycle counter.
+
+    Closed cycles are folded into running totals as they are found;
+    cycles still open are the residue, counted as half cycles when a
+    snapshot is taken.
+    """
+
+    def __init__(self, weight: Optional[Callable[[float], float]] = None):
+        """
+        Initialize counter.
+
+        Args:
+            weight: Optional function of cycle range (e.g. damage per full
+                    cycle); accumulated in self.weighted per counted cycle
+        """
+        self.weight = weight
+        self.cycles = 0.0       # full cycles count 1, half cycles 0.5
+        self.total_range = 0.0  # sum of range x count
+        self.weighted = 0.0     # sum of weight(range) x count
+
+        self._reversals: List[float] = []
+        self._tentative: Optional[float] = None
+        self._direction = 0
+
+    def add(self, value: float):
+        """
+        Feed the next sample.
+
+        Args:
+            value: Sample value (e.g. SoC %)
+        """
+        if not self._reversals:
+            # The first sample is the starting reversal
+            self._reversals.append(value)
+            return
+
+        last = self._reversals[-1] if self._tentative is None else self._tentative
+        if value == last:
+            return
+
+        direction = 1 if value > last else -1
+        if self._tentative is None or direction == self._direction:
+            # Start or extend the current run
+            self._tentative = value
+        else:
+            # Direction changed: the run's end is a confirmed reversal
+            self._reversals.append(self._tentative)
+            self._extract(self._reversals, self._record)
+            self._tentative = value
+        self._direction = direction
+
+    def extend(self, values: Sequence[float]):
+        """
+        Feed a block of samples.
+
+        Samples inside a strictly monotonic run cannot be reversals and
+        are dropped with array operations before the scalar loop; the
+        counts are identical to calling add() for every sample.
+
+        Args:
+            values: Sample values
+        """
+        values = np.asarray(values, dtype=float)
+        if values.size > 2:
+            slope = np.sign(np.diff(values))
+            keep = np.ones(values.size, dtype=bool)
+            keep[1:-1] = ~((slope[:-1] == slope[1:]) & (slope[1:] != 0))
+            values = values[keep]
+
+        for value in values.tolist():
+            self.add(value)
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Totals including the residue, without changing the counter.
+
+        The latest sample is treated as the final reversal; ranges left
+        in the residue count as half cycles.
+
+        Returns:
+            Dictionary with cycles, total_range and weighted totals
+        """
+        totals = {"cycles": self.cycles, "total_range": self.total_range, "weighted": self.weighted}
+
+        def record(cycle_range: float, count: float):
+            totals["cycles"] += count
+            totals["total_range"] += cycle_range * count
+            if self.weight is not None:
+                totals["weighted"] += self.weight(cycle_range) * count
+
+        points = list(self._reversals)
+        if self._tentative is not None:
+            points.append(self._tentative)
+            self._extract(points, record)
+        for start, end in zip(points, points[1:]):
+            record(abs(end - start), 0.5)
+        return totals
+
+    def residue_size(self) -> int:
+        """Number of open reversals held in memory."""
+        return len(self._reversals) + (self._tentative is not None)
+
+    def _record(self, cycle_range: float, count: float):
+        """Fold a counted cycle into the running totals."""
+        self.cycles += count
+        self.total_range += cycle_range * count
+        if self.weight is not None:
+            self.weighted += self.weight(cycle_range) * count
+
+    @staticmethod
+    def _extract(points: List[float], record: Callable[[float, float], None]):
+        """Three-point rule on the newest reversals (modifies points in place)."""
+        while len(points) >= 3:
+            latest = abs(points[-1] - points[-2])
+            previous = abs(points[-2] - points[-3])
+            if latest < previous:
+                return
+            if len(points) == 3:
+                # Range includes the starting point: half cycle
+                record(previous, 0.5)
+                del points[0]
+            else:
+                record(previous, 1.0)
+                del points[-3:-1]
+
+
+class DegradationModel:
+    """
+    Battery aging from cycling and time, with capacity fade.
+
+    Life used is the sum of cycle damage and calendar aging:
+
+        cycle damage  = sum over rainflow cycles of count * depth**depth_exponent / cycle_life
+        calendar      = years / calendar_life_years
+
+    where depth is the cycle's SoC range as a fraction of capacity and
+    cycle_life is the number of 100%-deep cycles to end of life. Capacity
+    fades linearly with life used, down to end_of_life_capacity; the cost
+    of degradation is the share of battery life used times its
+    replacement cost.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        cycle_life: float = 6000.0,
+        depth_exponent: float = 1.5,
+        calendar_life_years: float = 15.0,
+        end_of_life_capacity: float = 0.8,
+        replacement_cost_per_kwh: float = 300.0
+    ):
+        """
+        Initialize degradation model.
+
+        Args:
+            capacity: Initial (nameplate) battery capacity (kWh)
+            cycle_life: Full 100%-depth cycles until end of life
+            depth_exponent: Cycle damage grows with depth**depth_exponent
+            calendar_life_years: Years until end of life with no cycling
+            end_of_life_capacity: Remaining capacity fraction at end of life
+            replacement_cost_per_kwh: Battery replacement cost ($/kWh)
+        """
+        self.initial_capacity = capacity
+        self.cycle_life = cycle_life
+        self.depth_exponent = depth_exponent
+        self.calendar_life_years = calendar_life_years
+        self.end_of_life_capacity = end_of_life_capacity
+        self.replacement_cost_per_kwh = replacement_cost_per_kwh
+
+        self.counter = RainflowCounter(weight=self._cycle_damage)
+        self.charge_throughput = 0.0
+        self.discharge_throughput = 0.0
+        self.hours = 0.0
+
+    def _cycle_damage(self, soc_range_pct: float) -> float:
+        """Life used by one full cycle of the given SoC range (%)."""
+        return (soc_range_pct / 100) ** self.depth_exponent / self.cycle_life
+
+    def add_step(self, soc_pct: float, charged: float, discharged: float):
+        """
+        Record one time step.
+
+        Args:
+            soc_pct: Battery SoC after the step (% of current capacity)
+            charged: Energy charged during the step (kWh)
+            discharged: Energy discharged during the step (kWh)
+        """
+        self.counter.add(soc_pct)
+        self.charge_throughput += charged
+        self.discharge_throughput += discharged
+
+    def add_series(self, soc_pct: Sequence[float], charged: Sequence[float], discharged: Sequence[float]):
+        """
+        Record a block of time steps; same totals as add_step() per step.
+
+        Args:
+            soc_pct: Battery SoC after each step (%)
+            charged: Energy charged per step (kWh)
+            discharged: Energy discharged per step (kWh)
+        """
+        self.counter.extend(soc_pct)
+        # Left-to-right running sums, as repeated add_step() calls
+        self.charge_throughput = float(np.cumsum(np.append(self.charge_throughput, charged))[-1])
+        self.discharge_throughput = float(np.cumsum(np.append(self.discharge_throughput, discharged))[-1])
+
+    def advance(self, battery: Battery, hours: float):
+        """
+        Age the battery by elapsed time and apply capacity fade.
+
+        Called at the end of each block of steps; capacity stays fixed
+        within a block.
+
+        Args:
+            battery: Battery whose capacity fades
+            hours: Hours elapsed since the last call
+        """
+        self.hours += hours
+        battery.capacity = self.initial_capacity * (1 - self.capacity_fade())
+
+    def life_used(self) -> Dict[str, float]:
+        """Share of battery life used by cycling and by calendar aging."""
+        cycle = self.counter.snapshot()["weighted"]
+        calendar = self.hours / 8760 / self.calendar_life_years
+        return {"cycle": cycle, "calendar": calendar, "total": cycle + calendar}
+
+    def capacity_fade(self) -> float:
+        """Fraction of initial capacity lost (capped at end of life)."""
+        return (1 - self.end_of_life_capacity) * min(self.life_used()["total"], 1.0)
+
+    def cost(self) -> float:
+        """Replacement cost of the battery life used so far ($)."""
+        return self.life_used()["total"] * self.initial_capacity * self.replacement_cost_per_kwh
+
+    def summary(self) -> Dict:
+        """
+        Degradation metrics for the simulation summary.
+
+        Returns:
+            Dictionary with throughput, equivalent full cycles, rainflow
+            cycles, life used, capacity fade and degradation cost
+        """
+        counted = self.counter.snapshot()
+        life = self.life_used()
+        throughput = self.charge_throughput + self.discharge_throughput
+        fade = self.capacity_fade()
+
+        return {
+            "throughput_kwh": round(throughput, 2),
+            "equivalent_full_cycles": round(throughput / (2 * self.initial_capacity), 2),
+            "rainflow_cycles": round(counted["cycles"], 1),
+            "average_cycle_depth_pct": round(counted["total_range"] / counted["cycles"], 1) if counted["cycles"] else 0.0,
+            "cycle_life_used_pct": round(life["cycle"] * 100, 4),
+            "calendar_life_used_pct": round(life["calendar"] * 100, 4),
+            "capacity_fade_pct": round(fade * 100, 3),
+            "current_capacity_kwh": round(self.initial_capacity * (1 - fade), 3),
+            "degradation_cost": round(self.cost(), 2)
+        }
@@ -0,0 +1,123 @@
+"""
+Fleet Model
+Many microgrid sites with per-site parameters held as arrays.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+
+class Fleet:
+    """
+    Portfolio of microgrid sites.
+
+    The array counterpart of Microgrid: each battery parameter and
+    profile scale is an array with one entry per site (scalars are
+    broadcast), so a whole portfolio is advanced with one NumPy
+    operation per time step. Sites share the load profile, scaled per
+    site by load_scale, and the per-kWp solar shape, scaled by each
+    site's solar_capacity; per-site profiles may be given instead.
+    """
+
+    BATTERY_PARAMS = (
+        "capacity", "min_soc", "max_soc", "max_charge_rate",
+        "max_discharge_rate", "efficiency", "initial_soc"
+    )
+
+    def __init__(
+        self,
+        capacity,
+        min_soc=0.2,
+        max_soc=0.95,
+        max_charge_rate=5.0,
+        max_discharge_rate=5.0,
+        efficiency=0.95,
+        initial_soc=0.5,
+        solar_capacity=6.0,
+        load_scale=1.0
+    ):
+        """
+        Initialize fleet.
+
+        Args:
+            capacity: Battery capacities (kWh)
+            min_soc: Minimum SoC fractions (0-1)
+            max_soc: Maximum SoC fractions (0-1)
+            max_charge_rate: Max charging power (kW)
+            max_discharge_rate: Max discharging power (kW)
+            efficiency: Round-trip efficiencies (0-1)
+            initial_soc: Starting SoC fractions (0-1)
+            solar_capacity: Solar PV capacities (kW)
+            load_scale: Multipliers on the shared load profile
+        """
+        params = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(p, dtype=float)) for p in (
+                capacity, min_soc, max_soc, max_charge_rate, max_discharge_rate,
+                efficiency, initial_soc, solar_capacity, load_scale
+            ))
+        )
+        (self.capacity, self.min_soc, self.max_soc, self.max_charge_rate,
+         self.max_discharge_rate, self.efficiency, self.initial_soc,
+         self.solar_capacity, self.load_scale) = (np.array(p) for p in params)
+
+    def __len__(self) -> int:
+        return self.capacity.size
+
+    @property
+    def size(self) -> int:
+        """Number of sites."""
+        return self.capacity.size
+
+    def battery_params(self) -> Dict[str, np.ndarray]:
+        """Battery parameter arrays, as keyword arguments for BatchEngine."""
+        return {name: getattr(self, name) for name in self.BATTERY_PARAMS}
+
+    def subset(self, start: int, stop: int) -> "Fleet":
+        """
+        Sites start..stop - 1 as a fleet of their own.
+
+        Args:
+            start: First site
+            stop: Site after the last one
+
+        Returns:
+            Fleet with copies of the selected parameters
+        """
+        return Fleet(
+            solar_capacity=self.solar_capacity[start:stop],
+            load_scale=self.load_scale[start:stop],
+            **{name: values[start:stop] for name, values in self.battery_params().items()}
+        )
+
+    def site_profiles(self, loads, solars):
+        """
+        Scale profiles to each site.
+
+        Args:
+            loads: Load profile (kWh), shared (steps,) or per site (sites, steps)
+            solars: Solar generation per kWp (kWh/kWp), shared (steps,) or
+                    per site (sites, steps)
+
+        Returns:
+            Tuple of (loads, solars) arrays of shape (sites, steps) in kWh
+        """
+        loads = np.asarray(loads, dtype=float)
+        solars = np.asarray(solars, dtype=float)
+        return self.load_scale[:, None] * loads, self.solar_capacity[:, None] * solars
+
+    def get_config(self) -> dict:
+        """
+        Get fleet configuration.
+
+        Returns:
+            Dictionary with site count and fleet-wide capacity totals
+        """
+        return {
+            "sites": self.size,
+            "total_battery_capacity_kwh": round(float(self.capacity.sum()), 3),
+            "total_max_charge_rate_kw": round(float(self.max_charge_rate.sum()), 3),
+            "total_max_discharge_rate_kw": round(float(self.max_discharge_rate.sum()), 3),
+            "total_solar_capacity_kw": round(float(self.solar_capacity.sum()), 3),
+            "mean_load_scale": round(float(self.load_scale.mean()), 4)
+        }
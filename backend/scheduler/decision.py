@@ -0,0 +1,112 @@
+"""
+Scheduling Decisions
+Decision records shared by all schedulers.
+
+Every scheduler returns the same dictionary as
+RuleBasedScheduler.schedule_hour(), so the simulation loop and
+DecisionLogger work unchanged whichever scheduler made the decision.
+"""
+
+from typing import Dict, List
+
+# Charging beyond the excess solar by more than this (kWh) counts as
+# charging from the grid; smaller differences are solver noise
+GRID_CHARGE_TOLERANCE = 1e-6
+
+
+def classify_decision(
+    solar_used: float,
+    battery_charged: float,
+    battery_discharged: float,
+    grid_used: float,
+    excess_solar: float
+) -> str:
+    """
+    Determine decision type from the actual energy flows.
+
+    Decision type is inferred dynamically from the final state, NOT
+    hardcoded; most specific conditions are checked first.
+
+    Args:
+        solar_used: Solar used directly by load (kWh)
+        battery_charged: Energy charged to battery (kWh)
+        battery_discharged: Energy discharged from battery (kWh)
+        grid_used: Grid energy supplied to load (kWh)
+        excess_solar: Solar left after meeting load (kWh)
+
+    Returns:
+        Decision type
+    """
+    if battery_discharged > 0:
+        # Battery was discharged to meet load (may also have solar/grid)
+        return "BATTERY_DISCHARGE"
+    elif battery_charged > excess_solar + GRID_CHARGE_TOLERANCE:
+        # Battery charged beyond excess solar, i.e. from the grid
+        return "GRID_TO_BATTERY"
+    elif battery_charged > 0:
+        # Excess solar stored in battery
+        return "SOLAR_TO_BATTERY"
+    elif solar_used > 0 and grid_used > 0:
+        # Both solar and grid used (solar insufficient alone)
+        return "SOLAR_PLUS_GRID"
+    elif grid_used > 0:
+        # Only grid used (no solar, or solar curtailed, battery not discharged)
+        return "GRID_SUPPLY"
+    elif solar_used > 0:
+        # Solar met entire load, no battery/grid needed
+        return "SOLAR_ONLY"
+    # Edge case fallback (e.g., zero load)
+    return "NO_FLOW"
+
+
+def build_decision(
+    solar_used: float,
+    battery_charged: float,
+    battery_discharged: float,
+    grid_used: float,
+    solar_curtailed: float,
+    decision_type: str,
+    explanation: List[str],
+    legacy_fields: bool = True
+) -> Dict:
+    """
+    Build the structured decision dictionary.
+
+    Args:
+        solar_used: Solar used directly by load (kWh)
+        battery_charged: Energy charged to battery (kWh)
+        battery_discharged: Energy discharged from battery (kWh)
+        grid_used: Grid energy supplied to load (kWh)
+        solar_curtailed: Solar neither used nor stored (kWh)
+        decision_type: Type of decision made
+        explanation: Human-readable decision reasons (may be empty)
+        legacy_fields: Include the legacy-format keys
+
+    Returns:
+        Decision dictionary in the format of RuleBasedScheduler.schedule_hour()
+    """
+    result = {
+        "solar_used_kwh": round(solar_used, 3),
+        "battery_charged_kwh": round(battery_charged, 3),
+        "battery_discharged_kwh": round(battery_discharged, 3),
+        "grid_used_kwh": round(grid_used, 3),
+        "solar_curtailed_kwh": round(solar_curtailed, 3),
+        "decision_type": decision_type,
+        "explanation": explanation
+    }
+
+    if legacy_fields:
+        # Legacy format for backward compatibility
+        result.update({
+            "solar_to_load": result["solar_used_kwh"],
+            "solar_to_battery": result["battery_charged_kwh"],
+            "solar_curtailed": result["solar_curtailed_kwh"],
+            "battery_to_load": result["battery_discharged_kwh"],
+            "grid_to_load": result["grid_used_kwh"],
+            "grid_export": 0.0,  # Not implemented in Phase-1
+            "battery_charge": result["battery_charged_kwh"],
+            "battery_discharge": result["battery_discharged_kwh"],
+            "decision_reason": " | ".join(explanation)
+        })
+
+    return result
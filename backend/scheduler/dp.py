@@ -0,0 +1,255 @@
+"""
+Dynamic Programming Scheduler
+Cost-optimal battery schedule over a discretized SoC grid.
+"""
+
+import math
+import time
+from typing import Dict, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from models.battery import Battery
+from scheduler.plan import PlanScheduler
+
+
+class DPScheduler(PlanScheduler):
+    """
+    Optimization-based scheduler using backward dynamic programming.
+
+    Stored energy between min_soc and max_soc is discretized into a grid
+    of SoC levels. Working backwards from the end of the horizon, the
+    value of each level is the cheapest cost-to-go over all reachable
+    levels one step later:
+
+        V_t(E) = min_E'  price_t * (import - export_price_ratio * export) + V_t+1(E')
+
+    where reaching E' from E means charging (E' - E) / efficiency or
+    discharging E - E', within the battery's rate limits. The backup for
+    a step is one NumPy operation over the whole grid and all reachable
+    moves; a 24-hour horizon takes a few milliseconds.
+
+    Transition costs are evaluated per move rather than as linear
+    constraints, so non-convex terms (efficiency curves, fixed charges)
+    fit in _flow_costs() without changing the solver.
+
+    The forward pass starts from the battery's actual SoC (which need not
+    lie on the grid) and picks the best reachable level each step. Like
+    the LP Optimizer, the plan is made on forecast solar and replayed by
+    schedule_hour().
+    """
+
+    PLAN_LABEL = "DP schedule over the full horizon"
+
+    # Grid resolution is raised so the smallest rate-limited move spans
+    # at least this many levels, up to MAX_SOC_STEPS
+    MIN_LEVELS_PER_MOVE = 2
+    MAX_SOC_STEPS = 2001
+
+    # Steps whose move costs are held in memory at once during backups
+    COST_BLOCK_STEPS = 256
+
+    def __init__(self, export_price_ratio: float = 0.5, soc_steps: int = 101):
+        """
+        Initialize DP scheduler.
+
+        Args:
+            export_price_ratio: Export price as fraction of import price
+            soc_steps: Number of SoC levels in the grid (minimum)
+        """
+        super().__init__(export_price_ratio)
+        self.soc_steps = soc_steps
+        self.soc_grid = None
+        self.values = None
+        self.moves = None
+        self.reach = 0
+
+    def optimize_schedule(
+        self,
+        loads: Sequence[float],
+        solars: Sequence[float],
+        prices: Sequence[float],
+        battery: Battery,
+        timestep_hours: float = 1.0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute the cost-optimal schedule for the horizon.
+
+        Same interface as Optimizer.optimize_schedule().
+
+        Args:
+            loads: Load demand per step (kWh)
+            solars: Forecast solar generation per step (kWh)
+            prices: Grid price per step ($/kWh)
+            battery: Battery (not modified)
+            timestep_hours: Length of one time step in hours
+
+        Returns:
+            Dictionary of per-step arrays: charge_kwh, discharge_kwh,
+            soc_kwh, grid_import_kwh and grid_export_kwh
+        """
+        start = time.perf_counter()
+
+        net_load = np.asarray(loads, dtype=float) - np.asarray(solars, dtype=float)
+        price = np.asarray(prices, dtype=float)
+        self._set_model(battery, timestep_hours)
+
+        values = np.zeros((net_load.size + 1, self.soc_grid.size))
+        self._backup(values, net_load, price, 0, net_load.size)
+        self.values = values
+
+        charge, discharge, soc = self._forward(net_load, price, battery.current_soc)
+        grid_energy = net_load + charge - discharge
+
+        self.solve_seconds = time.perf_counter() - start
+        return self._set_plan(
+            charge, discharge, soc,
+            np.maximum(grid_energy, 0.0), np.maximum(-grid_energy, 0.0)
+        )
+
+    def _set_model(self, battery: Battery, timestep_hours: float):
+        """Battery limits per step, SoC grid and reachable moves."""
+        self.efficiency = battery.efficiency
+        self.max_charge = battery.max_charge_rate * timestep_hours
+        self.max_discharge = battery.max_discharge_rate * timestep_hours
+
+        grid = self._soc_grid(battery, self.efficiency * self.max_charge, self.max_discharge)
+        spacing = grid[1] - grid[0] if grid.size > 1 else 0.0
+
+        # Reachable moves, in grid levels
+        if spacing > 0:
+            reach = int(max(self.efficiency * self.max_charge, self.max_discharge) / spacing)
+            reach = min(reach, grid.size - 1)
+        else:
+            reach = 0
+
+        self.soc_grid = grid
+        self.reach = reach
+        self.moves = np.arange(-reach, reach + 1) * spacing
+
+    def _soc_grid(self, battery: Battery, charge_move: float, discharge_move: float) -> np.ndarray:
+        """SoC levels (kWh) from min_soc to max_soc, fine enough for the rate limits."""
+        min_energy = battery.capacity * battery.min_soc
+        max_energy = battery.capacity * battery.max_soc
+        span = max_energy - min_energy
+        if span <= 0:
+            return np.array([min_energy])
+
+        steps = self.soc_steps
+        smallest_move = min(charge_move, discharge_move)
+        if smallest_move > 0:
+            needed = math.ceil(self.MIN_LEVELS_PER_MOVE * span / smallest_move) + 1
+            steps = max(steps, min(needed, self.MAX_SOC_STEPS))
+        return np.linspace(min_energy, max_energy, steps)
+
+    def _flow_costs(self, net_load, price, moves: np.ndarray):
+        """
+        Charge, discharge and grid cost of moves (change in stored energy, kWh).
+
+        Arguments broadcast, so this prices one move list at one step or
+        every move at every step.
+
+        Returns:
+            Tuple of (charge, discharge, cost) arrays
+        """
+        charge = np.maximum(moves, 0.0) / self.efficiency
+        discharge = np.maximum(-moves, 0.0)
+        grid_energy = net_load + charge - discharge
+        cost = price * (
+            np.maximum(grid_energy, 0.0) - self.export_price_ratio * np.maximum(-grid_energy, 0.0)
+        )
+        return charge, discharge, cost
+
+    def _step_costs(self, net_load: np.ndarray, price: np.ndarray) -> np.ndarray:
+        """
+        Cost of every reachable move at every step.
+
+        Args:
+            net_load: Load minus solar per step (kWh)
+            price: Grid price per step ($/kWh)
+
+        Returns:
+            Array of shape (steps, moves); infeasible moves cost inf
+        """
+        charge, discharge, costs = self._flow_costs(net_load[:, None], price[:, None], self.moves)
+        feasible = (
+            (charge <= self.max_charge * (1 + 1e-9)) & (discharge <= self.max_discharge * (1 + 1e-9))
+        )
+        costs[:, ~feasible] = np.inf
+        return costs
+
+    def _backup(self, values: np.ndarray, net_load: np.ndarray, price: np.ndarray, first: int, last: int):
+        """
+        Bellman backups for steps last - 1 down to first.
+
+        Move costs are computed COST_BLOCK_STEPS at a time, so memory
+        does not grow with the horizon beyond the value table.
+
+        Args:
+            values: Cost-to-go per step and level, shape (steps + 1, levels);
+                    rows first..last - 1 are overwritten from row last
+            net_load: Load minus solar for steps first..last - 1 (kWh)
+            price: Grid price for steps first..last - 1 ($/kWh)
+            first: First step to back up
+            last: Step after the last one to back up
+        """
+        levels = self.soc_grid.size
+        reach = self.reach
+        padded = np.full(levels + 2 * reach, np.inf)
+
+        for block_end in range(last, first, -self.COST_BLOCK_STEPS):
+            block_start = max(block_end - self.COST_BLOCK_STEPS, first)
+            costs = self._step_costs(
+                net_load[block_start - first:block_end - first], price[block_start - first:block_end - first]
+            )
+            for t in range(block_end - 1, block_start - 1, -1):
+                padded[reach:reach + levels] = values[t + 1]
+                # Row i holds the cost-to-go of levels i - reach .. i + reach
+                reachable = sliding_window_view(padded, 2 * reach + 1)
+                values[t] = (reachable + costs[t - block_start]).min(axis=1)
+
+    def _best_move(self, net_load: float, price: float, next_values: np.ndarray, soc: float):
+        """
+        Cheapest reachable level for one step from the current SoC.
+
+        Keeping the current level is always a candidate (valued by
+        interpolation when the SoC is off the grid), so a battery whose
+        rate limits are finer than the grid can still idle.
+
+        Args:
+            net_load: Load minus solar for the step (kWh)
+            price: Grid price for the step ($/kWh)
+            next_values: Cost-to-go per level after the step
+            soc: Stored energy before the step (kWh)
+
+        Returns:
+            Tuple of (charge, discharge, stored energy after the step)
+        """
+        grid = self.soc_grid
+        low = np.searchsorted(grid, soc - self.max_discharge * (1 + 1e-9))
+        high = np.searchsorted(grid, soc + self.efficiency * self.max_charge * (1 + 1e-9), side="right")
+        targets = np.append(grid[low:high], soc)
+        future = np.append(next_values[low:high], np.interp(soc, grid, next_values))
+
+        charge, discharge, cost = self._flow_costs(net_load, price, targets - soc)
+        best = int(np.argmin(cost + future))
+        return float(charge[best]), float(discharge[best]), float(targets[best])
+
+    def _forward(self, net_load: np.ndarray, price: np.ndarray, soc: float):
+        """
+        Follow the cheapest reachable level from the starting SoC.
+
+        Returns:
+            Tuple of (charge, discharge, soc) arrays
+        """
+        steps = net_load.size
+        charge = np.zeros(steps)
+        discharge = np.zeros(steps)
+        soc_kwh = np.zeros(steps)
+
+        for t, (step_load, step_price) in enumerate(zip(net_load.tolist(), price.tolist())):
+            charge[t], discharge[t], soc = self._best_move(step_load, step_price, self.values[t + 1], soc)
+            soc_kwh[t] = soc
+
+        return charge, discharge, soc_kwh
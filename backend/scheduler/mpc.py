@@ -0,0 +1,294 @@
+"""
+Model Predictive Control Scheduler
+Receding-horizon re-planning with the latest solar information.
+"""
+
+import copy
+import time
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from models.battery import Battery
+from scheduler.dp import DPScheduler
+
+
+class MPCScheduler(DPScheduler):
+    """
+    Receding-horizon controller built on the DP scheduler.
+
+    The LP and DP schedulers plan once on forecast solar and replay the
+    plan open loop. MPC re-plans at every step instead: solar for the
+    current step is measured (the actual generation, as a field
+    controller reads it from the inverter), the remaining horizon is
+    re-optimized with that measurement and the latest forecast for later
+    steps, and only the first action of the new plan is applied.
+
+    Each measurement also revises the solar forecast of the next
+    revision_hours: the relative error just measured is assumed to
+    persist, fading by error_persistence per hour (a persistence
+    nowcast, as cloud cover changes slowly). The revised steps are
+    passed to update_forecast(); forecasts revised from outside (e.g. a
+    weather service) go through the same method.
+
+    Re-plans are warm-started from the previous solution. The cost-to-go
+    of a step only depends on the forecasts after it, so the values from
+    the last solve stay valid except for steps whose forecast changed,
+    which are backed up again. A re-plan therefore costs the backups for
+    revised steps plus one decision step; every re-plan's latency,
+    backups included, is recorded in replan_seconds.
+    """
+
+    PLAN_LABEL = "MPC re-plan with measured solar"
+
+    def __init__(
+        self,
+        export_price_ratio: float = 0.5,
+        soc_steps: int = 101,
+        revision_hours: float = 3.0,
+        error_persistence: float = 0.5
+    ):
+        """
+        Initialize MPC scheduler.
+
+        Args:
+            export_price_ratio: Export price as fraction of import price
+            soc_steps: Number of SoC levels in the grid (minimum)
+            revision_hours: Hours ahead whose solar forecast each measurement revises (0 = none)
+            error_persistence: Fraction of the measured forecast error still present one hour later
+        """
+        super().__init__(export_price_ratio, soc_steps)
+        self.revision_hours = revision_hours
+        self.error_persistence = error_persistence
+        self.replan_seconds = []
+        self.revised_steps = 0
+        self._load = None
+        self._solar = None
+        self._net_load = None
+        self._price = None
+        self._stale_until = 0
+        self._error = 0.0
+        self._revised_until = 0
+        self._revision_steps = 0
+        self._step_persistence = 1.0
+
+    def optimize_schedule(
+        self,
+        loads: Sequence[float],
+        solars: Sequence[float],
+        prices: Sequence[float],
+        battery: Battery,
+        timestep_hours: float = 1.0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Solve the full horizon on forecast solar (the initial plan).
+
+        Each later schedule_hour() or plan_block() step re-plans from
+        this solution.
+
+        Args:
+            loads: Load demand per step (kWh)
+            solars: Forecast solar generation per step (kWh)
+            prices: Grid price per step ($/kWh)
+            battery: Battery (not modified)
+            timestep_hours: Length of one time step in hours
+
+        Returns:
+            Initial plan (see DPScheduler.optimize_schedule())
+        """
+        plan = super().optimize_schedule(loads, solars, prices, battery, timestep_hours)
+        self._load = np.asarray(loads, dtype=float)
+        self._solar = np.asarray(solars, dtype=float)
+        self._net_load = self._load - self._solar
+        self._price = np.asarray(prices, dtype=float)
+        self._stale_until = 0
+        self._error = 0.0
+        self._revised_until = 0
+        self._revision_steps = int(round(self.revision_hours / timestep_hours))
+        self._step_persistence = self.error_persistence ** timestep_hours
+        self.replan_seconds = []
+        self.revised_steps = 0
+        return plan
+
+    def update_forecast(self, start_step: int, loads: Sequence[float], solars: Sequence[float]):
+        """
+        Revise the load and solar forecast from a step onwards.
+
+        The affected cost-to-go values are recomputed at the next re-plan.
+
+        Args:
+            start_step: First step of the revised forecast
+            loads: Revised load forecast per step (kWh)
+            solars: Revised solar forecast per step (kWh)
+        """
+        end = start_step + len(loads)
+        self._net_load[start_step:end] = np.asarray(loads, dtype=float) - np.asarray(solars, dtype=float)
+        self._stale_until = max(self._stale_until, end)
+
+    def schedule_hour(
+        self,
+        hour: float,
+        load: float,
+        solar: float,
+        battery: Battery,
+        price: float,
+        look_ahead_hours: float = 0,
+        timestep_hours: float = 1.0,
+        explain: bool = True,
+        legacy_fields: bool = True,
+        step: Optional[int] = None
+    ) -> Dict:
+        """
+        Re-plan from the current state and apply the first action.
+
+        Args:
+            hour: Current hour - used only for logging
+            load: Load demand over the time step (kWh)
+            solar: Measured (actual) solar generation over the time step (kWh)
+            battery: Battery object (charged/discharged per the new plan)
+            price: Current grid price ($/kWh)
+            look_ahead_hours: Hours remaining in simulation (the re-planned horizon)
+            timestep_hours: Length of the time step in hours
+            explain: Build the explanation list and decision_reason text
+            legacy_fields: Include the legacy-format keys
+            step: Index of the time step; must be the next step of the plan
+
+        Returns:
+            Decision dictionary (see RuleBasedScheduler.schedule_hour())
+        """
+        self._replan(self._check_step(step), load, solar, price, battery.current_soc)
+        return super().schedule_hour(
+            hour, load, solar, battery, price, look_ahead_hours,
+            timestep_hours, explain, legacy_fields, step
+        )
+
+    def plan_block(
+        self,
+        loads: Sequence[float],
+        solars: Sequence[float],
+        prices: Sequence[float],
+        battery: Battery,
+        timestep_hours: float = 1.0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Re-plan each step of a block, for the vectorized engine.
+
+        Steps are re-planned exactly as consecutive schedule_hour() calls
+        would, tracking SoC on a copy of the battery.
+
+        Args:
+            loads: Load demand per step (kWh)
+            solars: Measured (actual) solar generation per step (kWh)
+            prices: Grid price per step ($/kWh)
+            battery: Battery at the start of the block (not modified)
+            timestep_hours: Length of one time step in hours
+
+        Returns:
+            Plan for the block ("charge_kwh" and "discharge_kwh" arrays)
+        """
+        simulated = copy.copy(battery)
+        first = self._step
+
+        for load, solar, price in zip(loads, solars, prices):
+            step = self._step
+            self._replan(step, load, solar, price, simulated.current_soc)
+            simulated.charge(float(self.plan["charge_kwh"][step]), timestep_hours)
+            simulated.discharge(float(self.plan["discharge_kwh"][step]), timestep_hours)
+            self._step += 1
+
+        return {
+            "charge_kwh": self.plan["charge_kwh"][first:self._step],
+            "discharge_kwh": self.plan["discharge_kwh"][first:self._step]
+        }
+
+    def _replan(self, step: int, load: float, solar: float, price: float, soc: float):
+        """
+        Re-optimize the remaining horizon and store its first action.
+
+        Args:
+            step: Current step
+            load: Load demand for the step (kWh)
+            solar: Measured solar for the step (kWh)
+            price: Grid price for the step ($/kWh)
+            soc: Stored energy before the step (kWh)
+        """
+        start = time.perf_counter()
+
+        net_load = load - solar
+        self._net_load[step] = net_load
+        self._revise_forecast(step, solar)
+
+        # Warm start: only steps with a revised forecast need new backups
+        if self._stale_until > step + 1:
+            first, last = step + 1, self._stale_until
+            self._backup(self.values, self._net_load[first:last], self._price[first:last], first, last)
+        self._stale_until = 0
+
+        charge, discharge, soc_after = self._best_move(net_load, price, self.values[step + 1], soc)
+        charge = charge if charge > self.TOLERANCE else 0.0
+        discharge = discharge if discharge > self.TOLERANCE else 0.0
+        grid_energy = net_load + charge - discharge
+
+        self.plan["charge_kwh"][step] = charge
+        self.plan["discharge_kwh"][step] = discharge
+        self.plan["soc_kwh"][step] = soc_after
+        self.plan["grid_import_kwh"][step] = max(grid_energy, 0.0)
+        self.plan["grid_export_kwh"][step] = max(-grid_energy, 0.0)
+
+        self.replan_seconds.append(time.perf_counter() - start)
+
+    def _revise_forecast(self, step: int, solar: float):
+        """
+        Revise the solar forecast after a step from its measured solar.
+
+        The relative error of the step (carried over, fading, while the
+        forecast is zero, e.g. at night) is applied to the original
+        forecast of the next revision steps with weight
+        error_persistence per hour. Once the error is gone, the window
+        is reset to the original forecast.
+
+        Args:
+            step: Step just measured
+            solar: Measured solar for the step (kWh)
+        """
+        forecast = self._solar[step]
+        if forecast > 0:
+            self._error = solar / forecast - 1
+        else:
+            self._error *= self._step_persistence
+        if abs(self._error) < self.TOLERANCE:
+            self._error = 0.0
+
+        first = step + 1
+        last = min(first + self._revision_steps, self._solar.size)
+        if first >= last or (self._error == 0.0 and self._revised_until <= first):
+            return
+
+        # The window only slides forward, so it covers the previous revision
+        weights = self._step_persistence ** np.arange(1, last - first + 1)
+        revised = np.maximum(self._solar[first:last] * (1 + self._error * weights), 0.0)
+        self.update_forecast(first, self._load[first:last], revised)
+        self._revised_until = last if self._error != 0.0 else 0
+        self.revised_steps += last - first
+
+    def solve_stats(self) -> Dict:
+        """
+        Solver timing, including per-step re-plan latency.
+
+        Returns:
+            Dictionary with initial plan time, re-plan count, forecast
+            steps backed up again after revisions, and re-plan latency
+            (mean, p50, p95, max) in milliseconds, backups included
+        """
+        stats = super().solve_stats()
+        stats["replans"] = len(self.replan_seconds)
+        stats["revised_steps"] = self.revised_steps
+        if self.replan_seconds:
+            latency_ms = np.asarray(self.replan_seconds) * 1000
+            stats["replan_ms"] = {
+                "mean": round(float(latency_ms.mean()), 4),
+                "p50": round(float(np.percentile(latency_ms, 50)), 4),
+                "p95": round(float(np.percentile(latency_ms, 95)), 4),
+                "max": round(float(latency_ms.max()), 4)
+            }
+        return stats
@@ -1,34 +1,135 @@
 """
-Optimizer Stub (Phase-2)
-Placeholder for future optimization-based scheduling.
+Linear Programming Optimizer (Phase-2)
+Cost-optimal battery schedule over the whole horizon.
 """
 
+import time
+from typing import Dict, Sequence
 
-class Optimizer:
+import numpy as np
+import scipy.sparse as sparse
+from scipy.optimize import linprog
+
+from models.battery import Battery
+from scheduler.plan import PlanScheduler
+
+
+class Optimizer(PlanScheduler):
     """
-    Optimization-based scheduler (STUB for Phase-2).
-    
-    Future implementation could include:
-    - Linear programming for cost minimization
-    - Model predictive control (MPC)
-    - Dynamic programming
-    - Genetic algorithms
-    
-    For hackathon Phase-1, we use rule-based scheduling only.
+    Optimization-based scheduler using a sparse linear program.
+
+    Unlike the rule-based scheduler, which only compares each hour's
+    price with the daily average, the LP sees the whole horizon: it
+    shifts energy from the cheapest to the most expensive hours and
+    charges from the grid when that pays off.
+
+    For each time step t the variables are battery charge c, discharge d,
+    grid import g, grid export e and stored energy E:
+
+        minimize    sum_t price_t * (g_t - export_price_ratio * e_t)
+        subject to  g_t - e_t - c_t + d_t = load_t - solar_t     (energy balance)
+                    E_t - E_t-1 - efficiency * c_t + d_t = 0      (E_-1 = current SoC)
+                    0 <= c_t <= max_charge_rate * timestep_hours
+                    0 <= d_t <= max_discharge_rate * timestep_hours
+                    min_soc * capacity <= E_t <= max_soc * capacity
+                    g_t, e_t >= 0
+
+    Solved with HiGHS (bundled with SciPy), so no external service is
+    needed. The plan is made on forecast solar, like the rule-based
+    scheduler; schedule_hour() then replays it one step at a time.
     """
-    
-    def __init__(self):
-        """Initialize optimizer stub."""
-        self.enabled = False
-    
-    def optimize_schedule(self, *args, **kwargs):
+
+    PLAN_LABEL = "LP schedule over the full horizon"
+
+    def __init__(self, export_price_ratio: float = 0.5):
+        """
+        Initialize optimizer.
+
+        Args:
+            export_price_ratio: Export price as fraction of import price
         """
-        Optimize 24-hour schedule (NOT IMPLEMENTED).
-        
+        super().__init__(export_price_ratio)
+        self._constraints = {}
+
+    def optimize_schedule(
+        self,
+        loads: Sequence[float],
+        solars: Sequence[float],
+        prices: Sequence[float],
+        battery: Battery,
+        timestep_hours: float = 1.0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Compute the cost-optimal schedule for the horizon.
+
+        The plan starts from the battery's current SoC and is stored for
+        schedule_hour(), which replays it from the first step.
+
+        Args:
+            loads: Load demand per step (kWh)
+            solars: Forecast solar generation per step (kWh)
+            prices: Grid price per step ($/kWh)
+            battery: Battery (not modified)
+            timestep_hours: Length of one time step in hours
+
+        Returns:
+            Dictionary of per-step arrays: charge_kwh, discharge_kwh,
+            soc_kwh, grid_import_kwh and grid_export_kwh
+
         Raises:
-            NotImplementedError: This is a stub for Phase-2
+            ValueError: If the solver finds no optimal schedule
         """
-        raise NotImplementedError(
-            "Optimization-based scheduling is planned for Phase-2. "
-            "Currently using rule-based scheduler."
+        load = np.asarray(loads, dtype=float)
+        solar = np.asarray(solars, dtype=float)
+        price = np.asarray(prices, dtype=float)
+        steps = load.size
+
+        zeros = np.zeros(steps)
+        cost = np.concatenate([zeros, zeros, price, -self.export_price_ratio * price, zeros])
+
+        energy_in = zeros.copy()
+        energy_in[0] = battery.current_soc
+        rhs = np.concatenate([load - solar, energy_in])
+
+        lower = np.concatenate([np.zeros(4 * steps), np.full(steps, battery.capacity * battery.min_soc)])
+        upper = np.concatenate([
+            np.full(steps, battery.max_charge_rate * timestep_hours),
+            np.full(steps, battery.max_discharge_rate * timestep_hours),
+            np.full(2 * steps, np.inf),
+            np.full(steps, battery.capacity * battery.max_soc)
+        ])
+
+        start = time.perf_counter()
+        result = linprog(
+            cost,
+            A_eq=self._constraint_matrix(steps, battery.efficiency),
+            b_eq=rhs,
+            bounds=np.column_stack([lower, upper]),
+            method="highs-ds"
         )
+        self.solve_seconds = time.perf_counter() - start
+
+        if result.status != 0:
+            raise ValueError(f"LP optimizer failed: {result.message}")
+
+        charge, discharge, grid_import, grid_export, soc = np.split(result.x, 5)
+        return self._set_plan(charge, discharge, soc, grid_import, grid_export)
+
+    def _constraint_matrix(self, steps: int, efficiency: float) -> sparse.csc_matrix:
+        """
+        Equality constraint matrix, built once per horizon length and efficiency.
+
+        Only costs, right-hand side and bounds change between solves, so
+        repeated solves (e.g. re-planning) reuse the sparse structure.
+        """
+        key = (steps, efficiency)
+        if key not in self._constraints:
+            identity = sparse.identity(steps, format="csr")
+            empty = sparse.csr_matrix((steps, steps))
+            # E_t - E_t-1
+            soc_change = identity - sparse.eye(steps, k=-1, format="csr")
+            self._constraints[key] = sparse.vstack([
+                sparse.hstack([-identity, identity, identity, -identity, empty]),
+                sparse.hstack([-efficiency * identity, identity, empty, empty, soc_change])
+            ]).tocsc()
+        return self._constraints[key]
@@ -0,0 +1,194 @@
+"""
+Planned Schedules
+Step-by-step replay of a battery schedule planned for the whole horizon.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from models.battery import Battery
+from scheduler.decision import classify_decision, build_decision
+
+
+class PlanScheduler:
+    """
+    Base class for schedulers that plan the whole horizon up front.
+
+    Subclasses implement optimize_schedule(), which stores a plan of
+    per-step "charge_kwh" and "discharge_kwh" arrays (plus soc_kwh,
+    grid_import_kwh and grid_export_kwh); schedule_hour() then applies
+    it one step at a time with the same signature and output as
+    RuleBasedScheduler.schedule_hour(), so the simulation loop and
+    DecisionLogger work unchanged.
+    """
+
+    # Flows below this (kWh) are numerical noise
+    TOLERANCE = 1e-7
+
+    # Shown in explanations, e.g. "LP schedule over the full horizon"
+    PLAN_LABEL = "planned schedule"
+
+    def __init__(self, export_price_ratio: float = 0.5):
+        """
+        Initialize scheduler.
+
+        Args:
+            export_price_ratio: Export price as fraction of import price
+        """
+        self.enabled = True
+        self.export_price_ratio = export_price_ratio
+        self.plan: Optional[Dict[str, np.ndarray]] = None
+        self.solve_seconds: Optional[float] = None
+        self._step = 0
+
+    def _set_plan(
+        self,
+        charge: np.ndarray,
+        discharge: np.ndarray,
+        soc: np.ndarray,
+        grid_import: np.ndarray,
+        grid_export: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Store a new plan (noise cleaned) and rewind to its first step."""
+        self.plan = {
+            "charge_kwh": self._clean(charge),
+            "discharge_kwh": self._clean(discharge),
+            "soc_kwh": soc,
+            "grid_import_kwh": self._clean(grid_import),
+            "grid_export_kwh": self._clean(grid_export)
+        }
+        self._step = 0
+        return self.plan
+
+    def solve_stats(self) -> Dict:
+        """
+        Solver timing for the last plan.
+
+        Returns:
+            Dictionary with plan time (ms) and number of re-plans
+        """
+        plan_ms = None if self.solve_seconds is None else round(self.solve_seconds * 1000, 3)
+        return {"plan_ms": plan_ms, "replans": 0}
+
+    def _clean(self, values: np.ndarray) -> np.ndarray:
+        """Zero out numerical noise so flow checks (> 0) stay meaningful."""
+        return np.where(values > self.TOLERANCE, values, 0.0)
+
+    def schedule_hour(
+        self,
+        hour: float,
+        load: float,
+        solar: float,
+        battery: Battery,
+        price: float,
+        look_ahead_hours: float = 0,
+        timestep_hours: float = 1.0,
+        explain: bool = True,
+        legacy_fields: bool = True,
+        step: Optional[int] = None
+    ) -> Dict:
+        """
+        Apply the next step of the plan.
+
+        Call optimize_schedule() first; each call advances one step.
+
+        Args:
+            hour: Current hour - used only for logging
+            load: Load demand over the time step (kWh)
+            solar: Forecast solar generation over the time step (kWh)
+            battery: Battery object (charged/discharged per the plan)
+            price: Current grid price ($/kWh)
+            look_ahead_hours: Hours remaining in simulation (unused)
+            timestep_hours: Length of the time step in hours
+            explain: Build the explanation list and decision_reason text
+            legacy_fields: Include the legacy-format keys
+            step: Index of the time step; must be the next step of the plan
+
+        Returns:
+            Decision dictionary (see RuleBasedScheduler.schedule_hour())
+
+        Raises:
+            ValueError: If no plan was computed or steps are out of order
+        """
+        if self.plan is None:
+            raise ValueError("No schedule computed. Call optimize_schedule() first.")
+
+        step = self._check_step(step)
+        self._step += 1
+        soc_before = battery.get_soc_percentage() if explain else None
+
+        solar_used = min(solar, load)
+        remaining_load = load - solar_used
+        excess_solar = solar - solar_used
+
+        battery_charged = battery.charge(float(self.plan["charge_kwh"][step]), timestep_hours)
+        battery_discharged = battery.discharge(float(self.plan["discharge_kwh"][step]), timestep_hours)
+
+        solar_curtailed = max(excess_solar - battery_charged, 0.0)
+        grid_used = max(remaining_load - battery_discharged, 0.0)
+
+        decision_type = classify_decision(
+            solar_used, battery_charged, battery_discharged, grid_used, excess_solar
+        )
+
+        explanation = []
+        if explain:
+            explanation = self._explain(
+                decision_type, load, solar, price, solar_used, excess_solar,
+                battery_charged, battery_discharged, grid_used,
+                soc_before, battery.get_soc_percentage()
+            )
+
+        return build_decision(
+            solar_used, battery_charged, battery_discharged, grid_used,
+            solar_curtailed, decision_type, explanation, legacy_fields
+        )
+
+    def _check_step(self, step: Optional[int]) -> int:
+        """Index of the next plan step; a given step must match it."""
+        if step is not None and step != self._step:
+            raise ValueError(f"Plan steps must be applied in order: expected step {self._step}, got {step}")
+        return self._step
+
+    def _explain(
+        self,
+        decision_type: str,
+        load: float,
+        solar: float,
+        price: float,
+        solar_used: float,
+        excess_solar: float,
+        battery_charged: float,
+        battery_discharged: float,
+        grid_used: float,
+        soc_before: float,
+        soc_after: float
+    ) -> List[str]:
+        """Human-readable reasons for one planned step."""
+        explanation = [
+            f"Decision: {decision_type} | Load: {load:.2f} kWh, Solar: {solar:.2f} kWh",
+            f"Grid price: ${price:.3f}/kWh ({self.PLAN_LABEL})"
+        ]
+
+        if solar_used > 0:
+            explanation.append(f"Solar directly supplies {solar_used:.2f} kWh to load")
+
+        if battery_charged > 0:
+            from_grid = max(battery_charged - excess_solar, 0.0)
+            source = f"{from_grid:.2f} kWh from grid" if from_grid > 0 else "excess solar"
+            explanation.append(
+                f"Battery charges {battery_charged:.2f} kWh ({source}) "
+                f"(SoC: {soc_before:.1f}% → {soc_after:.1f}%)"
+            )
+
+        if battery_discharged > 0:
+            explanation.append(
+                f"Battery discharges {battery_discharged:.2f} kWh "
+                f"(SoC: {soc_before:.1f}% → {soc_after:.1f}%)"
+            )
+
+        if grid_used > 0:
+            explanation.append(f"Grid supplies remaining {grid_used:.2f} kWh at ${price:.3f}/kWh")
+
+        return explanation
@@ -0,0 +1,170 @@
+"""
+Price Index
+Precomputed price rankings and lookahead queries over a price profile.
+
+Lookahead rules ("is there a more expensive hour ahead before solar
+refills the battery?") would otherwise rescan the rest of the profile at
+every step, O(H²) over a horizon of H steps. The index is built once per
+price profile in O(H log H) and answers each question in O(1).
+
+rolling_mean() gives a per-step reference price over a moving window,
+for horizons where one mean over the whole profile is too coarse.
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+def rolling_mean(prices: Sequence[float], window: int, centered: bool = False) -> np.ndarray:
+    """
+    Mean price over a moving window of steps.
+
+    Window sums come from one running (cumulative) sum, so each step
+    costs O(1) whatever the window length. Near the ends of the profile
+    the window is truncated to the available steps.
+
+    Args:
+        prices: Grid price per step ($/kWh)
+        window: Window length in steps
+        centered: Center the window on each step instead of ending it
+                  there (trailing window, current step included)
+
+    Returns:
+        Reference price per step ($/kWh)
+    """
+    values = np.asarray(prices, dtype=float)
+    steps = values.size
+    if window < 1:
+        raise ValueError("Window must be at least one step")
+
+    running = np.concatenate([[0.0], np.cumsum(values)])
+    index = np.arange(steps)
+    if centered:
+        start = np.maximum(index - window // 2, 0)
+        end = np.minimum(index - window // 2 + window, steps)
+    else:
+        start = np.maximum(index - window + 1, 0)
+        end = index + 1
+
+    return (running[end] - running[start]) / (end - start)
+
+
+class PriceIndex:
+    """
+    Rankings, suffix extremes and range extremes of a price profile.
+
+    Steps are indices into the profile. Range queries use half-open
+    intervals [start, end), like Python slices. Sparse tables for range
+    queries are built on first use.
+    """
+
+    def __init__(self, prices: Sequence[float]):
+        """
+        Build the index.
+
+        Args:
+            prices: Grid price per step ($/kWh)
+        """
+        self.prices = np.asarray(prices, dtype=float)
+        steps = self.prices.size
+        if steps == 0:
+            raise ValueError("Price profile must not be empty")
+
+        # 0 = cheapest step; ties keep profile order
+        order = np.argsort(self.prices, kind="stable")
+        self.ranks = np.empty(steps, dtype=np.int64)
+        self.ranks[order] = np.arange(steps)
+
+        # suffix_max[i] = max(prices[i:]); one sentinel past the end
+        self.suffix_max = np.append(np.maximum.accumulate(self.prices[::-1])[::-1], -np.inf)
+        self.suffix_min = np.append(np.minimum.accumulate(self.prices[::-1])[::-1], np.inf)
+
+        self.next_higher = self._next_higher(self.prices)
+
+        self._max_table = None
+        self._min_table = None
+
+    def __len__(self) -> int:
+        return self.prices.size
+
+    def rank(self, step: int) -> int:
+        """Rank of a step's price over the profile (0 = cheapest)."""
+        return int(self.ranks[step])
+
+    def percentile(self, step: int) -> float:
+        """Share of steps priced below this one (0 = cheapest, 1 = most expensive)."""
+        steps = self.prices.size
+        return float(self.ranks[step]) / (steps - 1) if steps > 1 else 0.0
+
+    def max_ahead(self, step: int) -> float:
+        """Highest price after this step (-inf at the last step)."""
+        return float(self.suffix_max[step + 1])
+
+    def min_ahead(self, step: int) -> float:
+        """Lowest price after this step (inf at the last step)."""
+        return float(self.suffix_min[step + 1])
+
+    def next_higher_step(self, step: int) -> Optional[int]:
+        """First later step with a strictly higher price, or None."""
+        following = int(self.next_higher[step])
+        return following if following >= 0 else None
+
+    def max_between(self, start: int, end: int) -> float:
+        """Highest price over steps [start, end) (-inf if empty)."""
+        if self._max_table is None:
+            self._max_table = self._sparse_table(np.maximum)
+        return self._range_query(self._max_table, np.maximum, start, end, -np.inf)
+
+    def min_between(self, start: int, end: int) -> float:
+        """Lowest price over steps [start, end) (inf if empty)."""
+        if self._min_table is None:
+            self._min_table = self._sparse_table(np.minimum)
+        return self._range_query(self._min_table, np.minimum, start, end, np.inf)
+
+    def higher_price_ahead(self, step: int, end: Optional[int] = None) -> bool:
+        """
+        Whether a later step before end is priced above this one.
+
+        Args:
+            step: Current step
+            end: Step to look ahead to, exclusive (default: end of profile)
+
+        Returns:
+            True if any step in (step, end) has a higher price
+        """
+        following = self.next_higher[step]
+        if following < 0:
+            return False
+        return end is None or following < end
+
+    def _sparse_table(self, combine) -> List[np.ndarray]:
+        """Level k holds combine() over each window of 2**k steps."""
+        table = [self.prices]
+        width = 1
+        while 2 * width <= self.prices.size:
+            previous = table[-1]
+            table.append(combine(previous[:-width], previous[width:]))
+            width *= 2
+        return table
+
+    def _range_query(self, table: List[np.ndarray], combine, start: int, end: int, empty: float) -> float:
+        """Combine two overlapping power-of-two windows covering [start, end)."""
+        start = max(start, 0)
+        end = min(end, self.prices.size)
+        if end <= start:
+            return empty
+        level = (end - start).bit_length() - 1
+        return float(combine(table[level][start], table[level][end - (1 << level)]))
+
+    @staticmethod
+    def _next_higher(prices: np.ndarray) -> np.ndarray:
+        """Index of the next strictly higher price per step (-1 if none), monotonic stack."""
+        values = prices.tolist()
+        result = [-1] * len(values)
+        stack = []
+        for i, price in enumerate(values):
+            while stack and values[stack[-1]] < price:
+                result[stack.pop()] = i
+            stack.append(i)
+        return np.array(result, dtype=np.int64)
@@ -4,14 +4,16 @@ Implements explainable, data-driven scheduling logic.
 
 Key Principles:
 - NO hard-coded hour-based decisions
-- Dynamic price analysis (compare to daily average)
+- Dynamic price analysis (compare to daily or rolling average)
 - Battery discharged only when price > average
 - Grid preferred during low-price periods
 - Solar always used first
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from models.battery import Battery
+from scheduler.decision import classify_decision, build_decision
+from scheduler.price_index import rolling_mean
 
 
 class RuleBasedScheduler:
@@ -22,40 +24,60 @@ class RuleBasedScheduler:
     1. ALWAYS use solar to meet load first (renewable priority)
     2. Store excess solar in battery (if space available)
     3. For remaining load deficit:
-       - If price > daily_avg: Discharge battery (save money)
-       - If price <= daily_avg: Use grid (preserve battery for expensive hours)
+       - If price > reference: Discharge battery (save money)
+       - If price <= reference: Use grid (preserve battery for expensive hours)
+       The reference is the average over the whole price profile, or a
+       rolling average over reference_window steps.
     4. Grid is used as needed based on economic optimization
     
     All decisions are data-driven and explainable.
     """
     
-    def __init__(self, price_profile: List[float] = None):
+    def __init__(
+        self,
+        price_profile: List[float] = None,
+        reference_window: int = None,
+        centered_window: bool = False
+    ):
         """
         Initialize scheduler with price awareness.
         
         Args:
-            price_profile: Optional 24-hour price profile for computing daily average.
-                          If not provided, average will be computed on first call.
+            price_profile: Optional price profile (24 hours or longer) for computing
+                          the average price. If not provided, call set_price_profile().
+            reference_window: Rolling window (in profile steps) for the reference
+                              price; None compares against the whole-profile average
+            centered_window: Center the rolling window on each step instead of
+                             trailing it
         """
         self.price_profile = price_profile
+        self.reference_window = reference_window
+        self.centered_window = centered_window
         self.daily_avg_price = None
+        self.reference_prices = None
         
-        # Compute daily average if profile provided
-        if price_profile and len(price_profile) == 24:
-            self.daily_avg_price = sum(price_profile) / len(price_profile)
+        # Compute average if profile provided (a list or a NumPy array)
+        if price_profile is not None and len(price_profile) > 0:
+            self.set_price_profile(price_profile)
     
     def set_price_profile(self, price_profile: List[float]):
         """
-        Set or update the price profile and compute daily average.
+        Set or update the price profile and compute its average.
         
         Args:
-            price_profile: 24-hour price profile ($/kWh)
+            price_profile: Hourly price profile ($/kWh), 24 hours or longer
         """
-        if len(price_profile) != 24:
-            raise ValueError("Price profile must have exactly 24 hours")
+        if len(price_profile) == 0:
+            raise ValueError("Price profile must not be empty")
         
         self.price_profile = price_profile
         self.daily_avg_price = sum(price_profile) / len(price_profile)
+        
+        self.reference_prices = None
+        if self.reference_window is not None:
+            self.reference_prices = rolling_mean(
+                price_profile, self.reference_window, self.centered_window
+            )
     
     def get_daily_avg_price(self) -> float:
         """Get the computed daily average price."""
@@ -63,6 +85,25 @@ class RuleBasedScheduler:
             raise ValueError("Price profile not set. Call set_price_profile() first.")
         return self.daily_avg_price
     
+    def get_reference_price(self, step: Optional[int] = None) -> float:
+        """
+        Get the price a step is classified against (cheap vs expensive).
+        
+        Args:
+            step: Index into the price profile (required with a reference_window)
+            
+        Returns:
+            Rolling average at that step, or the daily average without a window
+            
+        Raises:
+            ValueError: If a reference_window is set and no step is given
+        """
+        if self.reference_prices is None:
+            return self.get_daily_avg_price()
+        if step is None:
+            raise ValueError("A step index is required with a rolling reference_window")
+        return float(self.reference_prices[step])
+    
     def schedule_hour(
         self,
         hour: int,
@@ -70,18 +111,29 @@ class RuleBasedScheduler:
         solar: float,
         battery: Battery,
         price: float,
-        look_ahead_hours: int = 0
+        look_ahead_hours: float = 0,
+        timestep_hours: float = 1.0,
+        explain: bool = True,
+        legacy_fields: bool = True,
+        step: Optional[int] = None
     ) -> Dict:
         """
-        Make data-driven scheduling decision for one hour.
+        Make data-driven scheduling decision for one time step.
         
         Args:
-            hour: Current hour (0-23) - used only for logging, NOT for decisions
-            load: Load demand (kWh)
-            solar: Solar generation (kWh)
+            hour: Current hour - used only for labels, NOT for decisions
+            load: Load demand over the time step (kWh)
+            solar: Solar generation over the time step (kWh)
             battery: Battery object
             price: Current grid price ($/kWh)
             look_ahead_hours: Hours remaining in simulation (not used in Phase-1)
+            timestep_hours: Length of the time step in hours; battery power
+                            limits (kW) are converted to energy over it
+            explain: Build the explanation list and decision_reason text
+                     (skipped entirely when False; explanation is empty)
+            legacy_fields: Include the legacy-format keys
+            step: Index of the time step in the price profile; selects the
+                  rolling reference price (required with a reference_window)
             
         Returns:
             Dictionary with scheduling decisions and explanations:
@@ -92,7 +144,7 @@ class RuleBasedScheduler:
             - solar_curtailed_kwh: Solar energy wasted
             - decision_type: Type of decision made
             - explanation: List of human-readable decision reasons
-            - (legacy fields for backward compatibility)
+            - (legacy fields for backward compatibility, if legacy_fields)
         """
         if self.daily_avg_price is None:
             raise ValueError(
@@ -102,7 +154,6 @@ class RuleBasedScheduler:
         
         # Initialize decision tracking
         explanation = []
-        decision_type = "UNKNOWN"
         
         # Track energy flows
         solar_used = 0.0
@@ -112,20 +163,23 @@ class RuleBasedScheduler:
         solar_curtailed = 0.0
         
         # Get current battery state
-        battery_soc_pct = battery.get_soc_percentage()
-        available_discharge = battery.get_available_discharge_capacity()
-        available_charge = battery.get_available_charge_capacity()
+        battery_soc_pct = battery.get_soc_percentage() if explain else None
+        available_discharge = battery.get_available_discharge_capacity(timestep_hours)
+        available_charge = battery.get_available_charge_capacity(timestep_hours)
         
-        # Classify current price relative to daily average
-        price_relative = (price - self.daily_avg_price) / self.daily_avg_price * 100
-        is_expensive = price > self.daily_avg_price
-        is_cheap = price <= self.daily_avg_price
+        # Classify current price relative to daily (or rolling) average
+        reference_price = self.get_reference_price(step)
+        price_relative = (price - reference_price) / reference_price * 100
+        is_expensive = price > reference_price
+        is_cheap = price <= reference_price
         
-        explanation.append(
-            f"Grid price: ${price:.3f}/kWh "
-            f"(daily avg: ${self.daily_avg_price:.3f}/kWh, "
-            f"{'+' if price_relative >= 0 else ''}{price_relative:.1f}%)"
-        )
+        if explain:
+            reference_label = "daily avg" if self.reference_prices is None else "rolling avg"
+            explanation.append(
+                f"Grid price: ${price:.3f}/kWh "
+                f"({reference_label}: ${reference_price:.3f}/kWh, "
+                f"{'+' if price_relative >= 0 else ''}{price_relative:.1f}%)"
+            )
         
         # =====================================================================
         # RULE 1: ALWAYS use solar to meet load first (renewable priority)
@@ -134,7 +188,7 @@ class RuleBasedScheduler:
         remaining_load = load - solar_used
         remaining_solar = solar - solar_used
         
-        if solar_used > 0:
+        if solar_used > 0 and explain:
             explanation.append(
                 f"Solar directly supplies {solar_used:.2f} kWh to load "
                 f"(renewable priority)"
@@ -145,23 +199,25 @@ class RuleBasedScheduler:
         # =====================================================================
         if remaining_solar > 0 and available_charge > 0:
             battery_charged = min(remaining_solar, available_charge)
-            actual_charged = battery.charge(battery_charged)
+            actual_charged = battery.charge(battery_charged, timestep_hours)
             battery_charged = actual_charged
             remaining_solar -= battery_charged
             
-            explanation.append(
-                f"Excess solar charges battery: {battery_charged:.2f} kWh "
-                f"(SoC: {battery_soc_pct:.1f}% → {battery.get_soc_percentage():.1f}%)"
-            )
+            if explain:
+                explanation.append(
+                    f"Excess solar charges battery: {battery_charged:.2f} kWh "
+                    f"(SoC: {battery_soc_pct:.1f}% → {battery.get_soc_percentage():.1f}%)"
+                )
         
         # =====================================================================
         # RULE 3: Curtail remaining solar if battery is full
         # =====================================================================
         if remaining_solar > 0:
             solar_curtailed = remaining_solar
-            explanation.append(
-                f"Solar curtailed: {solar_curtailed:.2f} kWh (battery full, no load)"
-            )
+            if explain:
+                explanation.append(
+                    f"Solar curtailed: {solar_curtailed:.2f} kWh (battery full, no load)"
+                )
         
         # =====================================================================
         # RULE 4: Handle load deficit with SMART battery/grid strategy
@@ -171,100 +227,66 @@ class RuleBasedScheduler:
             if is_expensive and available_discharge > 0:
                 # EXPENSIVE PERIOD: Discharge battery to avoid high grid costs
                 battery_discharged = min(remaining_load, available_discharge)
-                actual_discharged = battery.discharge(battery_discharged)
+                actual_discharged = battery.discharge(battery_discharged, timestep_hours)
                 battery_discharged = actual_discharged
                 remaining_load -= battery_discharged
                 
-                explanation.append(
-                    f"Battery discharges {battery_discharged:.2f} kWh "
-                    f"(EXPENSIVE grid @ ${price:.3f}/kWh > avg ${self.daily_avg_price:.3f}/kWh)"
-                )
-                explanation.append(
-                    f"Battery SoC after discharge: {battery.get_soc_percentage():.1f}%"
-                )
+                if explain:
+                    explanation.append(
+                        f"Battery discharges {battery_discharged:.2f} kWh "
+                        f"(EXPENSIVE grid @ ${price:.3f}/kWh > avg ${reference_price:.3f}/kWh)"
+                    )
+                    explanation.append(
+                        f"Battery SoC after discharge: {battery.get_soc_percentage():.1f}%"
+                    )
                 
             elif is_cheap:
                 # CHEAP PERIOD: Use grid, preserve battery for expensive hours
-                explanation.append(
-                    f"Using grid instead of battery "
-                    f"(CHEAP period: ${price:.3f}/kWh <= avg ${self.daily_avg_price:.3f}/kWh)"
-                )
-                explanation.append(
-                    f"Preserving battery (SoC: {battery_soc_pct:.1f}%) for expensive periods"
-                )
+                if explain:
+                    explanation.append(
+                        f"Using grid instead of battery "
+                        f"(CHEAP period: ${price:.3f}/kWh <= avg ${reference_price:.3f}/kWh)"
+                    )
+                    explanation.append(
+                        f"Preserving battery (SoC: {battery_soc_pct:.1f}%) for expensive periods"
+                    )
             
             else:
                 # EXPENSIVE but battery empty/unavailable
-                explanation.append(
-                    f"Battery unavailable "
-                    f"(SoC: {battery_soc_pct:.1f}%, available: {available_discharge:.2f} kWh)"
-                )
+                if explain:
+                    explanation.append(
+                        f"Battery unavailable "
+                        f"(SoC: {battery_soc_pct:.1f}%, available: {available_discharge:.2f} kWh)"
+                    )
             
             # Use grid for any remaining load
             if remaining_load > 0:
                 grid_used = remaining_load
-                explanation.append(
-                    f"Grid supplies remaining {grid_used:.2f} kWh at ${price:.3f}/kWh"
-                )
+                if explain:
+                    explanation.append(
+                        f"Grid supplies remaining {grid_used:.2f} kWh at ${price:.3f}/kWh"
+                    )
         
         # =====================================================================
         # Determine decision type based on actual energy flows (for visualization)
-        # Decision type is inferred dynamically from the final state, NOT hardcoded
         # =====================================================================
-        
-        # Priority-based classification (check most specific conditions first)
-        if battery_discharged > 0:
-            # Battery was discharged to meet load (may also have solar/grid)
-            decision_type = "BATTERY_DISCHARGE"
-        
-        elif battery_charged > 0:
-            # Excess solar stored in battery
-            decision_type = "SOLAR_TO_BATTERY"
-        
-        elif solar_used > 0 and grid_used > 0:
-            # Both solar and grid used (solar insufficient alone)
-            decision_type = "SOLAR_PLUS_GRID"
-        
-        elif grid_used > 0 and battery_discharged == 0:
-            # Only grid used (no solar, or solar curtailed, battery not discharged)
-            decision_type = "GRID_SUPPLY"
-        
-        elif solar_used > 0 and grid_used == 0 and battery_discharged == 0:
-            # Solar met entire load, no battery/grid needed
-            decision_type = "SOLAR_ONLY"
-        
-        else:
-            # Edge case fallback (e.g., zero load)
-            decision_type = "NO_FLOW"
+        decision_type = classify_decision(
+            solar_used, battery_charged, battery_discharged, grid_used,
+            excess_solar=solar - solar_used
+        )
         
         # Add decision summary
-        explanation.insert(
-            0,
-            f"Decision: {decision_type} | Load: {load:.2f} kWh, Solar: {solar:.2f} kWh"
-        )
+        if explain:
+            explanation.insert(
+                0,
+                f"Decision: {decision_type} | Load: {load:.2f} kWh, Solar: {solar:.2f} kWh"
+            )
         
-        # Return structured decision with both new and legacy formats
-        return {
-            # New structured format
-            "solar_used_kwh": round(solar_used, 3),
-            "battery_charged_kwh": round(battery_charged, 3),
-            "battery_discharged_kwh": round(battery_discharged, 3),
-            "grid_used_kwh": round(grid_used, 3),
-            "solar_curtailed_kwh": round(solar_curtailed, 3),
-            "decision_type": decision_type,
-            "explanation": explanation,
-            
-            # Legacy format for backward compatibility
-            "solar_to_load": round(solar_used, 3),
-            "solar_to_battery": round(battery_charged, 3),
-            "solar_curtailed": round(solar_curtailed, 3),
-            "battery_to_load": round(battery_discharged, 3),
-            "grid_to_load": round(grid_used, 3),
-            "grid_export": 0.0,  # Not implemented in Phase-1
-            "battery_charge": round(battery_charged, 3),
-            "battery_discharge": round(battery_discharged, 3),
-            "decision_reason": " | ".join(explanation)
-        }
+        # Return structured decision (plus legacy format if requested)
+        return build_decision(
+            solar_used, battery_charged, battery_discharged, grid_used,
+            solar_curtailed, decision_type, explanation, legacy_fields
+        )
     
     def calculate_baseline_grid(
         self,
@@ -0,0 +1,257 @@
+"""
+Batch Simulation Engine
+Runs the rule-based schedule for many configurations in one pass.
+
+All configurations share the hour loop; each hour advances every
+battery at once with NumPy operations across the batch axis.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from simulator.vectorized import settle_flows, round_half, sequential_sum
+
+
+class BatchEngine:
+    """
+    Rule-based schedule for a batch of battery configurations.
+
+    Battery parameters are arrays with one entry per configuration
+    (scalars are broadcast). Profiles are shared (hours,) arrays or
+    per-configuration (batch, hours) arrays. Stored energy carries over
+    from one run() call to the next, so a long horizon can be simulated
+    block by block.
+    """
+
+    def __init__(
+        self,
+        capacity,
+        min_soc=0.2,
+        max_soc=0.95,
+        max_charge_rate=5.0,
+        max_discharge_rate=5.0,
+        efficiency=0.95,
+        initial_soc=0.5,
+        grid_intensity=0.42,
+        export_price_ratio: float = 0.5,
+        timestep_minutes: int = 60
+    ):
+        """
+        Initialize batch engine.
+
+        Args:
+            capacity: Battery capacities (kWh)
+            min_soc: Minimum SoC fractions (0-1)
+            max_soc: Maximum SoC fractions (0-1)
+            max_charge_rate: Max charging power (kW)
+            max_discharge_rate: Max discharging power (kW)
+            efficiency: Round-trip efficiencies (0-1)
+            initial_soc: Starting SoC fractions (0-1)
+            grid_intensity: Grid carbon intensities (kg CO2/kWh)
+            export_price_ratio: Export price as fraction of import price
+            timestep_minutes: Length of one time step (must divide an hour)
+        """
+        params = np.broadcast_arrays(
+            *(np.asarray(p, dtype=float) for p in (
+                capacity, min_soc, max_soc, max_charge_rate,
+                max_discharge_rate, efficiency, initial_soc, grid_intensity
+            ))
+        )
+        (self.capacity, self.min_soc, self.max_soc, self.max_charge_rate,
+         self.max_discharge_rate, self.efficiency, self.initial_soc,
+         self.grid_intensity) = (np.atleast_1d(p) for p in params)
+        self.size = self.capacity.size
+        self.export_price_ratio = export_price_ratio
+        self.timestep_hours = timestep_minutes / 60
+        self.steps_per_hour = 60 // timestep_minutes
+        self.soc = self.initial_energy()
+
+    def initial_energy(self) -> np.ndarray:
+        """Starting stored energy (kWh), clamped like Battery._validate_soc()."""
+        energy = self.capacity * self.initial_soc
+        min_energy = self.capacity * self.min_soc
+        max_energy = self.capacity * self.max_soc
+        return np.where(energy < min_energy, min_energy,
+                        np.where(energy > max_energy, max_energy, energy))
+
+    def run(
+        self,
+        loads: Sequence[float],
+        solars: Sequence[float],
+        prices: Sequence[float],
+        avg_price: float,
+        actual_solars: Optional[Sequence[float]] = None,
+        start_step: int = 0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Simulate all hours for every configuration.
+
+        Args:
+            loads: Load demands (kWh), (hours,) or (batch, hours)
+            solars: Forecast solar (kWh), (hours,) or (batch, hours)
+            prices: Grid prices ($/kWh), (hours,) or (batch, hours)
+            avg_price: Reference price for cheap/expensive classification
+            actual_solars: Actual solar (kWh); defaults to the forecast
+            start_step: Step number of the first entry (for the "hour" array)
+
+        Returns:
+            Dictionary of per-hour arrays, (batch, hours) where they vary
+            by configuration
+        """
+        load = np.asarray(loads, dtype=float)
+        forecast_solar = np.asarray(solars, dtype=float)
+        price = np.asarray(prices, dtype=float)
+        actual_solar = forecast_solar if actual_solars is None else np.asarray(actual_solars, dtype=float)
+
+        # RULE 1: solar meets load first (decisions use forecast solar)
+        solar_used = np.minimum(forecast_solar, load)
+        remaining_load = load - solar_used
+        remaining_solar = forecast_solar - solar_used
+        is_expensive = price > avg_price
+
+        charged, discharged, soc_pct = self._battery_recurrence(
+            remaining_load, remaining_solar, is_expensive
+        )
+
+        grid_intensity = self.grid_intensity[:, None]
+        return settle_flows(
+            load, forecast_solar, actual_solar, price,
+            solar_used, remaining_load, remaining_solar,
+            charged, discharged, soc_pct,
+            grid_intensity, self.export_price_ratio,
+            start_step=start_step, steps_per_hour=self.steps_per_hour
+        )
+
+    def _battery_recurrence(
+        self,
+        remaining_load: np.ndarray,
+        remaining_solar: np.ndarray,
+        is_expensive: np.ndarray
+    ):
+        """
+        Advance every battery's SoC one hour at a time.
+
+        Args:
+            remaining_load: Load left after direct solar use (kWh)
+            remaining_solar: Solar left after meeting load (kWh)
+            is_expensive: Whether each hour's price is above the reference
+
+        Returns:
+            Tuple of (charged, discharged, soc_pct) arrays, (batch, hours)
+        """
+        shape = (self.size, remaining_load.shape[-1])
+        remaining_load = np.broadcast_to(remaining_load, shape)
+        remaining_solar = np.broadcast_to(remaining_solar, shape)
+        is_expensive = np.broadcast_to(is_expensive, shape)
+
+        capacity = self.capacity
+        min_energy = capacity * self.min_soc
+        max_energy = capacity * self.max_soc
+        # Power limits (kW) as energy per time step (kWh)
+        max_charge = self.max_charge_rate * self.timestep_hours
+        max_discharge = self.max_discharge_rate * self.timestep_hours
+        efficiency = self.efficiency
+        soc = self.soc
+
+        charged = np.zeros(shape)
+        discharged = np.zeros(shape)
+        soc_kwh = np.empty(shape)
+
+        for h in range(shape[1]):
+            excess = remaining_solar[:, h]
+            deficit = remaining_load[:, h]
+
+            # RULE 2: store excess solar
+            available = np.minimum((max_energy - soc) / efficiency, max_charge)
+            energy = np.where((excess > 0) & (available > 0), np.minimum(excess, available), 0.0)
+            soc = np.minimum(soc + energy * efficiency, max_energy)
+            charged[:, h] = energy
+
+            # RULE 4: discharge in expensive hours
+            available = np.minimum(soc - min_energy, max_discharge)
+            energy = np.where(
+                (deficit > 0) & is_expensive[:, h] & (available > 0),
+                np.minimum(deficit, available), 0.0
+            )
+            soc = np.maximum(soc - energy, min_energy)
+            discharged[:, h] = energy
+
+            soc_kwh[:, h] = soc
+
+        self.soc = soc
+        return charged, discharged, soc_kwh / capacity[:, None] * 100
+
+    def summarize(
+        self,
+        series: Dict[str, np.ndarray],
+        loads: Sequence[float],
+        baseline_cost: float
+    ) -> Dict[str, np.ndarray]:
+        """
+        Reduce per-hour arrays to per-configuration summary metrics.
+
+        Rounding follows CostCalculator/CarbonCalculator so each entry
+        equals the corresponding /simulate summary value.
+
+        Args:
+            series: Output of run()
+            loads: Load demands (kWh)
+            baseline_cost: Pure grid-only baseline cost ($), already rounded
+
+        Returns:
+            Dictionary of (batch,) arrays; the batch axis also covers
+            per-sample profiles (e.g. Monte Carlo actual solar)
+        """
+        batch = np.broadcast_shapes((self.size,), series["cost_usd"].shape[:-1])
+        net_cost = round_half(np.broadcast_to(
+            sequential_sum(series["import_cost"]) - sequential_sum(series["export_revenue"]),
+            batch
+        ), 2)
+        net_emissions = round_half(np.broadcast_to(
+            sequential_sum(series["import_emissions_kg"]) - sequential_sum(series["export_credit_kg"]),
+            batch
+        ), 2)
+        grid_import = round_half(np.broadcast_to(sequential_sum(series["grid_import_kwh"]), batch), 2)
+        grid_export = round_half(np.broadcast_to(sequential_sum(series["grid_export_kwh"]), batch), 2)
+
+        savings = baseline_cost - net_cost
+        savings_pct = savings / baseline_cost * 100 if baseline_cost > 0 else np.zeros(batch)
+
+        total_load = np.broadcast_to(sequential_sum(np.asarray(loads, dtype=float)), batch)
+        renewable_pct = np.divide(
+            total_load - grid_import, total_load,
+            out=np.zeros(batch), where=total_load > 0
+        ) * 100
+
+        return {
+            "optimized_total_cost": net_cost,
+            "total_cost_savings": round_half(savings, 2),
+            "savings_percentage": round_half(savings_pct, 1),
+            "net_emissions_kg": net_emissions,
+            "renewable_usage_pct": round_half(renewable_pct, 1),
+            "total_grid_import_kwh": grid_import,
+            "total_grid_export_kwh": grid_export,
+        }
+
+
+def run_batch_chunk(task: Dict) -> Dict[str, np.ndarray]:
+    """
+    Simulate and summarize one chunk of configurations.
+
+    Module-level so it can be dispatched to SimulationExecutor workers.
+
+    Args:
+        task: Dictionary with "battery" (BatchEngine parameter arrays),
+              "solar_capacity" (kW per configuration), "grid_intensity",
+              "loads", "solar_shape" (kWh per kWp), "prices", "avg_price"
+              and "baseline_cost"
+
+    Returns:
+        Output of BatchEngine.summarize() for the chunk
+    """
+    engine = BatchEngine(**task["battery"], grid_intensity=task["grid_intensity"])
+    # One broadcast multiply gives every configuration its solar profile
+    solars = np.asarray(task["solar_capacity"], dtype=float)[:, None] * np.asarray(task["solar_shape"], dtype=float)
+    series = engine.run(task["loads"], solars, task["prices"], task["avg_price"])
+    return engine.summarize(series, task["loads"], task["baseline_cost"])
@@ -0,0 +1,220 @@
+"""
+Result Cache
+LRU cache with time-to-live for simulation responses.
+
+Simulations are deterministic for a given request and profile data
+(stochastic runs only when seeded), so repeated requests, such as a
+dashboard re-polling the same scenario, can be served from memory.
+
+Entries are keyed on a hash of the canonical request plus a fingerprint
+of the profile data, so changing a profile never serves stale results.
+Each entry carries a weight (e.g. time steps in the response), bounded
+in total, so a few year-long results cannot exhaust memory.
+
+Configured through environment variables:
+- MICROGRID_CACHE_SIZE: maximum entries (0 disables the cache, default 128)
+- MICROGRID_CACHE_TTL: entry lifetime in seconds (default 300)
+- MICROGRID_CACHE_MAX_WEIGHT: maximum total weight (default 200000)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+from data.load_profile import get_load_profile
+from data.solar_profile import get_solar_profile
+from data.price_profile import get_price_profile
+
+
+@lru_cache(maxsize=1)
+def profile_version() -> str:
+    """Fingerprint of the load, solar and price profile data."""
+    profiles = [get_load_profile(), get_solar_profile(), get_price_profile()]
+    return hashlib.sha256(json.dumps(profiles).encode()).hexdigest()[:16]
+
+
+def request_key(kind: str, payload: Dict) -> str:
+    """
+    Canonical cache key for a request.
+
+    Args:
+        kind: Endpoint or result type (e.g. "simulate")
+        payload: JSON-compatible request data, with defaults filled in
+                 so equivalent requests hash the same
+
+    Returns:
+        Hex digest of the request, kind and profile version
+    """
+    canonical = json.dumps(
+        {"kind": kind, "profiles": profile_version(), "request": payload},
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with per-entry time-to-live and total weight limit.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl_seconds: float = 300.0,
+        max_weight: int = 200_000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum number of entries
+            ttl_seconds: Entry lifetime in seconds
+            max_weight: Maximum total weight of all entries
+            clock: Time source (seconds)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_weight = max_weight
+        self.clock = clock
+
+        self._entries = OrderedDict()  # key -> (expires_at, weight, value)
+        self._weight = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up an entry, marking it most recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss (absent or expired)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: str, value: Any, weight: int = 1):
+        """
+        Store an entry, evicting least recently used entries as needed.
+
+        Entries heavier than max_weight are not stored.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            weight: Entry weight (e.g. time steps in the result)
+        """
+        if weight > self.max_weight:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (self.clock() + self.ttl_seconds, weight, value)
+            self._weight += weight
+
+            while len(self._entries) > self.max_entries or self._weight > self.max_weight:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str):
+        """Drop an entry (caller holds the lock)."""
+        _, weight, _ = self._entries.pop(key)
+        self._weight -= weight
+
+    def clear(self):
+        """Drop all entries (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+
+    def stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entry count, weight, hits, misses, hit rate,
+            evictions, expirations and limits
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "weight": self._weight,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "max_entries": self.max_entries,
+                "max_weight": self.max_weight,
+                "ttl_seconds": self.ttl_seconds
+            }
+
+
+_cache: Optional[ResultCache] = None
+_configured = False
+
+
+def configure_cache(
+    max_entries: int,
+    ttl_seconds: float = 300.0,
+    max_weight: int = 200_000
+) -> Optional[ResultCache]:
+    """
+    Replace the shared cache.
+
+    Args:
+        max_entries: Maximum entries (0 disables the cache)
+        ttl_seconds: Entry lifetime in seconds
+        max_weight: Maximum total weight
+
+    Returns:
+        The new cache, or None if disabled
+    """
+    global _cache, _configured
+    _cache = ResultCache(max_entries, ttl_seconds, max_weight) if max_entries > 0 else None
+    _configured = True
+    return _cache
+
+
+def get_cache() -> Optional[ResultCache]:
+    """
+    Get the shared cache, configuring it from the environment on first call.
+
+    Returns:
+        Shared cache, or None if caching is disabled
+    """
+    if not _configured:
+        configure_cache(
+            int(os.environ.get("MICROGRID_CACHE_SIZE", "128")),
+            float(os.environ.get("MICROGRID_CACHE_TTL", "300")),
+            int(os.environ.get("MICROGRID_CACHE_MAX_WEIGHT", "200000"))
+        )
+    return _cache
@@ -0,0 +1,97 @@
+"""
+Columnar Simulation Results
+Struct-of-arrays storage for per-step simulation results.
+
+One preallocated, typed NumPy array per metric replaces a dict (with
+nested decision/energy/cost/carbon dicts) per time step, which keeps
+long horizons at a few dozen bytes per step per metric.
+"""
+
+from typing import Dict, Iterator
+
+import numpy as np
+
+
+class SimulationColumns:
+    """
+    Per-step simulation results, one typed array per metric.
+
+    Arrays are allocated once for the whole horizon and filled block by
+    block with extend(). Columns are read like a dict: columns["cost_usd"]
+    returns the filled part of that array.
+    """
+
+    # Metric name -> dtype
+    COLUMNS = {
+        "hour": np.float64,
+        "load_kwh": np.float64,
+        "solar_kwh": np.float64,
+        "forecast_solar_kwh": np.float64,
+        "price_per_kwh": np.float64,
+        "battery_soc_pct": np.float64,
+        "grid_import_kwh": np.float64,
+        "grid_export_kwh": np.float64,
+        "battery_charge_kwh": np.float64,
+        "battery_discharge_kwh": np.float64,
+        "import_cost": np.float64,
+        "export_revenue": np.float64,
+        "cost_usd": np.float64,
+        "import_emissions_kg": np.float64,
+        "export_credit_kg": np.float64,
+        "emissions_kg": np.float64,
+        "decision_code": np.int8,
+    }
+
+    # Stored only when requested
+    OPTIONAL_COLUMNS = {
+        "forecast_error_pct": np.float64,
+    }
+
+    def __init__(self, steps: int, forecast_error: bool = False):
+        """
+        Allocate columns for a horizon.
+
+        Args:
+            steps: Number of time steps in the horizon
+            forecast_error: Also store forecast_error_pct
+        """
+        columns = dict(self.COLUMNS)
+        if forecast_error:
+            columns.update(self.OPTIONAL_COLUMNS)
+
+        self.capacity = steps
+        self.size = 0
+        self.arrays = {name: np.empty(steps, dtype=dtype) for name, dtype in columns.items()}
+
+    def extend(self, series: Dict[str, np.ndarray]):
+        """
+        Append one block of steps.
+
+        Args:
+            series: Per-step arrays for the block (e.g. VectorizedEngine.run()
+                    output); keys that are not columns are ignored
+        """
+        steps = len(series["hour"])
+        if self.size + steps > self.capacity:
+            raise ValueError("Block extends past the allocated horizon")
+
+        end = self.size + steps
+        for name, array in self.arrays.items():
+            array[self.size:end] = series[name]
+        self.size = end
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name][:self.size]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.arrays
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.arrays)
+
+    def nbytes(self) -> int:
+        """Memory held by the column arrays (bytes)."""
+        return sum(array.nbytes for array in self.arrays.values())
@@ -0,0 +1,193 @@
+"""
+Simulation Executor
+Process pool for CPU-bound simulation work.
+
+Simulations are pure CPU work, so threads serialize on the GIL. The
+executor spreads work across processes and groups small jobs into chunks
+so a 24-hour run isn't dominated by pickling and IPC overhead.
+
+Configured through environment variables:
+- MICROGRID_WORKERS: number of worker processes ("auto" = one per CPU,
+  0 or unset = disabled, work runs in the calling process)
+- MICROGRID_CHUNK_SIZE: items per dispatched task (unset = automatic)
+"""
+
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+
+def _run_chunk(fn: Callable, start: int, items: Sequence) -> Tuple[int, List]:
+    """Apply fn to every item of a chunk inside a worker process."""
+    return start, [fn(item) for item in items]
+
+
+class SimulationExecutor:
+    """
+    Process pool with chunked dispatch.
+
+    The pool is created on first use, so constructing an executor is
+    cheap and nothing is forked until work is submitted.
+    """
+
+    # Aim for this many chunks per worker so stragglers even out
+    CHUNKS_PER_WORKER = 4
+
+    def __init__(self, max_workers: Optional[int] = None, chunk_size: Optional[int] = None):
+        """
+        Initialize executor.
+
+        Args:
+            max_workers: Worker processes (default: one per CPU)
+            chunk_size: Items per task (default: chosen from item count)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._pool = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        """Underlying process pool, created on first access."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Run one call in a worker process.
+
+        Args:
+            fn: Picklable (module-level) function
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Future for the result
+        """
+        return self.pool.submit(fn, *args, **kwargs)
+
+    def get_chunk_size(self, count: int) -> int:
+        """
+        Items per task for a job of the given size.
+
+        Args:
+            count: Number of items
+
+        Returns:
+            Configured chunk size, or enough to give each worker a few chunks
+        """
+        if self.chunk_size:
+            return self.chunk_size
+        chunks = self.max_workers * self.CHUNKS_PER_WORKER
+        return max(1, -(-count // chunks))
+
+    def imap_unordered(
+        self,
+        fn: Callable,
+        items: Sequence,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Apply fn to every item, yielding results as chunks finish.
+
+        Args:
+            fn: Picklable (module-level) function of one item
+            items: Items to process
+            chunk_size: Items per task (default: get_chunk_size())
+
+        Yields:
+            (index, result) pairs in completion order
+        """
+        size = chunk_size or self.get_chunk_size(len(items))
+        futures = [
+            self.pool.submit(_run_chunk, fn, start, items[start:start + size])
+            for start in range(0, len(items), size)
+        ]
+        try:
+            for future in as_completed(futures):
+                start, results = future.result()
+                for offset, result in enumerate(results):
+                    yield start + offset, result
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def map(
+        self,
+        fn: Callable,
+        items: Sequence,
+        chunk_size: Optional[int] = None,
+        progress: Optional[Callable[[int, int], None]] = None
+    ) -> List:
+        """
+        Apply fn to every item and return results in input order.
+
+        Args:
+            fn: Picklable (module-level) function of one item
+            items: Items to process
+            chunk_size: Items per task (default: get_chunk_size())
+            progress: Optional callback(done, total) called as results arrive
+
+        Returns:
+            List of results
+        """
+        results = [None] * len(items)
+        for done, (index, result) in enumerate(self.imap_unordered(fn, items, chunk_size), start=1):
+            results[index] = result
+            if progress is not None:
+                progress(done, len(items))
+        return results
+
+    def shutdown(self, wait: bool = True):
+        """Stop worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+_executor: Optional[SimulationExecutor] = None
+_configured = False
+
+
+def configure_executor(max_workers: int, chunk_size: Optional[int] = None) -> Optional[SimulationExecutor]:
+    """
+    Replace the shared executor.
+
+    Args:
+        max_workers: Worker processes (0 disables the pool)
+        chunk_size: Items per task (None = automatic)
+
+    Returns:
+        The new executor, or None if disabled
+    """
+    global _executor, _configured
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+    _executor = SimulationExecutor(max_workers, chunk_size) if max_workers > 0 else None
+    _configured = True
+    return _executor
+
+
+def get_executor() -> Optional[SimulationExecutor]:
+    """
+    Get the shared executor, configuring it from the environment on first call.
+
+    Returns:
+        Shared executor, or None if the process pool is disabled
+    """
+    if not _configured:
+        workers = os.environ.get("MICROGRID_WORKERS", "0").strip().lower()
+        chunk_size = os.environ.get("MICROGRID_CHUNK_SIZE")
+        configure_executor(
+            (os.cpu_count() or 1) if workers == "auto" else int(workers),
+            int(chunk_size) if chunk_size else None
+        )
+    return _executor
+
+
+def shutdown_executor():
+    """Shut down the shared executor, if any."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -0,0 +1,251 @@
+"""
+Fleet Simulation Engine
+Runs the rule-based schedule for a portfolio of sites together.
+
+Every site advances in the same vectorized time steps (BatchEngine
+across the site axis). Per-site totals are kept as running sums and
+fleet-wide flows are summed over sites each step, so memory is bounded
+by one block of steps for the sites of one chunk.
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+
+from models.fleet import Fleet
+from simulator.batch import BatchEngine
+from simulator.vectorized import round_half, sequential_sum
+
+
+# Per-step flows summed over sites in the fleet series
+FLEET_SERIES_FIELDS = (
+    "load_kwh", "solar_kwh", "battery_charge_kwh", "battery_discharge_kwh",
+    "grid_import_kwh", "grid_export_kwh", "cost_usd", "emissions_kg"
+)
+
+# Per-site running sums behind the site summaries
+SITE_TOTAL_FIELDS = (
+    "import_cost", "export_revenue", "grid_import_kwh", "grid_export_kwh",
+    "import_emissions_kg", "export_credit_kg", "load_kwh", "solar_kwh", "baseline_cost"
+)
+
+
+class FleetEngine:
+    """
+    Rule-based schedule for every site of a fleet, block by block.
+
+    Site SoC carries over between run() calls. Per-site summaries follow
+    the /simulate summary rounding, so a site with load_scale 1 gets the
+    same totals as a single rule-based simulation of its configuration.
+    """
+
+    def __init__(
+        self,
+        fleet: Fleet,
+        grid_intensity: float = 0.42,
+        export_price_ratio: float = 0.5,
+        timestep_minutes: int = 60
+    ):
+        """
+        Initialize fleet engine.
+
+        Args:
+            fleet: Sites to simulate
+            grid_intensity: Grid carbon intensity (kg CO2/kWh)
+            export_price_ratio: Export price as fraction of import price
+            timestep_minutes: Length of one time step (must divide an hour)
+        """
+        self.fleet = fleet
+        self.engine = BatchEngine(
+            **fleet.battery_params(),
+            grid_intensity=grid_intensity,
+            export_price_ratio=export_price_ratio,
+            timestep_minutes=timestep_minutes
+        )
+        self.totals = {name: np.zeros(fleet.size) for name in SITE_TOTAL_FIELDS}
+
+    def run(
+        self,
+        loads,
+        solars,
+        prices,
+        avg_price,
+        start_step: int = 0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Simulate one block of steps for every site.
+
+        Args:
+            loads: Load profile (kWh), shared (steps,) or per site (sites, steps)
+            solars: Solar per kWp (kWh/kWp), shared (steps,) or per site (sites, steps)
+            prices: Grid prices ($/kWh), shared (steps,) or per site (sites, steps)
+            avg_price: Reference price, scalar or per site (sites,)
+            start_step: Step number of the block's first step
+
+        Returns:
+            Fleet series for the block: FLEET_SERIES_FIELDS summed over
+            sites, plus "hour", "stored_energy_kwh" and "peak_site_import_kwh"
+        """
+        site_loads, site_solars = self.fleet.site_profiles(loads, solars)
+        price = np.asarray(prices, dtype=float)
+        reference = np.asarray(avg_price, dtype=float)
+        if reference.ndim:
+            reference = reference[:, None]
+
+        series = self.engine.run(site_loads, site_solars, price, reference, start_step=start_step)
+        self._accumulate(series, site_loads, site_solars, price)
+
+        fleet_series = {"hour": series["hour"]}
+        for name in FLEET_SERIES_FIELDS:
+            fleet_series[name] = np.broadcast_to(series[name], site_loads.shape).sum(axis=0)
+        fleet_series["stored_energy_kwh"] = (
+            series["battery_soc_pct"] * self.fleet.capacity[:, None] / 100
+        ).sum(axis=0)
+        fleet_series["peak_site_import_kwh"] = series["grid_import_kwh"].max(axis=0)
+        return fleet_series
+
+    def _accumulate(
+        self,
+        series: Dict[str, np.ndarray],
+        loads: np.ndarray,
+        solars: np.ndarray,
+        prices: np.ndarray
+    ):
+        """Add one block to the per-site running sums (left to right, as RunningTotals)."""
+        blocks = {
+            "import_cost": series["import_cost"],
+            "export_revenue": series["export_revenue"],
+            "grid_import_kwh": series["grid_import_kwh"],
+            "grid_export_kwh": series["grid_export_kwh"],
+            "import_emissions_kg": series["import_emissions_kg"],
+            "export_credit_kg": series["export_credit_kg"],
+            "load_kwh": loads,
+            "solar_kwh": solars,
+            "baseline_cost": loads * prices
+        }
+        shape = loads.shape
+        for name, values in blocks.items():
+            self.totals[name] = sequential_sum(np.broadcast_to(values, shape), self.totals[name])
+
+    def summarize(self) -> Dict[str, np.ndarray]:
+        """
+        Per-site summary metrics over all blocks run so far.
+
+        Returns:
+            Dictionary of (sites,) arrays
+        """
+        t = self.totals
+        baseline_cost = round_half(t["baseline_cost"], 2)
+        net_cost = round_half(t["import_cost"] - t["export_revenue"], 2)
+        grid_import = round_half(t["grid_import_kwh"], 2)
+
+        savings = baseline_cost - net_cost
+        savings_pct = np.divide(
+            savings, baseline_cost, out=np.zeros(self.fleet.size), where=baseline_cost > 0
+        ) * 100
+        renewable_pct = np.divide(
+            t["load_kwh"] - grid_import, t["load_kwh"],
+            out=np.zeros(self.fleet.size), where=t["load_kwh"] > 0
+        ) * 100
+
+        return {
+            "baseline_total_cost": baseline_cost,
+            "optimized_total_cost": net_cost,
+            "total_cost_savings": round_half(savings, 2),
+            "savings_percentage": round_half(savings_pct, 1),
+            "net_emissions_kg": round_half(t["import_emissions_kg"] - t["export_credit_kg"], 2),
+            "renewable_usage_pct": round_half(renewable_pct, 1),
+            "total_load_kwh": round_half(t["load_kwh"], 2),
+            "total_solar_kwh": round_half(t["solar_kwh"], 2),
+            "total_grid_import_kwh": grid_import,
+            "total_grid_export_kwh": round_half(t["grid_export_kwh"], 2),
+            "final_soc_pct": self.engine.soc / self.fleet.capacity * 100
+        }
+
+
+def run_fleet_chunk(task: Dict) -> Dict[str, np.ndarray]:
+    """
+    Simulate one chunk of sites over the whole horizon.
+
+    Module-level so it can be dispatched to SimulationExecutor workers.
+
+    Args:
+        task: Dictionary with "sites" (Fleet parameter arrays),
+              "grid_intensity", "timestep_minutes", "loads", "solar_shape"
+              (per kWp) and "prices" (full-horizon profiles, shared or per site),
+              "avg_price" and "block_steps"
+
+    Returns:
+        {"sites": FleetEngine.summarize(), "series": fleet series for the
+        chunk over the horizon}
+    """
+    engine = FleetEngine(
+        Fleet(**task["sites"]),
+        grid_intensity=task["grid_intensity"],
+        timestep_minutes=task["timestep_minutes"]
+    )
+    loads = np.asarray(task["loads"], dtype=float)
+    solars = np.asarray(task["solar_shape"], dtype=float)
+    prices = np.asarray(task["prices"], dtype=float)
+    total_steps = loads.shape[-1]
+    block_steps = task["block_steps"]
+
+    blocks = []
+    for start in range(0, total_steps, block_steps):
+        window = slice(start, start + block_steps)
+        blocks.append(engine.run(
+            loads[..., window], solars[..., window], prices[..., window],
+            task["avg_price"], start_step=start
+        ))
+
+    return {
+        "sites": engine.summarize(),
+        "series": {name: np.concatenate([block[name] for block in blocks]) for name in blocks[0]}
+    }
+
+
+def merge_fleet_series(chunks: Sequence[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """
+    Combine the fleet series of several site chunks.
+
+    Args:
+        chunks: "series" outputs of run_fleet_chunk()
+
+    Returns:
+        Fleet series over all sites (flows summed, peak site import maxed)
+    """
+    merged = {"hour": chunks[0]["hour"]}
+    for name in chunks[0]:
+        if name == "hour":
+            continue
+        stacked = np.stack([chunk[name] for chunk in chunks])
+        merged[name] = stacked.max(axis=0) if name == "peak_site_import_kwh" else stacked.sum(axis=0)
+    return merged
+
+
+def fleet_totals(series: Dict[str, np.ndarray], sites: Dict[str, np.ndarray], timestep_hours: float) -> Dict[str, float]:
+    """
+    Fleet-wide headline metrics.
+
+    Args:
+        series: Merged fleet series
+        sites: Per-site summaries over all sites
+        timestep_hours: Length of one time step in hours
+
+    Returns:
+        Dictionary of fleet totals (costs from the per-site summaries,
+        peak power from the fleet series)
+    """
+    baseline = float(sites["baseline_total_cost"].sum())
+    optimized = float(sites["optimized_total_cost"].sum())
+    return {
+        "baseline_total_cost": round(baseline, 2),
+        "optimized_total_cost": round(optimized, 2),
+        "total_cost_savings": round(baseline - optimized, 2),
+        "savings_percentage": round((baseline - optimized) / baseline * 100, 1) if baseline > 0 else 0.0,
+        "net_emissions_kg": round(float(sites["net_emissions_kg"].sum()), 2),
+        "total_grid_import_kwh": round(float(sites["total_grid_import_kwh"].sum()), 2),
+        "total_grid_export_kwh": round(float(sites["total_grid_export_kwh"].sum()), 2),
+        "peak_grid_import_kw": round(float(series["grid_import_kwh"].max()) / timestep_hours, 3),
+        "peak_grid_export_kw": round(float(series["grid_export_kwh"].max()) / timestep_hours, 3)
+    }
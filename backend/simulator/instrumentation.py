@@ -0,0 +1,291 @@
+"""
+Instrumentation
+Per-stage timers, request counters and latency histograms, exported in
+the Prometheus text format.
+
+A StageTimer splits one simulation into stages (validation, scheduler,
+energy balance, cost, carbon, decision logging, summary, response
+construction, ...). A lap costs a few hundred nanoseconds, which is
+negligible per block but not per step of the hour-by-hour loop: there
+the loop as a whole is timed, stages are timed on a sample of steps
+(every STAGE_SAMPLE_STEPS), and the loop time is split in proportion
+(apportion()). Stage totals are kept per request and folded into the
+shared MetricsRegistry, which also holds the per-endpoint latency
+histograms recorded by MetricsMiddleware.
+
+The registry lives in the API process: work done on the process pool
+returns its stage timings with the result, and the endpoint records
+them.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Latency histogram bucket upper bounds (seconds)
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+# Per-step loops time their stages on one step in this many
+STAGE_SAMPLE_STEPS = 16
+
+# perf_counter() at the start of the current HTTP request (set by MetricsMiddleware)
+_request_start: ContextVar[Optional[float]] = ContextVar("request_start", default=None)
+
+# Collector output: (name, type, help, [(labels, value), ...])
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+class StageTimer:
+    """
+    Wall-clock time per stage of one request.
+
+    lap(stage) charges the time since the previous lap (or mark()) to a
+    stage, so a sequence of steps is split into stages with one call each.
+    """
+
+    __slots__ = ("stages", "_last")
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def mark(self):
+        """Start the next lap now (time since the previous lap is not charged)."""
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str):
+        """
+        Charge the time since the previous lap to a stage.
+
+        Args:
+            stage: Stage name
+        """
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self._last
+        self._last = now
+
+    def add(self, stage: str, seconds: float):
+        """
+        Charge a measured duration to a stage.
+
+        Args:
+            stage: Stage name
+            seconds: Duration (s)
+        """
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def apportion(self, stage: str, sample: "StageTimer"):
+        """
+        Replace a stage by sub-stages, in proportion to a sampled timer.
+
+        Args:
+            stage: Stage holding the total time (e.g. a whole loop)
+            sample: Timer with the sub-stage times of sampled iterations
+        """
+        total = self.stages.pop(stage, 0.0)
+        sampled = sum(sample.stages.values())
+        if sampled <= 0:
+            self.add(stage, total)
+            return
+        for name, seconds in sample.stages.items():
+            self.add(name, total * seconds / sampled)
+
+    def as_ms(self) -> Dict[str, float]:
+        """Stage durations in milliseconds, in the order first seen."""
+        return {stage: round(seconds * 1000, 3) for stage, seconds in self.stages.items()}
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Record one observation."""
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of counters and histograms keyed by name and labels.
+
+    Collectors are functions called at render time for values owned
+    elsewhere (e.g. result cache and job statistics).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[Tuple, float]] = {}
+        self._histograms: Dict[str, Dict[Tuple, Histogram]] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+
+    def describe(self, name: str, kind: str, help_text: str):
+        """
+        Declare a metric's type ("counter" or "histogram") and help text.
+
+        Args:
+            name: Metric name
+            kind: Prometheus metric type
+            help_text: One-line description
+        """
+        self._help[name] = (kind, help_text)
+
+    def inc(self, name: str, value: float = 1.0, **labels: str):
+        """Add to a counter."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: str):
+        """Record an observation in a histogram."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def record_stages(self, endpoint: str, stages: Dict[str, float]):
+        """
+        Fold one request's stage timings into the stage histograms.
+
+        Args:
+            endpoint: Route path (e.g. "/simulate")
+            stages: Stage durations in milliseconds (StageTimer.as_ms())
+        """
+        for stage, ms in stages.items():
+            self.observe("microgrid_stage_duration_seconds", ms / 1000, endpoint=endpoint, stage=stage)
+
+    def add_collector(self, collector: Callable[[], Iterable[Family]]):
+        """Register a function returning metric families at render time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                self._header(lines, name, "counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_labels(dict(key))} {_number(value)}")
+            for name, series in sorted(self._histograms.items()):
+                self._header(lines, name, "histogram")
+                for key, histogram in sorted(series.items()):
+                    labels = dict(key)
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels({**labels, 'le': _number(bound)})} {cumulative}")
+                    lines.append(f"{name}_bucket{_labels({**labels, 'le': '+Inf'})} {histogram.count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+                    lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+
+        for collector in self._collectors:
+            for name, kind, help_text, samples in collector():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: List[str], name: str, default_kind: str):
+        kind, help_text = self._help.get(name, (default_kind, name))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    """Prometheus label set, e.g. {endpoint="/simulate"} ("" when empty)."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape(value) -> str:
+    """Escape a label value (backslash, double quote, newline)."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    """Sample value without a trailing .0 on integers."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts and latency per endpoint.
+
+    Endpoints are labelled by route template (e.g. "/jobs/{job_id}"),
+    so label cardinality stays bounded; unrouted paths share one label.
+    Also stamps the request start time, so handlers can measure the
+    time spent reading and validating the request (request_elapsed()).
+    """
+
+    def __init__(self, app, registry: Optional[MetricsRegistry] = None):
+        self.app = app
+        self.registry = registry or get_registry()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        token = _request_start.set(start)
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_start.reset(token)
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            self.registry.inc(
+                "microgrid_http_requests_total", endpoint=endpoint, method=method, status=str(status[0])
+            )
+            self.registry.observe(
+                "microgrid_http_request_duration_seconds", time.perf_counter() - start,
+                endpoint=endpoint, method=method
+            )
+
+
+def request_elapsed() -> Optional[float]:
+    """Seconds since the current HTTP request started, or None outside a request."""
+    start = _request_start.get()
+    return None if start is None else time.perf_counter() - start
+
+
+_registry = MetricsRegistry()
+_registry.describe("microgrid_http_requests_total", "counter", "HTTP requests by endpoint, method and status")
+_registry.describe("microgrid_http_request_duration_seconds", "histogram", "HTTP request latency by endpoint")
+_registry.describe("microgrid_stage_duration_seconds", "histogram", "Time per request spent in each stage")
+_registry.describe("microgrid_simulated_steps_total", "counter", "Simulated time steps by endpoint")
+
+
+def get_registry() -> MetricsRegistry:
+    """Shared metrics registry of the API process."""
+    return _registry
@@ -0,0 +1,407 @@
+"""
+Job Manager
+Background jobs for long-running simulations (submit / poll / cancel).
+
+Year-long runs and large sweeps can outlast proxy timeouts when served
+as one request/response. Jobs are queued instead and run one per worker
+process, so they never hold the request threadpool or the GIL of the
+API process, and a running job can be cancelled by terminating its
+process. Job processes run at lowered scheduling priority, so
+interactive /simulate requests keep their latency while jobs run.
+
+A job function is called in the worker process as fn(payload, progress)
+and returns a picklable result; progress(done, total) reports partial
+progress back to the API process. Finished jobs are kept for polling
+until they expire or the retention limit evicts the oldest.
+
+Configured through environment variables:
+- MICROGRID_JOB_WORKERS: concurrently running jobs (default 2)
+- MICROGRID_JOB_QUEUE: maximum queued jobs (default 32)
+- MICROGRID_JOB_RETENTION: seconds finished jobs are kept (default 3600)
+- MICROGRID_JOB_MAX_RETAINED: maximum finished jobs kept (default 100)
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed", "cancelled")
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+# Added to the job processes' nice value
+JOB_NICENESS = 10
+
+# Seconds between checks on a running job's process
+POLL_INTERVAL = 0.1
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at its limit."""
+
+
+def _run_job(fn: Callable, payload: Any, conn):
+    """Worker process entry point: run fn and send progress and the outcome."""
+    try:
+        os.nice(JOB_NICENESS)
+    except (AttributeError, OSError):
+        pass
+
+    def progress(done: int, total: int):
+        conn.send(("progress", done, total))
+
+    try:
+        conn.send(("result", fn(payload, progress)))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+class Job:
+    """
+    One submitted job.
+
+    Attributes:
+        id: Job identifier
+        kind: Job type (e.g. "simulate")
+        status: One of JOB_STATUSES
+        done, total: Latest progress report (units depend on the job)
+        result: Return value of the job function, once succeeded
+        error: Error message, once failed
+    """
+
+    def __init__(self, kind: str, fn: Callable, payload: Any, created_at: float):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.fn = fn
+        self.payload = payload
+        self.status = "queued"
+        self.done = 0
+        self.total = 0
+        self.result = None
+        self.error: Optional[str] = None
+        self.created_at = created_at
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.process = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has succeeded, failed or been cancelled."""
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        """
+        Job status for API responses.
+
+        Args:
+            include_result: Include the result of a succeeded job
+
+        Returns:
+            Dictionary with id, kind, status, progress, timestamps, error
+            and (optionally) result
+        """
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": {
+                "done": self.done,
+                "total": self.total,
+                "fraction": round(self.done / self.total, 4) if self.total else 0.0
+            },
+            "created_at": _timestamp(self.created_at),
+            "started_at": _timestamp(self.started_at),
+            "finished_at": _timestamp(self.finished_at),
+            "error": self.error,
+            "result": self.result if include_result else None
+        }
+
+
+def _timestamp(value: Optional[float]) -> Optional[str]:
+    """ISO 8601 UTC time, or None."""
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, timezone.utc).isoformat()
+
+
+class JobManager:
+    """
+    Bounded job queue served by a fixed number of worker processes.
+
+    Dispatcher threads are started on first submit; each takes the next
+    queued job, runs it in a fresh process and relays its progress
+    messages until it finishes or is cancelled.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_queued: int = 32,
+        retention_seconds: float = 3600.0,
+        max_retained: int = 100,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Initialize job manager.
+
+        Args:
+            max_workers: Jobs running at the same time
+            max_queued: Jobs waiting to run before submit() is refused
+            retention_seconds: How long finished jobs are kept
+            max_retained: Finished jobs kept at most (oldest evicted first)
+            clock: Time source (seconds)
+        """
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.retention_seconds = retention_seconds
+        self.max_retained = max_retained
+        self.clock = clock
+
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._queued = 0
+        self.evictions = 0
+
+    def submit(self, kind: str, fn: Callable, payload: Any) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            kind: Job type, reported in the job status
+            fn: Picklable (module-level) function called as fn(payload, progress)
+            payload: Picklable argument for fn
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFull: If max_queued jobs are already waiting
+        """
+        with self._lock:
+            self._evict()
+            if self._queued >= self.max_queued:
+                raise JobQueueFull(f"Job queue is full ({self.max_queued} jobs waiting)")
+            job = Job(kind, fn, payload, self.clock())
+            self._jobs[job.id] = job
+            self._queued += 1
+            self._start_workers()
+        self._queue.put(job.id)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            The job, or None if unknown or evicted
+        """
+        with self._lock:
+            self._evict()
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        """All retained jobs, oldest first."""
+        with self._lock:
+            self._evict()
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a job, or discard it if already finished.
+
+        A queued job is skipped when its turn comes; a running job's
+        process is terminated.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            The job, or None if unknown or evicted
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.finished:
+                del self._jobs[job_id]
+                return job
+            if job.status == "queued":
+                self._queued -= 1
+            elif job.process is not None:
+                job.process.terminate()
+            job.status = "cancelled"
+            job.finished_at = self.clock()
+            job.payload = None
+            return job
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of jobs by status, plus limits and evictions."""
+        with self._lock:
+            counts = {status: 0 for status in JOB_STATUSES}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return {
+                **counts,
+                "max_workers": self.max_workers,
+                "max_queued": self.max_queued,
+                "evictions": self.evictions
+            }
+
+    def shutdown(self):
+        """Cancel outstanding jobs and stop the dispatcher threads."""
+        with self._lock:
+            outstanding = [job.id for job in self._jobs.values() if not job.finished]
+        for job_id in outstanding:
+            self.cancel(job_id)
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _start_workers(self):
+        """Start the dispatcher threads (called with the lock held)."""
+        while len(self._threads) < self.max_workers:
+            thread = threading.Thread(target=self._dispatch, name=f"job-worker-{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _dispatch(self):
+        """Dispatcher thread: run queued jobs one at a time."""
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job.status != "queued":
+                    continue
+                self._queued -= 1
+                receiver, sender = multiprocessing.Pipe(duplex=False)
+                job.process = multiprocessing.Process(
+                    target=_run_job, args=(job.fn, job.payload, sender), daemon=True
+                )
+                job.status = "running"
+                job.started_at = self.clock()
+                job.process.start()
+            sender.close()
+            self._follow(job, receiver)
+
+    def _follow(self, job: Job, receiver):
+        """Relay a running job's messages until its process exits."""
+        outcome = None
+        try:
+            while outcome is None:
+                if receiver.poll(POLL_INTERVAL):
+                    try:
+                        message = receiver.recv()
+                    except EOFError:
+                        break
+                    if message[0] == "progress":
+                        with self._lock:
+                            job.done, job.total = message[1], message[2]
+                    else:
+                        outcome = message
+                elif not job.process.is_alive():
+                    # It may have sent its outcome after the poll timed out
+                    if not receiver.poll(0):
+                        break
+        finally:
+            job.process.join()
+            receiver.close()
+
+        with self._lock:
+            exitcode = job.process.exitcode
+            job.process = None
+            job.payload = None
+            if job.status != "running":
+                # Cancelled while running
+                return
+            job.finished_at = self.clock()
+            if outcome is not None and outcome[0] == "result":
+                job.status = "succeeded"
+                job.result = outcome[1]
+                job.done = job.total
+            else:
+                job.status = "failed"
+                job.error = outcome[1] if outcome is not None else f"Job process exited with code {exitcode}"
+
+    def _evict(self):
+        """Drop expired finished jobs, then the oldest beyond max_retained (lock held)."""
+        now = self.clock()
+        finished = [job for job in self._jobs.values() if job.finished]
+        finished.sort(key=lambda job: job.finished_at)
+        excess = len(finished) - self.max_retained
+        for index, job in enumerate(finished):
+            if index < excess or now - job.finished_at > self.retention_seconds:
+                del self._jobs[job.id]
+                self.evictions += 1
+
+
+_manager: Optional[JobManager] = None
+_configured = False
+
+
+def configure_jobs(
+    max_workers: int = 2,
+    max_queued: int = 32,
+    retention_seconds: float = 3600.0,
+    max_retained: int = 100
+) -> JobManager:
+    """
+    Replace the shared job manager.
+
+    Args:
+        max_workers: Jobs running at the same time
+        max_queued: Jobs waiting to run before submissions are refused
+        retention_seconds: How long finished jobs are kept
+        max_retained: Finished jobs kept at most
+
+    Returns:
+        The new job manager
+    """
+    global _manager, _configured
+    if _manager is not None:
+        _manager.shutdown()
+    _manager = JobManager(max_workers, max_queued, retention_seconds, max_retained)
+    _configured = True
+    return _manager
+
+
+def get_job_manager() -> JobManager:
+    """
+    Get the shared job manager, configuring it from the environment on first call.
+
+    Returns:
+        Shared job manager
+    """
+    if not _configured:
+        configure_jobs(
+            int(os.environ.get("MICROGRID_JOB_WORKERS", "2")),
+            int(os.environ.get("MICROGRID_JOB_QUEUE", "32")),
+            float(os.environ.get("MICROGRID_JOB_RETENTION", "3600")),
+            int(os.environ.get("MICROGRID_JOB_MAX_RETAINED", "100"))
+        )
+    return _manager
+
+
+def shutdown_jobs():
+    """Cancel outstanding jobs and stop the shared job manager, if any."""
+    global _manager, _configured
+    if _manager is not None:
+        _manager.shutdown()
+        _manager = None
+    _configured = False
@@ -0,0 +1,101 @@
+"""
+Monte Carlo Weather Uncertainty
+Runs many seeded forecast-error samples in one batched pass.
+
+Decisions follow the forecast solar, as in the single-run path, so the
+battery schedule is shared by all samples; each sample's actual solar
+then changes grid import/export, cost and emissions.
+"""
+
+from typing import Dict, Sequence
+
+import numpy as np
+
+from simulator.batch import BatchEngine
+
+
+# Samples per block. Each block has its own child seed, so results for a
+# given seed don't depend on how blocks are spread over workers.
+MONTE_CARLO_BLOCK = 2048
+
+PERCENTILES = (5, 50, 95)
+
+
+def sample_actual_solar(
+    forecast: Sequence[float],
+    sigma: float,
+    samples: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Draw actual solar for many samples of forecast error.
+
+    Args:
+        forecast: Hourly forecast solar (kWh)
+        sigma: Standard deviation of relative forecast error
+        samples: Number of samples
+        rng: NumPy random generator
+
+    Returns:
+        Actual solar array of shape (samples, hours), never negative
+    """
+    forecast = np.asarray(forecast, dtype=float)
+    error = rng.normal(0.0, sigma, size=(samples, forecast.size))
+    return np.maximum(0.0, forecast * (1 + error))
+
+
+def run_monte_carlo_block(task: Dict) -> Dict[str, np.ndarray]:
+    """
+    Simulate one block of forecast-error samples.
+
+    Module-level so it can be dispatched to SimulationExecutor workers.
+
+    Args:
+        task: Dictionary with "battery" (BatchEngine parameters),
+              "grid_intensity", "loads", "solars", "prices", "avg_price",
+              "baseline_cost", "sigma", "samples" and "seed" (SeedSequence)
+
+    Returns:
+        Per-sample hourly arrays (samples, hours) and summary totals (samples,)
+    """
+    rng = np.random.default_rng(task["seed"])
+    actual_solar = sample_actual_solar(task["solars"], task["sigma"], task["samples"], rng)
+
+    engine = BatchEngine(**task["battery"], grid_intensity=task["grid_intensity"])
+    series = engine.run(
+        task["loads"], task["solars"], task["prices"], task["avg_price"],
+        actual_solars=actual_solar
+    )
+    totals = engine.summarize(series, task["loads"], task["baseline_cost"])
+
+    shape = actual_solar.shape
+    return {
+        "cost_usd": series["cost_usd"],
+        "battery_soc_pct": np.broadcast_to(series["battery_soc_pct"], shape),
+        "grid_import_kwh": series["grid_import_kwh"],
+        "emissions_kg": series["emissions_kg"],
+        "solar_kwh": actual_solar,
+        "optimized_total_cost": totals["optimized_total_cost"],
+        "total_cost_savings": totals["total_cost_savings"],
+        "net_emissions_kg": totals["net_emissions_kg"],
+        "total_grid_import_kwh": totals["total_grid_import_kwh"],
+        "renewable_usage_pct": totals["renewable_usage_pct"],
+    }
+
+
+def percentile_bands(values: np.ndarray, decimals: int = 3) -> Dict[str, list]:
+    """
+    Percentile bands across samples (axis 0).
+
+    Args:
+        values: Array of shape (samples, ...)
+        decimals: Decimal places to round to
+
+    Returns:
+        Dictionary like {"p5": ..., "p50": ..., "p95": ...}
+    """
+    bands = np.percentile(values, PERCENTILES, axis=0)
+    return {
+        f"p{p}": np.round(band, decimals).tolist()
+        for p, band in zip(PERCENTILES, bands)
+    }
@@ -1,56 +1,187 @@
 """
 Time Engine
-Manages 24-hour simulation time steps.
+Manages simulation time steps over a configurable horizon.
 """
 
+from typing import Sequence, Union
+
+import numpy as np
+
+
 class TimeEngine:
     """
-    Manages discrete 24-hour time steps for simulation.
-    
-    Each time step represents one hour (0-23).
+    Manages discrete time steps for simulation.
+
+    Time steps default to one hour and can be shortened (e.g. 15 or
+    5 minutes) to match metering data. The horizon defaults to one day
+    (hours 0-23) and can span many days; hours count from the start of
+    day 1, so hour 24 is midnight of day 2.
     """
-    
-    def __init__(self):
-        """Initialize time engine at hour 0."""
-        self.current_hour = 0
-        self.total_hours = 24
-    
+
+    HOURS_PER_DAY = 24
+    MINUTES_PER_HOUR = 60
+
+    def __init__(self, total_hours: int = 24, timestep_minutes: int = 60):
+        """
+        Initialize time engine at step 0.
+
+        Args:
+            total_hours: Simulation horizon in hours (8760 for a year)
+            timestep_minutes: Length of one time step in minutes
+                              (must divide an hour evenly)
+        """
+        if total_hours < 1:
+            raise ValueError("Simulation horizon must be at least 1 hour")
+        if timestep_minutes < 1 or self.MINUTES_PER_HOUR % timestep_minutes:
+            raise ValueError("Timestep must divide an hour evenly")
+
+        self.total_hours = total_hours
+        self.timestep_minutes = timestep_minutes
+        self.timestep_hours = timestep_minutes / self.MINUTES_PER_HOUR
+        self.steps_per_hour = self.MINUTES_PER_HOUR // timestep_minutes
+        self.total_steps = total_hours * self.steps_per_hour
+        self.current_step = 0
+
+    @property
+    def current_hour(self) -> int:
+        """Hour containing the current step (counted from the start)."""
+        return self.current_step // self.steps_per_hour
+
     def reset(self):
-        """Reset to hour 0."""
-        self.current_hour = 0
-    
+        """Reset to step 0."""
+        self.current_step = 0
+
     def advance(self):
         """
-        Advance to next hour.
-        
+        Advance to next time step.
+
         Returns:
-            True if advanced successfully, False if reached end of day
+            True if advanced successfully, False if reached end of horizon
         """
-        if self.current_hour < self.total_hours - 1:
-            self.current_hour += 1
+        if self.current_step < self.total_steps - 1:
+            self.current_step += 1
             return True
         return False
-    
+
     def get_hour(self) -> int:
-        """Get current hour (0-23)."""
+        """Get current hour (counted from the start of the horizon)."""
         return self.current_hour
-    
+
+    def get_time_hours(self) -> Union[int, float]:
+        """
+        Get current time in hours from the start of the horizon.
+
+        Returns:
+            Whole hour number for hourly steps, fractional hours otherwise
+            (e.g. 6.25 for 6:15 AM)
+        """
+        if self.steps_per_hour == 1:
+            return self.current_step
+        return self.current_step / self.steps_per_hour
+
+    def get_day(self) -> int:
+        """Get current day index (0 = first day)."""
+        return self.current_hour // self.HOURS_PER_DAY
+
+    def get_hour_of_day(self) -> int:
+        """Get current hour of day (0-23)."""
+        return self.current_hour % self.HOURS_PER_DAY
+
     def is_day_complete(self) -> bool:
-        """Check if simulation day is complete."""
-        return self.current_hour >= self.total_hours - 1
-    
-    def get_hours_remaining(self) -> int:
-        """Get number of hours remaining in simulation."""
-        return self.total_hours - self.current_hour - 1
-    
+        """Check if simulation horizon is complete."""
+        return self.current_step >= self.total_steps - 1
+
+    def get_hours_remaining(self) -> float:
+        """Get time remaining in simulation (hours)."""
+        return (self.total_steps - self.current_step - 1) * self.timestep_hours
+
+    def iterate_steps(self):
+        """
+        Generator to iterate through all time steps of the horizon.
+
+        Yields:
+            Step number (0 to total_steps - 1)
+        """
+        self.reset()
+        for step in range(self.total_steps):
+            self.current_step = step
+            yield step
+
     def iterate_hours(self):
         """
-        Generator to iterate through all 24 hours.
-        
+        Generator to iterate through all hours of the horizon.
+
         Yields:
-            Hour number (0-23)
+            Hour number (0 to total_hours - 1)
         """
         self.reset()
         for hour in range(self.total_hours):
-            self.current_hour = hour
+            self.current_step = hour * self.steps_per_hour
             yield hour
+
+    def iterate_chunks(self, chunk_hours: int):
+        """
+        Generator to iterate through the horizon in blocks of hours.
+
+        Args:
+            chunk_hours: Hours per block
+
+        Yields:
+            (start_hour, hours) for each block; the last may be shorter
+        """
+        self.reset()
+        for start in range(0, self.total_hours, chunk_hours):
+            hours = min(chunk_hours, self.total_hours - start)
+            self.current_step = (start + hours) * self.steps_per_hour - 1
+            yield start, hours
+
+    def expand_hourly(self, values: Sequence[float], energy: bool = True) -> np.ndarray:
+        """
+        Convert an hourly profile to one value per time step.
+
+        Args:
+            values: Hourly values
+            energy: True for energy per hour (kWh), which is split evenly
+                    across the hour's steps; False for rates such as
+                    prices ($/kWh), which are repeated
+
+        Returns:
+            float64 array of per-step values
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if self.steps_per_hour == 1:
+            return values
+        if energy:
+            values = values / self.steps_per_hour
+        return np.repeat(values, self.steps_per_hour)
+
+    def resample(self, values: Sequence[float], timestep_minutes: int, energy: bool = True) -> np.ndarray:
+        """
+        Convert a profile recorded at another time step to one value per time step.
+
+        Args:
+            values: Values per recorded step, covering whole hours
+            timestep_minutes: Length of a recorded step in minutes
+            energy: True for energy per step (kWh), which is split evenly
+                    or summed; False for rates such as prices ($/kWh),
+                    which are repeated or averaged
+
+        Returns:
+            float64 array of per-step values (only the given block is
+            converted, e.g. a slice of a memory-mapped series)
+
+        Raises:
+            ValueError: If neither time step is a multiple of the other
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if timestep_minutes == self.timestep_minutes:
+            return values
+        if timestep_minutes % self.timestep_minutes == 0:
+            factor = timestep_minutes // self.timestep_minutes
+            return np.repeat(values / factor if energy else values, factor)
+        if self.timestep_minutes % timestep_minutes == 0:
+            steps = values.reshape(-1, self.timestep_minutes // timestep_minutes)
+            return steps.sum(axis=1) if energy else steps.mean(axis=1)
+        raise ValueError(
+            f"Cannot convert {timestep_minutes}-minute profile data to {self.timestep_minutes}-minute steps"
+        )
@@ -0,0 +1,397 @@
+"""
+Vectorized Simulation Engine
+Array-based counterpart of the hour-by-hour simulation loop in main.py.
+
+Load/solar/price arithmetic, grid import/export, cost and emissions are
+computed as whole-array operations. Only the battery SoC recurrence is
+kept as a tight scalar loop, since each hour depends on the previous one.
+"""
+
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from models.battery import Battery, charge_step, discharge_step
+from scheduler.decision import GRID_CHARGE_TOLERANCE
+
+
+# Decision types in the priority order of scheduler.decision.classify_decision()
+DECISION_TYPES = (
+    "BATTERY_DISCHARGE",
+    "GRID_TO_BATTERY",
+    "SOLAR_TO_BATTERY",
+    "SOLAR_PLUS_GRID",
+    "GRID_SUPPLY",
+    "SOLAR_ONLY",
+    "NO_FLOW",
+)
+
+
+def round_half(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    Round an array exactly like Python's built-in round().
+
+    np.round scales by 10**ndigits first, and that product can land
+    exactly on a .5 boundary that the true value does not sit on. For
+    those elements the exact rounding error of the product (Dekker's
+    two-product) tells which way the true value lies, so results match
+    the dict-based path digit for digit.
+
+    Args:
+        values: Array to round
+        ndigits: Number of decimal places
+
+    Returns:
+        Rounded array
+    """
+    factor = 10.0 ** ndigits
+    scaled = values * factor
+    rounded = np.rint(scaled)
+    tie = scaled - np.floor(scaled) == 0.5
+    if tie.any():
+        error = _product_error(values[tie], factor, scaled[tie])
+        rounded[tie] = np.where(
+            error > 0, np.ceil(scaled[tie]),
+            np.where(error < 0, np.floor(scaled[tie]), rounded[tie])
+        )
+    return rounded / factor
+
+
+def _product_error(a: np.ndarray, b: float, product: np.ndarray) -> np.ndarray:
+    """Exact rounding error of a * b (Dekker's two-product algorithm)."""
+    split = 134217729.0  # 2**27 + 1
+    t = split * a
+    a_high = t - (t - a)
+    a_low = a - a_high
+    t = split * b
+    b_high = t - (t - b)
+    b_low = b - b_high
+    return ((a_high * b_high - product) + a_high * b_low + a_low * b_high) + a_low * b_low
+
+
+def sequential_sum(values: np.ndarray, initial: float = 0.0) -> np.ndarray:
+    """
+    Sum along the last axis strictly left to right.
+
+    np.sum uses pairwise summation, which can differ from the dict-based
+    path's running total in the last bit and flip a rounded cent.
+
+    Args:
+        values: Array of shape (..., hours)
+        initial: Running total to continue from (e.g. previous blocks);
+                 a scalar or an array of shape (...)
+
+    Returns:
+        Totals of shape (...)
+    """
+    values = np.asarray(values, dtype=float)
+    if np.any(initial):
+        start = np.broadcast_to(initial, values.shape[:-1])[..., None]
+        values = np.concatenate([start, values], axis=-1)
+    if values.shape[-1] == 0:
+        return np.zeros(values.shape[:-1])
+    return np.cumsum(values, axis=-1)[..., -1]
+
+
+def settle_flows(
+    load: np.ndarray,
+    forecast_solar: np.ndarray,
+    actual_solar: np.ndarray,
+    price: np.ndarray,
+    solar_used: np.ndarray,
+    remaining_load: np.ndarray,
+    remaining_solar: np.ndarray,
+    charged: np.ndarray,
+    discharged: np.ndarray,
+    soc_pct: np.ndarray,
+    grid_intensity,
+    export_price_ratio: float,
+    start_step: int = 0,
+    steps_per_hour: int = 1
+) -> Dict[str, np.ndarray]:
+    """
+    Turn battery flows into grid, cost and emissions arrays.
+
+    Everything after the SoC recurrence is elementwise, so this works on
+    a single run (hours,) and on batches (batch, hours) alike; arguments
+    are broadcast against each other.
+
+    Args:
+        load: Load demand (kWh)
+        forecast_solar: Forecast solar generation (kWh)
+        actual_solar: Actual solar generation (kWh)
+        price: Grid price ($/kWh)
+        solar_used: Solar used directly by load (kWh)
+        remaining_load: Load left after direct solar use (kWh)
+        remaining_solar: Solar left after meeting load (kWh)
+        charged: Energy charged to battery (kWh)
+        discharged: Energy discharged from battery (kWh)
+        soc_pct: Battery SoC after each step (%)
+        grid_intensity: Grid carbon intensity (kg CO2/kWh)
+        export_price_ratio: Export price as fraction of import price
+        start_step: Step number of the first entry
+        steps_per_hour: Time steps per hour; "hour" is fractional when > 1
+
+    Returns:
+        Dictionary of per-step arrays
+    """
+    # RULES 3-4: curtailment and grid supply
+    solar_curtailed = np.maximum(remaining_solar - charged, 0.0)
+    grid_used = np.maximum(remaining_load - discharged, 0.0)
+
+    # Decision values are rounded exactly as in schedule_hour()
+    battery_charge = round_half(charged, 3)
+    battery_discharge = round_half(discharged, 3)
+
+    # Energy balance using ACTUAL solar
+    net_grid = round_half(load + battery_charge - actual_solar - battery_discharge, 3)
+    grid_import = np.maximum(net_grid, 0.0)
+    grid_export = -np.minimum(net_grid, 0.0)
+    supply = actual_solar + battery_discharge + grid_import
+    consumption = load + battery_charge + grid_export
+    balance_error = supply - consumption
+    grid_import = round_half(grid_import, 3)
+    grid_export = round_half(grid_export, 3)
+
+    # Cost and emissions
+    import_cost = grid_import * price
+    export_revenue = grid_export * price * export_price_ratio
+    net_cost = round_half(import_cost - export_revenue, 4)
+    import_emissions = grid_import * grid_intensity
+    export_credit = grid_export * grid_intensity
+    net_emissions = round_half(import_emissions - export_credit, 3)
+
+    # Decision type codes (index into DECISION_TYPES), first match wins
+    decision_code = np.select(
+        [
+            discharged > 0,
+            charged > remaining_solar + GRID_CHARGE_TOLERANCE,
+            charged > 0,
+            (solar_used > 0) & (grid_used > 0),
+            grid_used > 0,
+            solar_used > 0,
+        ],
+        [0, 1, 2, 3, 4, 5],
+        default=6
+    )
+
+    steps = np.arange(start_step, start_step + load.shape[-1])
+
+    return {
+        "hour": steps if steps_per_hour == 1 else steps / steps_per_hour,
+        "load_kwh": load,
+        "solar_kwh": actual_solar,
+        "forecast_solar_kwh": forecast_solar,
+        "price_per_kwh": price,
+        "solar_used_kwh": round_half(solar_used, 3),
+        "solar_curtailed_kwh": round_half(solar_curtailed, 3),
+        "battery_charge_kwh": battery_charge,
+        "battery_discharge_kwh": battery_discharge,
+        "battery_soc_pct": soc_pct,
+        "grid_import_kwh": grid_import,
+        "grid_export_kwh": grid_export,
+        "balance_error_kwh": round_half(balance_error, 3),
+        "balanced": np.abs(balance_error) < 0.001,
+        "import_cost": round_half(import_cost, 4),
+        "export_revenue": round_half(export_revenue, 4),
+        "cost_usd": net_cost,
+        "import_emissions_kg": round_half(import_emissions, 3),
+        "export_credit_kg": round_half(export_credit, 3),
+        "emissions_kg": net_emissions,
+        "decision_code": decision_code,
+    }
+
+
+class VectorizedEngine:
+    """
+    Runs the rule-based schedule, or replays an Optimizer plan, over whole
+    profiles at once.
+
+    Produces the same numbers as the dict-based path (RuleBasedScheduler or
+    Optimizer + EnergyBalance + CostCalculator + CarbonCalculator), including
+    the intermediate rounding, but returns one array per metric instead of
+    one dict per hour.
+    """
+
+    def __init__(
+        self,
+        battery: Battery,
+        grid_intensity: float,
+        export_price_ratio: float = 0.5,
+        timestep_minutes: int = 60
+    ):
+        """
+        Initialize vectorized engine.
+
+        Args:
+            battery: Battery object (its SoC is advanced by run())
+            grid_intensity: Grid carbon intensity in kg CO2 per kWh
+            export_price_ratio: Export price as fraction of import price
+            timestep_minutes: Length of one time step (must divide an hour)
+        """
+        self.battery = battery
+        self.grid_intensity = grid_intensity
+        self.export_price_ratio = export_price_ratio
+        self.timestep_hours = timestep_minutes / 60
+        self.steps_per_hour = 60 // timestep_minutes
+
+    def run(
+        self,
+        loads: Sequence[float],
+        solars: Sequence[float],
+        prices: Sequence[float],
+        avg_price: Union[float, np.ndarray],
+        actual_solars: Optional[Sequence[float]] = None,
+        start_step: int = 0,
+        plan: Optional[Dict[str, np.ndarray]] = None,
+        decide_on_actual: bool = False
+    ) -> Dict[str, np.ndarray]:
+        """
+        Simulate all time steps of the given profiles.
+
+        Battery SoC carries over between calls, so a long horizon can be
+        run as consecutive blocks.
+
+        Args:
+            loads: Load demand per step (kWh)
+            solars: Forecast solar generation per step (kWh), used for decisions
+            prices: Grid price per step ($/kWh)
+            avg_price: Reference price for cheap/expensive classification,
+                       one value or one per step (rolling average)
+            actual_solars: Actual solar per step (kWh), used for energy balance.
+                           Defaults to the forecast.
+            start_step: Step number of the first profile entry
+            plan: Optimizer plan for these steps ("charge_kwh" and
+                  "discharge_kwh" arrays) to apply instead of the rules
+            decide_on_actual: Base decisions on actual solar, measured in
+                              real time (MPC) instead of forecast
+
+        Returns:
+            Dictionary of per-step arrays
+        """
+        load = np.asarray(loads, dtype=float)
+        forecast_solar = np.asarray(solars, dtype=float)
+        price = np.asarray(prices, dtype=float)
+        actual_solar = forecast_solar if actual_solars is None else np.asarray(actual_solars, dtype=float)
+
+        # RULE 1: solar meets load first (decisions use forecast solar)
+        decision_solar = actual_solar if decide_on_actual else forecast_solar
+        solar_used = np.minimum(decision_solar, load)
+        remaining_load = load - solar_used
+        remaining_solar = decision_solar - solar_used
+
+        if plan is None:
+            charged, discharged, soc_pct = self._battery_recurrence(
+                remaining_load, remaining_solar, price > avg_price
+            )
+        else:
+            charged, discharged, soc_pct = self._apply_plan(
+                plan["charge_kwh"], plan["discharge_kwh"]
+            )
+
+        return settle_flows(
+            load, forecast_solar, actual_solar, price,
+            solar_used, remaining_load, remaining_solar,
+            charged, discharged, soc_pct,
+            self.grid_intensity, self.export_price_ratio,
+            start_step=start_step, steps_per_hour=self.steps_per_hour
+        )
+
+    def _battery_recurrence(
+        self,
+        remaining_load: np.ndarray,
+        remaining_solar: np.ndarray,
+        is_expensive: np.ndarray
+    ):
+        """
+        Advance battery SoC step by step (RULES 2 and 4 of the scheduler).
+
+        Args:
+            remaining_load: Load left after direct solar use (kWh)
+            remaining_solar: Solar left after meeting load (kWh)
+            is_expensive: Whether each hour's price is above the reference
+
+        Returns:
+            Tuple of (charged, discharged, soc_pct) arrays
+        """
+        battery = self.battery
+        capacity = battery.capacity
+        min_energy = battery.min_energy
+        max_energy = battery.max_energy
+        # Power limits (kW) as energy per time step (kWh)
+        max_charge = battery.max_charge_rate * self.timestep_hours
+        max_discharge = battery.max_discharge_rate * self.timestep_hours
+        efficiency = battery.efficiency
+        soc = battery.current_soc
+
+        hours = remaining_load.size
+        charged = [0.0] * hours
+        discharged = [0.0] * hours
+        soc_pct = [0.0] * hours
+
+        for i, (deficit, excess, expensive) in enumerate(zip(
+            remaining_load.tolist(), remaining_solar.tolist(), is_expensive.tolist()
+        )):
+            if excess > 0:
+                available = min((max_energy - soc) / efficiency, max_charge)
+                if available > 0:
+                    energy = min(excess, available)
+                    soc += energy * efficiency
+                    if soc > max_energy:
+                        soc = max_energy
+                    charged[i] = energy
+            elif deficit > 0 and expensive:
+                available = min(soc - min_energy, max_discharge)
+                if available > 0:
+                    energy = min(deficit, available)
+                    soc -= energy
+                    if soc < min_energy:
+                        soc = min_energy
+                    discharged[i] = energy
+            soc_pct[i] = soc / capacity * 100
+
+        battery.current_soc = soc
+
+        return np.array(charged), np.array(discharged), np.array(soc_pct)
+
+    def _apply_plan(self, planned_charge: np.ndarray, planned_discharge: np.ndarray):
+        """
+        Apply planned battery flows step by step, within battery limits.
+
+        Uses the same step functions as Battery.charge() followed by
+        Battery.discharge(), as PlanScheduler.schedule_hour() does, so both
+        engines agree exactly.
+
+        Args:
+            planned_charge: Planned charge per step (kWh)
+            planned_discharge: Planned discharge per step (kWh)
+
+        Returns:
+            Tuple of (charged, discharged, soc_pct) arrays
+        """
+        battery = self.battery
+        capacity = battery.capacity
+        min_energy = battery.min_energy
+        max_energy = battery.max_energy
+        max_charge = battery.max_charge_rate * self.timestep_hours
+        max_discharge = battery.max_discharge_rate * self.timestep_hours
+        efficiency = battery.efficiency
+        soc = battery.current_soc
+
+        steps = len(planned_charge)
+        charged = [0.0] * steps
+        discharged = [0.0] * steps
+        soc_pct = [0.0] * steps
+
+        for i, (charge, discharge) in enumerate(zip(
+            np.asarray(planned_charge).tolist(), np.asarray(planned_discharge).tolist()
+        )):
+            if charge > 0:
+                soc, charged[i] = charge_step(soc, charge, min_energy, max_energy, max_charge, efficiency)
+            if discharge > 0:
+                soc, discharged[i] = discharge_step(soc, discharge, min_energy, max_energy, max_discharge)
+            soc_pct[i] = soc / capacity * 100
+
+        battery.current_soc = soc
+
+        return np.array(charged), np.array(discharged), np.array(soc_pct)
@@ -49,7 +49,7 @@ def test_components():
     # Test Scheduler
     print("\n4. Testing Rule-Based Scheduler...")
     battery.reset(0.5)
-    scheduler = RuleBasedScheduler(high_price_threshold=0.20)
+    scheduler = RuleBasedScheduler(price_profile=prices)
     decision = scheduler.schedule_hour(
         hour=12,
         load=2.5,
@@ -0,0 +1,80 @@
+"""
+Batch sweeps (/simulate/batch) against single /simulate runs.
+"""
+
+import itertools
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from main import (
+    BatchSimulationRequest, SimulationRequest, build_simulation_response, run_simulation_batch
+)
+from simulator.executor import SimulationExecutor
+
+GRID = {
+    "solar_capacity": [0.5, 6.0, 12.0],
+    "battery": {"capacity": [5.0, 20.0], "efficiency": [0.8, 0.95], "initial_soc": [0.2, 0.9]}
+}
+
+
+def _single_run_metrics(solar_capacity, **battery):
+    summary = build_simulation_response(
+        SimulationRequest(solar_capacity=solar_capacity, battery=battery, outputs=[])
+    ).summary
+    return {
+        "optimized_total_cost": summary["optimized_total_cost"],
+        "total_cost_savings": summary["total_cost_savings"],
+        "savings_percentage": summary["savings_percentage"],
+        "net_emissions_kg": summary["carbon"]["optimized_emissions_kg"],
+        "renewable_usage_pct": summary["renewable_usage_pct"],
+        "total_grid_import_kwh": summary["grid"]["total_import_kwh"],
+        "total_grid_export_kwh": summary["grid"]["total_export_kwh"]
+    }
+
+
+def test_batch_matches_single_runs():
+    results = run_simulation_batch(BatchSimulationRequest(grid=GRID))
+    names = ("capacity", "efficiency", "initial_soc")
+    combos = list(itertools.product(GRID["solar_capacity"], *(GRID["battery"][name] for name in names)))
+    assert results["count"] == len(combos)
+
+    for index, (solar_capacity, *values) in enumerate(combos):
+        battery = dict(zip(names, values))
+        assert results["parameters"]["solar_capacity"][index] == solar_capacity
+        batch = {name: float(column[index]) for name, column in results["metrics"].items()}
+        assert batch == _single_run_metrics(solar_capacity, **battery)
+
+
+def test_configurations_grid_and_executor_agree():
+    grid = run_simulation_batch(BatchSimulationRequest(grid=GRID))
+    configurations = [
+        {"solar_capacity": solar_capacity, "battery": {"capacity": capacity, "efficiency": efficiency,
+                                                       "initial_soc": initial_soc}}
+        for solar_capacity, capacity, efficiency, initial_soc in itertools.product(
+            GRID["solar_capacity"], *GRID["battery"].values()
+        )
+    ]
+    explicit = run_simulation_batch(BatchSimulationRequest(configurations=configurations))
+
+    executor = SimulationExecutor(max_workers=2, chunk_size=5)
+    try:
+        pooled = run_simulation_batch(BatchSimulationRequest(grid=GRID), executor=executor)
+    finally:
+        executor.shutdown()
+
+    for other in (explicit, pooled):
+        for name, values in grid["metrics"].items():
+            assert other["metrics"][name].tolist() == values.tolist()
+
+
+def test_batch_endpoint():
+    client = TestClient(main.app)
+    response = client.post("/simulate/batch", json={"configurations": [{"solar_capacity": 3.0}]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 1
+    assert body["metrics"]["optimized_total_cost"] == [_single_run_metrics(3.0)["optimized_total_cost"]]
+
+    assert client.post("/simulate/batch", json={}).status_code == 400
@@ -0,0 +1,121 @@
+"""
+Result cache: LRU order, TTL expiry, weight bound, key canonicalization
+and which /simulate requests are cached.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from main import SimulationRequest, _simulation_cache_key
+from simulator import cache as result_cache
+from simulator.cache import ResultCache, request_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_order():
+    cache = ResultCache(max_entries=2, clock=FakeClock())
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # a is now the most recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    # Replacing an entry doesn't evict anything
+    cache.put("c", 4)
+    assert cache.get("c") == 4 and cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = ResultCache(ttl_seconds=10, clock=clock)
+    cache.put("a", 1)
+    clock.now += 9.9
+    assert cache.get("a") == 1
+    clock.now += 0.1
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["entries"]) == (1, 1, 1, 0)
+
+    # The lifetime starts again when an entry is replaced
+    cache.put("a", 2)
+    clock.now += 5
+    cache.put("a", 3)
+    clock.now += 9
+    assert cache.get("a") == 3
+
+
+def test_weight_bound():
+    cache = ResultCache(max_entries=10, max_weight=10, clock=FakeClock())
+    cache.put("a", 1, weight=4)
+    cache.put("b", 2, weight=4)
+    cache.put("c", 3, weight=4)
+    assert cache.get("a") is None
+    assert cache.stats()["weight"] == 8
+
+    # Heavier than the whole cache: not stored, nothing evicted
+    cache.put("huge", 4, weight=11)
+    assert cache.get("huge") is None
+    assert cache.get("b") == 2 and cache.get("c") == 3
+
+    cache.clear()
+    assert cache.stats()["weight"] == 0 and cache.stats()["entries"] == 0
+
+
+def test_request_key_is_canonical():
+    assert request_key("simulate", {"a": 1, "b": {"c": 2, "d": 3}}) == \
+        request_key("simulate", {"b": {"d": 3, "c": 2}, "a": 1})
+    assert request_key("simulate", {"a": 1}) != request_key("batch", {"a": 1})
+    assert request_key("simulate", {"a": 1}) != request_key("simulate", {"a": 1.5})
+
+    # Defaults are filled in; the engine and include_timing don't change results
+    key = _simulation_cache_key(SimulationRequest())
+    assert key == _simulation_cache_key(SimulationRequest(solar_capacity=6.0, battery={"capacity": 10.0}))
+    assert key == _simulation_cache_key(SimulationRequest(engine="legacy", include_timing=True))
+    assert key != _simulation_cache_key(SimulationRequest(horizon_days=2))
+
+
+def test_uncacheable_requests():
+    assert _simulation_cache_key(SimulationRequest(enable_weather_uncertainty=True)) is None
+    assert _simulation_cache_key(SimulationRequest(enable_weather_uncertainty=True, seed=3)) is not None
+    assert _simulation_cache_key(SimulationRequest(profile_source="store")) is None
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(result_cache, "_cache", ResultCache(ttl_seconds=60, clock=clock))
+    monkeypatch.setattr(result_cache, "_configured", True)
+    return clock
+
+
+def test_simulate_serves_hits(clock):
+    client = TestClient(main.app)
+    request = {"horizon_days": 2, "timestep_minutes": 30}
+    miss = client.post("/simulate", json=request)
+    hit = client.post("/simulate", json=request)
+    assert miss.status_code == hit.status_code == 200
+    assert hit.content == miss.content
+    assert hit.json()["timing"] is None
+    assert set(client.post("/simulate", json={**request, "include_timing": True}).json()["timing"]) == {
+        "validation", "cache_lookup"
+    }
+    stats = client.get("/cache/stats").json()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+    clock.now += 60
+    assert client.post("/simulate", json=request).content == miss.content
+    assert client.get("/cache/stats").json()["expirations"] == 1
+
+    # Unseeded uncertainty draws fresh errors: never stored
+    client.post("/simulate", json={"enable_weather_uncertainty": True})
+    client.post("/simulate", json={"enable_weather_uncertainty": True})
+    assert client.get("/cache/stats").json()["entries"] == 1
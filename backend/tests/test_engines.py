@@ -0,0 +1,72 @@
+"""
+Engine parity: the vectorized engine must reproduce the hour-by-hour
+(legacy) loop exactly, for every scheduler and option.
+"""
+
+import random
+
+import pytest
+
+from main import BatteryConfig, SimulationRequest, build_simulation_response
+
+
+def _random_battery(rng: random.Random) -> BatteryConfig:
+    min_soc = rng.uniform(0, 0.5)
+    return BatteryConfig(
+        capacity=rng.uniform(0.5, 40),
+        min_soc=min_soc,
+        max_soc=rng.uniform(min_soc, 1),
+        max_charge_rate=rng.uniform(0.1, 10),
+        max_discharge_rate=rng.uniform(0.1, 10),
+        efficiency=rng.uniform(0.5, 1),
+        initial_soc=rng.uniform(0, 1)
+    )
+
+
+def _both_engines(**kwargs):
+    """Responses of both engines (solver timings dropped) for one configuration."""
+    responses = []
+    for engine in ("legacy", "vectorized"):
+        response = build_simulation_response(SimulationRequest(engine=engine, **kwargs)).model_dump()
+        response["summary"].pop("scheduler_stats", None)
+        response.pop("timing")
+        responses.append(response)
+    return responses
+
+
+@pytest.mark.parametrize("scheduler", ["rule_based", "lp", "dp", "mpc"])
+@pytest.mark.parametrize("uncertainty", [False, True])
+def test_engines_match(scheduler, uncertainty):
+    rng = random.Random(f"{scheduler}-{uncertainty}")
+    for seed in range(5):
+        legacy, vectorized = _both_engines(
+            battery=_random_battery(rng),
+            solar_capacity=rng.uniform(1, 12),
+            grid_carbon_intensity=rng.uniform(0.1, 1),
+            enable_weather_uncertainty=uncertainty,
+            forecast_error_range=rng.uniform(0, 0.5),
+            seed=seed,
+            scheduler=scheduler
+        )
+        assert legacy == vectorized
+
+
+@pytest.mark.parametrize("options", [
+    {"horizon_days": 10},
+    {"horizon_days": 2, "timestep_minutes": 15},
+    {"horizon_days": 3, "reference_window_hours": 6},
+    {"horizon_days": 3, "reference_window_hours": 12, "reference_window_mode": "centered"},
+    {"horizon_days": 30, "degradation": {"cycle_life": 500, "calendar_life_years": 2}},
+    {"enable_weather_uncertainty": True, "seed": 3, "outputs": []},
+    {"scheduler": "mpc", "enable_weather_uncertainty": True, "seed": 4, "horizon_days": 2, "timestep_minutes": 30}
+])
+def test_engines_match_options(options):
+    legacy, vectorized = _both_engines(**options)
+    assert legacy == vectorized
+
+
+def test_columnar_matches_rows():
+    rows = build_simulation_response(SimulationRequest(horizon_days=2)).model_dump()
+    columns = build_simulation_response(SimulationRequest(horizon_days=2, response_format="columnar")).model_dump()
+    assert columns["hourly_columns"]["grid_import_kwh"] == [row["grid_import_kwh"] for row in rows["hourly_results"]]
+    assert columns["summary"] == rows["summary"]
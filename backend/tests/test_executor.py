@@ -0,0 +1,102 @@
+"""
+Simulation executor: chunk sizes, environment configuration, result order
+and the in-process fallback.
+"""
+
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from simulator import executor as executor_module
+from simulator.executor import SimulationExecutor, get_executor
+
+
+def _square(value):
+    return value * value
+
+
+def _sleep_then_echo(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def test_chunk_size():
+    executor = SimulationExecutor(max_workers=2)
+    # Four chunks per worker, rounded up, at least one item
+    assert executor.get_chunk_size(0) == 1
+    assert executor.get_chunk_size(5) == 1
+    assert executor.get_chunk_size(8) == 1
+    assert executor.get_chunk_size(9) == 2
+    assert executor.get_chunk_size(1000) == 125
+    assert SimulationExecutor(max_workers=2, chunk_size=7).get_chunk_size(1000) == 7
+    # Nothing is forked until work is submitted
+    assert executor._pool is None
+
+
+@pytest.fixture
+def unconfigured(monkeypatch):
+    monkeypatch.setattr(executor_module, "_executor", None)
+    monkeypatch.setattr(executor_module, "_configured", False)
+    monkeypatch.delenv("MICROGRID_WORKERS", raising=False)
+    monkeypatch.delenv("MICROGRID_CHUNK_SIZE", raising=False)
+    yield monkeypatch
+    executor_module.shutdown_executor()
+
+
+@pytest.mark.parametrize("workers, chunk_size, expected", [
+    (None, None, None),
+    ("0", "16", None),
+    ("3", None, (3, None)),
+    (" 2 ", "16", (2, 16)),
+    ("auto", None, (os.cpu_count() or 1, None)),
+    ("AUTO", "4", (os.cpu_count() or 1, 4)),
+])
+def test_environment_configuration(unconfigured, workers, chunk_size, expected):
+    if workers is not None:
+        unconfigured.setenv("MICROGRID_WORKERS", workers)
+    if chunk_size is not None:
+        unconfigured.setenv("MICROGRID_CHUNK_SIZE", chunk_size)
+
+    executor = get_executor()
+    if expected is None:
+        assert executor is None
+    else:
+        assert (executor.max_workers, executor.chunk_size) == expected
+    # Read once: later changes to the environment don't reconfigure it
+    unconfigured.setenv("MICROGRID_WORKERS", "5")
+    assert get_executor() is executor
+
+
+def test_map_keeps_input_order():
+    executor = SimulationExecutor(max_workers=2)
+    try:
+        # The first item finishes last
+        items = [0.5] + [0.0] * 5
+        completed = [index for index, _ in executor.imap_unordered(_sleep_then_echo, items, chunk_size=1)]
+        assert sorted(completed) == list(range(len(items)))
+        assert completed[-1] == 0
+
+        reports = []
+        values = list(range(23))
+        results = executor.map(_square, values, chunk_size=4, progress=lambda done, total: reports.append((done, total)))
+        assert results == [value * value for value in values]
+        assert reports == [(done, len(values)) for done in range(1, len(values) + 1)]
+    finally:
+        executor.shutdown()
+    assert executor._pool is None
+
+
+def test_no_workers_runs_in_process(unconfigured):
+    unconfigured.setenv("MICROGRID_WORKERS", "0")
+    assert get_executor() is None
+
+    client = TestClient(main.app)
+    request = {"configurations": [{"solar_capacity": 3.0}, {"solar_capacity": 9.0}]}
+    response = client.post("/simulate/batch", json=request)
+    assert response.status_code == 200
+    assert response.json()["count"] == 2
+    single = client.post("/simulate", json={"solar_capacity": 9.0, "outputs": []})
+    assert response.json()["metrics"]["optimized_total_cost"][1] == single.json()["summary"]["optimized_total_cost"]
@@ -0,0 +1,120 @@
+"""
+Fleet simulation (/simulate/fleet) against single /simulate runs.
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from main import FleetSimulationRequest, SimulationRequest, build_simulation_response, run_simulation_fleet
+from simulator.executor import SimulationExecutor
+from simulator.fleet import fleet_totals, merge_fleet_series
+
+SITES = [
+    {},
+    {"solar_capacity": 0.5, "battery": {"capacity": 5.0, "initial_soc": 0.9}},
+    {"solar_capacity": 12.0, "battery": {"capacity": 20.0, "efficiency": 0.8, "initial_soc": 0.2}},
+    {"solar_capacity": 3.0, "battery": {"capacity": 13.5, "max_charge_rate": 2.0, "min_soc": 0.3,
+                                        "initial_soc": 0.3}},
+    {"solar_capacity": 8.0, "battery": {"capacity": 7.0, "efficiency": 0.95}}
+]
+
+# Three days at 30 minutes: three fleet blocks of one day each
+OPTIONS = {"horizon_days": 3, "timestep_minutes": 30}
+
+
+def _single_run(site):
+    return build_simulation_response(
+        SimulationRequest(**OPTIONS, **site, outputs=[], response_format="columnar")
+    )
+
+
+def test_sites_match_single_runs():
+    results = run_simulation_fleet(FleetSimulationRequest(sites=SITES, **OPTIONS))
+    assert results["count"] == len(SITES)
+
+    series = {name: np.zeros(3 * 48) for name in ("grid_import_kwh", "grid_export_kwh", "cost_usd")}
+    for index, site in enumerate(SITES):
+        single = _single_run(site)
+        summary = single.summary
+        fleet = {name: float(values[index]) for name, values in results["sites"].items()}
+        assert fleet["optimized_total_cost"] == summary["optimized_total_cost"]
+        assert fleet["baseline_total_cost"] == single.baseline_total_cost
+        assert fleet["total_cost_savings"] == summary["total_cost_savings"]
+        assert fleet["savings_percentage"] == summary["savings_percentage"]
+        assert fleet["net_emissions_kg"] == summary["carbon"]["optimized_emissions_kg"]
+        assert fleet["renewable_usage_pct"] == summary["renewable_usage_pct"]
+        assert fleet["total_grid_import_kwh"] == summary["grid"]["total_import_kwh"]
+        assert fleet["total_grid_export_kwh"] == summary["grid"]["total_export_kwh"]
+        for name in series:
+            series[name] += single.hourly_columns[name]
+
+    # Fleet series are unrounded sums; the single-run columns are rounded per step
+    for name, values in series.items():
+        assert results["series"][name] == pytest.approx(values, abs=len(SITES) * 0.005)
+    assert results["series"]["hour"].tolist() == [step / 2 for step in range(3 * 48)]
+
+
+def test_chunks_blocks_and_executor_agree(monkeypatch):
+    request = FleetSimulationRequest(sites=SITES, **OPTIONS)
+    whole = run_simulation_fleet(request)
+
+    # Uneven site chunks (2 + 2 + 1) and blocks shorter than a day
+    monkeypatch.setattr(main, "FLEET_CHUNK_SIZE", 2)
+    monkeypatch.setattr(main, "FLEET_BLOCK_HOURS", 7)
+    chunked = run_simulation_fleet(request)
+    executor = SimulationExecutor(max_workers=2)
+    try:
+        pooled = run_simulation_fleet(request, executor=executor)
+    finally:
+        executor.shutdown()
+
+    for other in (chunked, pooled):
+        for name, values in whole["sites"].items():
+            assert other["sites"][name].tolist() == values.tolist()
+        for name, values in whole["series"].items():
+            assert other["series"][name] == pytest.approx(values, rel=1e-12, abs=1e-12)
+        assert other["fleet"] == whole["fleet"]
+
+
+def test_merge_and_totals():
+    first = {"hour": np.array([0.0, 0.5]), "grid_import_kwh": np.array([1.0, 3.0]),
+             "grid_export_kwh": np.array([0.0, 0.5]), "peak_site_import_kwh": np.array([1.0, 2.0])}
+    second = {"hour": np.array([0.0, 0.5]), "grid_import_kwh": np.array([2.0, 0.5]),
+              "grid_export_kwh": np.array([0.25, 0.0]), "peak_site_import_kwh": np.array([2.0, 0.5])}
+    merged = merge_fleet_series([first, second])
+    assert merged["hour"].tolist() == [0.0, 0.5]
+    assert merged["grid_import_kwh"].tolist() == [3.0, 3.5]
+    assert merged["peak_site_import_kwh"].tolist() == [2.0, 2.0]
+
+    sites = {
+        "baseline_total_cost": np.array([10.0, 30.0]),
+        "optimized_total_cost": np.array([8.0, 20.0]),
+        "net_emissions_kg": np.array([1.5, 2.25]),
+        "total_grid_import_kwh": np.array([4.0, 4.5]),
+        "total_grid_export_kwh": np.array([0.5, 0.25])
+    }
+    assert fleet_totals(merged, sites, timestep_hours=0.5) == {
+        "baseline_total_cost": 40.0,
+        "optimized_total_cost": 28.0,
+        "total_cost_savings": 12.0,
+        "savings_percentage": 30.0,
+        "net_emissions_kg": 3.75,
+        "total_grid_import_kwh": 8.5,
+        "total_grid_export_kwh": 0.75,
+        "peak_grid_import_kw": 7.0,
+        "peak_grid_export_kw": 1.0
+    }
+
+
+def test_fleet_endpoint():
+    client = TestClient(main.app)
+    response = client.post("/simulate/fleet", json={"sites": SITES[:2], **OPTIONS})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 2
+    assert body["sites"]["optimized_total_cost"][1] == _single_run(SITES[1]).summary["optimized_total_cost"]
+    assert len(body["series"]["grid_import_kwh"]) == 3 * 48
+
+    assert client.post("/simulate/fleet", json={"sites": []}).status_code == 422
@@ -0,0 +1,129 @@
+"""
+Background jobs: lifecycle through the API, and results of jobs that
+finish between two polls of their pipe.
+"""
+
+import multiprocessing
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from simulator import jobs
+
+
+@pytest.fixture
+def client():
+    jobs.configure_jobs(max_workers=1, max_queued=2)
+    yield TestClient(main.app)
+    jobs.shutdown_jobs()
+
+
+def _wait(client, job_id, timeout=60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = client.get(f"/jobs/{job_id}").json()
+        if status["status"] in jobs.FINISHED_STATUSES:
+            return status
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def _tiny(payload, progress):
+    return payload
+
+
+def test_submit_and_poll(client):
+    request = {"horizon_days": 2, "timestep_minutes": 30}
+    submitted = client.post("/jobs", json={"kind": "simulate", "request": request})
+    assert submitted.status_code == 202
+    assert submitted.json()["status"] in ("queued", "running")
+
+    finished = _wait(client, submitted.json()["id"])
+    assert finished["status"] == "succeeded"
+    assert finished["progress"]["fraction"] == 1.0
+    assert finished["result"] == client.post("/simulate", json=request).json()
+
+
+def test_cancel_and_queue_limit(client):
+    running = client.post("/jobs", json={"kind": "simulate", "request": {"horizon_days": 365, "timestep_minutes": 5}})
+    queued = [client.post("/jobs", json={"kind": "simulate", "request": {}}) for _ in range(2)]
+    assert client.post("/jobs", json={"kind": "simulate", "request": {}}).status_code == 429
+
+    assert client.delete(f"/jobs/{queued[0].json()['id']}").json()["status"] == "cancelled"
+    assert client.delete(f"/jobs/{running.json()['id']}").json()["status"] == "cancelled"
+    assert _wait(client, queued[1].json()["id"])["status"] == "succeeded"
+    # Deleting a finished job discards it
+    assert client.delete(f"/jobs/{queued[1].json()['id']}").status_code == 200
+    assert client.get(f"/jobs/{queued[1].json()['id']}").status_code == 404
+
+
+def test_failed_job(client):
+    # Valid request, but neither configurations nor grid: fails in the worker
+    submitted = client.post("/jobs", json={"kind": "batch", "request": {}})
+    failed = _wait(client, submitted.json()["id"])
+    assert failed["status"] == "failed"
+    assert "ValueError" in failed["error"]
+    assert client.get("/jobs").json()["stats"]["failed"] == 1
+
+
+def test_invalid_job_request(client):
+    assert client.post("/jobs", json={"kind": "nope", "request": {}}).status_code == 422
+    assert client.post("/jobs", json={"kind": "simulate", "request": {"horizon_days": 0}}).status_code == 422
+    assert client.get("/jobs/unknown").status_code == 404
+
+
+def test_fast_jobs_keep_their_results():
+    manager = jobs.JobManager(max_workers=4, max_queued=64)
+    submitted = [manager.submit("tiny", _tiny, index) for index in range(40)]
+    deadline = time.time() + 60
+    while not all(job.finished for job in submitted) and time.time() < deadline:
+        time.sleep(0.01)
+    manager.shutdown()
+    assert [(job.status, job.result) for job in submitted] == [("succeeded", index) for index in range(40)]
+
+
+class _ExitedProcess:
+    exitcode = 0
+
+    def is_alive(self):
+        return False
+
+    def join(self):
+        pass
+
+
+class _LateReceiver:
+    """Pipe end whose first wait times out although the child then sends and exits."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.timed_out = False
+
+    def poll(self, timeout=0.0):
+        if timeout > 0 and not self.timed_out:
+            self.timed_out = True
+            return False
+        return self.connection.poll(timeout)
+
+    def recv(self):
+        return self.connection.recv()
+
+    def close(self):
+        self.connection.close()
+
+
+def test_result_sent_after_poll_timeout():
+    manager = jobs.JobManager()
+    job = jobs.Job("tiny", _tiny, None, time.time())
+    job.status = "running"
+    job.process = _ExitedProcess()
+
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    sender.send(("result", 42))
+    sender.close()
+    manager._follow(job, _LateReceiver(receiver))
+
+    assert job.status == "succeeded"
+    assert job.result == 42
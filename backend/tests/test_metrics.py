@@ -0,0 +1,126 @@
+"""
+/metrics: Prometheus text exposition format and request accounting.
+"""
+
+import math
+import re
+
+from fastapi.testclient import TestClient
+
+import main
+from simulator.instrumentation import MetricsRegistry
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{(.*)\})? (\S+)$')
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"(,|$)')
+
+
+def parse(text):
+    """
+    Parse the text format strictly.
+
+    Returns:
+        {family: {"type": ..., "samples": [(name, labels, value)]}}
+    """
+    assert text.endswith("\n")
+    families = {}
+    family_name = family = None
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            family_name = line.split(" ")[2]
+            assert family_name not in families, f"family {family_name} repeated"
+            family = families[family_name] = {"type": None, "samples": []}
+        elif line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert name == family_name and family["type"] is None
+            assert kind in ("counter", "gauge", "histogram")
+            family["type"] = kind
+        else:
+            match = SAMPLE.match(line)
+            assert match, f"malformed line: {line!r}"
+            name, _, label_text, value = match.groups()
+            labels = {}
+            if label_text:
+                pairs = LABEL.findall(label_text)
+                assert "".join(f'{key}="{val}"{sep}' for key, val, sep in pairs) == label_text
+                labels = dict((key, val) for key, val, _ in pairs)
+            assert family is not None and family["type"] is not None
+            suffixes = ("_bucket", "_sum", "_count") if family["type"] == "histogram" else ("",)
+            assert any(name == family_name + suffix for suffix in suffixes), f"{name} outside its family"
+            family["samples"].append((name, labels, float(value)))
+    return families
+
+
+def check_histograms(families):
+    for name, family in families.items():
+        if family["type"] != "histogram":
+            continue
+        series = {}
+        for sample, labels, value in family["samples"]:
+            key = tuple(sorted((k, v) for k, v in labels.items() if k != "le"))
+            series.setdefault(key, {"buckets": []})
+            if sample.endswith("_bucket"):
+                series[key]["buckets"].append((float(labels["le"]), value))
+            else:
+                series[key][sample[len(name) + 1:]] = value
+        for parts in series.values():
+            bounds = [bound for bound, _ in parts["buckets"]]
+            counts = [count for _, count in parts["buckets"]]
+            assert bounds == sorted(bounds) and bounds[-1] == math.inf
+            assert counts == sorted(counts), "buckets must be cumulative"
+            assert counts[-1] == parts["count"]
+            assert parts["sum"] >= 0
+
+
+def _value(families, name, **labels):
+    """Value of one sample (0 if absent), by sample name and exact labels."""
+    return sum(value for family in families.values() for sample, sample_labels, value in family["samples"]
+               if sample == name and sample_labels == labels)
+
+
+def test_metrics_format_and_counts():
+    client = TestClient(main.app)
+    before = parse(client.get("/metrics").text)
+
+    # Not served from the result cache, so its steps are counted
+    client.post("/simulate", json={"horizon_days": 2, "grid_carbon_intensity": 0.4213579})
+    client.post("/simulate", json={"horizon_days": 0})
+    client.get("/jobs/missing")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    families = parse(response.text)
+    check_histograms(families)
+
+    requests = "microgrid_http_requests_total"
+    assert families[requests]["type"] == "counter"
+    for labels in ({"endpoint": "/simulate", "method": "POST", "status": "200"},
+                   {"endpoint": "/simulate", "method": "POST", "status": "422"},
+                   {"endpoint": "/jobs/{job_id}", "method": "GET", "status": "404"}):
+        assert _value(families, requests, **labels) == _value(before, requests, **labels) + 1
+
+    stages = {labels["stage"] for _, labels, _ in families["microgrid_stage_duration_seconds"]["samples"]
+              if labels.get("endpoint") == "/simulate"}
+    assert {"validation", "engine", "summary"} <= stages
+    assert families["microgrid_http_request_duration_seconds"]["type"] == "histogram"
+    steps = "microgrid_simulated_steps_total"
+    assert _value(families, steps, endpoint="/simulate") >= _value(before, steps, endpoint="/simulate") + 48
+
+
+def test_registry_rendering():
+    registry = MetricsRegistry()
+    registry.describe("app_events_total", "counter", "Events")
+    registry.inc("app_events_total", kind='quote " and \\ and\nnewline')
+    registry.inc("app_events_total", 2, kind="plain")
+    registry.observe("app_latency_seconds", 0.003)
+    registry.observe("app_latency_seconds", 100.0)
+    registry.add_collector(lambda: [("app_queue", "gauge", "Queued", [({}, 3)])])
+
+    families = parse(registry.render())
+    check_histograms(families)
+    assert _value(families, "app_events_total", kind='quote \\" and \\\\ and\\nnewline') == 1
+    assert _value(families, "app_events_total", kind="plain") == 2
+    assert _value(families, "app_latency_seconds_count") == 2
+    assert _value(families, "app_latency_seconds_bucket", le="0.005") == 1
+    assert _value(families, "app_latency_seconds_bucket", le="+Inf") == 2
+    assert families["app_queue"]["samples"] == [("app_queue", {}, 3.0)]
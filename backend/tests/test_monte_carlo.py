@@ -0,0 +1,50 @@
+"""
+Monte Carlo weather uncertainty: seed reproducibility and the zero-error case.
+"""
+
+from fastapi.testclient import TestClient
+
+import main
+from main import MonteCarloRequest, SimulationRequest, build_simulation_response, run_monte_carlo
+from simulator.executor import SimulationExecutor
+from simulator.monte_carlo import MONTE_CARLO_BLOCK
+
+
+def test_seed_reproduces_results():
+    request = MonteCarloRequest(samples=500, seed=7)
+    first = run_monte_carlo(request)
+    assert first["seed"] == 7
+    assert run_monte_carlo(request) == first
+    assert run_monte_carlo(MonteCarloRequest(samples=500, seed=8))["totals"] != first["totals"]
+
+    # A drawn seed is returned and reproduces the run
+    drawn = run_monte_carlo(MonteCarloRequest(samples=200))
+    assert run_monte_carlo(MonteCarloRequest(samples=200, seed=drawn["seed"])) == drawn
+
+
+def test_process_pool_gives_the_same_results():
+    # Several blocks, so workers finish them in any order
+    request = MonteCarloRequest(samples=2 * MONTE_CARLO_BLOCK + 100, seed=3)
+    executor = SimulationExecutor(max_workers=2)
+    try:
+        pooled = run_monte_carlo(request, executor=executor)
+    finally:
+        executor.shutdown()
+    assert pooled == run_monte_carlo(request)
+
+
+def test_zero_forecast_error_matches_single_run():
+    results = run_monte_carlo(MonteCarloRequest(samples=20, seed=1, forecast_error_range=0))
+    summary = build_simulation_response(SimulationRequest()).summary
+    for name in ("optimized_total_cost", "total_cost_savings", "renewable_usage_pct"):
+        band = results["totals"][name]
+        assert band["p5"] == band["p50"] == band["p95"] == summary[name]
+
+
+def test_monte_carlo_endpoint():
+    client = TestClient(main.app)
+    request = {"samples": 300, "seed": 11}
+    first = client.post("/simulate/monte-carlo", json=request)
+    assert first.status_code == 200
+    assert first.json() == client.post("/simulate/monte-carlo", json=request).json()
+    assert client.post("/simulate/monte-carlo", json={"samples": 0}).status_code == 422
@@ -0,0 +1,72 @@
+"""
+MPC re-planning: forecast revisions must reach the next decision.
+"""
+
+import numpy as np
+import pytest
+
+from main import SimulationRequest, build_simulation_response
+from models.battery import Battery
+from scheduler.mpc import MPCScheduler
+
+
+# Cheap grid for six hours, then expensive; no solar in the initial forecast
+LOADS = [1.0] * 24
+PRICES = [0.05] * 6 + [0.40] * 18
+NO_SOLAR = [0.0] * 24
+
+
+def _planned(**kwargs):
+    battery = Battery(capacity=10.0, initial_soc=0.2, min_soc=0.2)
+    scheduler = MPCScheduler(**kwargs)
+    scheduler.optimize_schedule(LOADS, NO_SOLAR, PRICES, battery)
+    return scheduler, battery
+
+
+def test_forecast_revision_changes_next_action():
+    scheduler, battery = _planned()
+    first = scheduler.schedule_hour(0, LOADS[0], 0.0, battery, PRICES[0], explain=False)
+    assert first["battery_charged_kwh"] > 0  # stock up for the expensive hours
+
+    revised, revised_battery = _planned()
+    # Plenty of solar expected for the expensive hours: nothing to store for
+    revised.update_forecast(1, LOADS[1:], [5.0] * 23)
+    action = revised.schedule_hour(0, LOADS[0], 0.0, revised_battery, PRICES[0], explain=False)
+    assert action["battery_charged_kwh"] == 0
+
+
+def test_steps_apply_in_order():
+    scheduler, battery = _planned()
+    scheduler.schedule_hour(0.0, LOADS[0], 0.0, battery, PRICES[0], explain=False, step=0)
+    with pytest.raises(ValueError, match="expected step 1, got 2"):
+        scheduler.schedule_hour(2.0, LOADS[2], 0.0, battery, PRICES[2], explain=False, step=2)
+    scheduler.schedule_hour(1.0, LOADS[1], 0.0, battery, PRICES[1], explain=False, step=1)
+
+
+def test_measured_error_revises_forecast():
+    solars = [0.0] * 6 + [3.0] * 12 + [0.0] * 6
+    battery = Battery(capacity=10.0)
+    scheduler = MPCScheduler()
+    scheduler.optimize_schedule(LOADS, solars, PRICES, battery)
+    baseline = scheduler._net_load.copy()
+
+    for step in range(7):
+        # Solar comes in at half the forecast
+        scheduler.schedule_hour(step, LOADS[step], solars[step] / 2, battery, PRICES[step], explain=False)
+
+    stats = scheduler.solve_stats()
+    assert stats["revised_steps"] > 0
+    # The next three hours expect less solar (a larger net load), fading with distance
+    revision = scheduler._net_load[7:10] - baseline[7:10]
+    assert np.all(revision > 0) and revision[0] > revision[1] > revision[2]
+    assert np.array_equal(scheduler._net_load[10:], baseline[10:])
+
+
+def test_no_revision_without_forecast_error():
+    response = build_simulation_response(SimulationRequest(scheduler="mpc", horizon_days=2))
+    assert response.summary["scheduler_stats"]["revised_steps"] == 0
+
+    response = build_simulation_response(
+        SimulationRequest(scheduler="mpc", horizon_days=2, enable_weather_uncertainty=True, seed=1)
+    )
+    assert response.summary["scheduler_stats"]["revised_steps"] > 0
@@ -0,0 +1,57 @@
+"""
+Planning schedulers (lp, dp, mpc): horizon limit and plan quality.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+import main
+from main import MAX_PLAN_STEPS, SimulationRequest, build_simulation_response
+
+
+@pytest.mark.parametrize("scheduler", ["lp", "dp", "mpc"])
+def test_plan_horizon_limit(scheduler):
+    # At the limit: 366 days hourly; above it: 31 days at 5 minutes
+    SimulationRequest(scheduler=scheduler, horizon_days=MAX_PLAN_STEPS // 24)
+    with pytest.raises(ValidationError, match="at most"):
+        SimulationRequest(scheduler=scheduler, horizon_days=31, timestep_minutes=5)
+
+    client = TestClient(main.app)
+    response = client.post("/simulate", json={"scheduler": scheduler, "horizon_days": 367})
+    assert response.status_code == 422
+
+
+def test_rule_based_horizon_not_limited():
+    SimulationRequest(horizon_days=3660, timestep_minutes=5)
+
+
+def test_optimal_plans_beat_rules():
+    costs = {
+        scheduler: build_simulation_response(
+            SimulationRequest(scheduler=scheduler, horizon_days=3)
+        ).summary["optimized_total_cost"]
+        for scheduler in ("rule_based", "lp", "dp")
+    }
+    assert costs["lp"] <= costs["rule_based"]
+    # DP is optimal up to its SoC-grid resolution
+    assert costs["dp"] <= costs["rule_based"]
+    assert costs["dp"] == pytest.approx(costs["lp"], abs=0.05 * abs(costs["lp"]) + 0.01)
+
+
+def test_dp_cost_blocks_do_not_change_the_plan():
+    from data.load_profile import get_load_profile
+    from data.price_profile import get_price_profile
+    from data.solar_profile import get_solar_profile
+    from models.battery import Battery
+    from scheduler.dp import DPScheduler
+
+    hours = 24 * 5
+    profiles = (get_load_profile(hours), get_solar_profile(hours), get_price_profile(hours))
+    plans = []
+    for block in (7, 10_000):
+        scheduler = DPScheduler()
+        scheduler.COST_BLOCK_STEPS = block
+        plans.append(scheduler.optimize_schedule(*profiles, Battery(capacity=10.0)))
+    for name in plans[0]:
+        assert (plans[0][name] == plans[1][name]).all()
@@ -0,0 +1,91 @@
+"""
+Price index queries against a naive scan of the profile, and rule-based
+scheduling on NumPy price arrays (as the profile store returns them).
+"""
+
+import random
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from data.price_profile import get_price_profile, get_stored_price_profile
+from data.profile_store import ProfileStore
+from main import SimulationRequest
+from models.battery import Battery
+from scheduler.price_index import PriceIndex, rolling_mean
+from scheduler.rule_engine import RuleBasedScheduler
+
+
+def _profiles():
+    rng = random.Random(0)
+    yield get_price_profile(72)
+    yield [0.1] * 30  # all ties
+    yield [rng.choice((0.08, 0.15, 0.3)) for _ in range(101)]  # many ties
+    yield [rng.uniform(0.05, 0.5) for _ in range(257)]
+    yield [0.2]
+
+
+@pytest.mark.parametrize("prices", list(_profiles()))
+def test_queries_match_naive_scan(prices):
+    index = PriceIndex(prices)
+    steps = len(prices)
+    order = sorted(range(steps), key=lambda step: (prices[step], step))
+
+    for step in range(steps):
+        later = prices[step + 1:]
+        assert index.rank(step) == order.index(step)
+        assert index.max_ahead(step) == (max(later) if later else -np.inf)
+        assert index.min_ahead(step) == (min(later) if later else np.inf)
+        higher = next((i for i in range(step + 1, steps) if prices[i] > prices[step]), None)
+        assert index.next_higher_step(step) == higher
+        for end in (step + 1, step + 5, steps):
+            assert index.higher_price_ahead(step, end) == any(
+                prices[i] > prices[step] for i in range(step + 1, min(end, steps))
+            )
+
+    rng = random.Random(steps)
+    for _ in range(200):
+        start, end = sorted(rng.randrange(steps + 1) for _ in range(2))
+        window = prices[start:end]
+        assert index.max_between(start, end) == (max(window) if window else -np.inf)
+        assert index.min_between(start, end) == (min(window) if window else np.inf)
+
+
+def test_rolling_mean_matches_naive_scan():
+    prices = list(_profiles())[3]
+    for window in (1, 4, 24, 500):
+        trailing = [np.mean(prices[max(0, i - window + 1):i + 1]) for i in range(len(prices))]
+        assert rolling_mean(prices, window) == pytest.approx(trailing)
+        start = [max(0, i - window // 2) for i in range(len(prices))]
+        centered = [np.mean(prices[s:min(len(prices), i - window // 2 + window)]) for i, s in enumerate(start)]
+        assert rolling_mean(prices, window, centered=True) == pytest.approx(centered)
+
+
+def test_scheduler_accepts_numpy_prices(tmp_path):
+    store = ProfileStore(str(tmp_path))
+    store.write("price", get_price_profile(48))
+    stored = get_stored_price_profile(48, store=store)
+
+    for prices in (np.ones(48), stored):
+        scheduler = RuleBasedScheduler(prices, reference_window=6)
+        assert scheduler.get_daily_avg_price() == pytest.approx(float(np.mean(prices)))
+        decision = scheduler.schedule_hour(1.5, 1.0, 0.0, Battery(capacity=10.0), float(prices[3]), step=3)
+        assert decision["grid_used_kwh"] >= 0
+        # The rolling reference is looked up by step, never derived from the hour label
+        with pytest.raises(ValueError):
+            scheduler.schedule_hour(1.5, 1.0, 0.0, Battery(capacity=10.0), float(prices[3]))
+
+    scheduler = RuleBasedScheduler()
+    scheduler.set_price_profile(np.ones(48))
+    assert scheduler.get_reference_price() == 1.0
+    with pytest.raises(ValueError):
+        RuleBasedScheduler().get_reference_price()
+
+
+@pytest.mark.parametrize("scheduler", ["lp", "dp", "mpc"])
+def test_reference_window_needs_rule_based(scheduler):
+    with pytest.raises(ValidationError, match="only applies to the rule_based scheduler"):
+        SimulationRequest(scheduler=scheduler, reference_window_hours=6)
+    SimulationRequest(scheduler=scheduler)
+    SimulationRequest(reference_window_hours=6)
@@ -0,0 +1,145 @@
+"""
+Simulations on stored profile series (profile_source="store").
+"""
+
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+import main
+from data import profile_store
+from data.load_profile import get_load_profile
+from data.price_profile import get_price_profile
+from data.solar_profile import get_solar_shape
+from main import (
+    FleetSimulationRequest, SimulationRequest, _profile, build_simulation_response, run_simulation_fleet
+)
+from simulator.time_engine import TimeEngine
+
+
+def _fill(store, hours=72, steps_per_hour=1, load_scale=None):
+    """Builtin profiles, written to the store at a given resolution."""
+    repeat = lambda values: np.repeat(np.asarray(values, dtype=np.float32), steps_per_hour)
+    loads = np.asarray(get_load_profile(hours), dtype=np.float32)
+    if load_scale is not None:
+        loads = loads * np.asarray(load_scale, dtype=np.float32)
+    timestep = 60 // steps_per_hour
+    # Dividing by a power of two is exact, so every resolution holds the same hourly energy
+    store.write("load", repeat(loads) / steps_per_hour, timestep)
+    store.write("solar", repeat(get_solar_shape(hours)) / steps_per_hour, timestep)
+    store.write("price", repeat(get_price_profile(hours)), timestep)
+
+
+def _numbers(response):
+    result = response.model_dump() if hasattr(response, "model_dump") else response
+    result["summary"].pop("scheduler_stats", None)
+    return {"columns": result["hourly_columns"], "summary": result["summary"]}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_store, "_store", profile_store.ProfileStore(str(tmp_path)))
+    monkeypatch.setattr(profile_store, "_configured", True)
+    return profile_store.get_profile_store()
+
+
+@pytest.mark.parametrize("scheduler", ["rule_based", "dp"])
+def test_stored_builtin_profiles_match_builtin(store, scheduler):
+    _fill(store)
+    options = {"scheduler": scheduler, "horizon_days": 2, "response_format": "columnar"}
+    builtin = _numbers(build_simulation_response(SimulationRequest(**options)))
+    for engine in ("vectorized", "legacy"):
+        stored = _numbers(build_simulation_response(
+            SimulationRequest(profile_source="store", engine=engine, **options)
+        ))
+        # Stored series are float32, which can tip exact ties (solar == load) either way
+        for column in ("load_kwh", "solar_kwh"):
+            assert stored["columns"][column] == pytest.approx(builtin["columns"][column], abs=1e-6)
+        assert stored["summary"]["optimized_total_cost"] == pytest.approx(
+            builtin["summary"]["optimized_total_cost"], abs=0.01
+        )
+
+
+@pytest.mark.parametrize("timestep", [60, 15])
+def test_stored_resolution_is_converted(store, timestep):
+    request = SimulationRequest(
+        profile_source="store", horizon_days=2, timestep_minutes=timestep, response_format="columnar"
+    )
+    results = []
+    for steps_per_hour in (1, 2, 4):
+        _fill(store, steps_per_hour=steps_per_hour)
+        results.append(_numbers(build_simulation_response(request)))
+    assert results[0] == results[1] == results[2]
+
+
+def test_stored_blocks_stay_arrays(store):
+    _fill(store, steps_per_hour=4)
+    request = SimulationRequest(profile_source="store", timestep_minutes=30)
+    time_engine = TimeEngine(total_hours=72, timestep_minutes=30)
+    for kind in ("load", "solar", "price"):
+        block = _profile(request, time_engine, kind, 24, 24)
+        assert isinstance(block, np.ndarray) and block.dtype == np.float64
+        assert block.shape == (48,)
+    stored = store.read("load", 24, 24)
+    np.testing.assert_array_equal(
+        _profile(request, time_engine, "load", 24, 24), stored.reshape(-1, 2).astype(np.float64).sum(axis=1)
+    )
+
+
+def test_profile_start_hour(store, tmp_path):
+    # Day 2 of the stored series, and a series holding only that day
+    _fill(store, hours=48, load_scale=[1.0] * 24 + [1.5] * 24)
+    offset = _numbers(build_simulation_response(SimulationRequest(
+        profile_source="store", profile_start_hour=24, response_format="columnar"
+    )))
+    _fill(store, hours=24, load_scale=[1.5] * 24)
+    assert offset == _numbers(build_simulation_response(SimulationRequest(
+        profile_source="store", response_format="columnar"
+    )))
+
+    with pytest.raises(ValidationError, match="profile_source"):
+        SimulationRequest(profile_start_hour=24)
+
+
+def test_fleet_and_stream_on_stored_profiles(store):
+    _fill(store)
+    sites = [{}, {"solar_capacity": 3.0, "battery": {"capacity": 5.0}}]
+    builtin = run_simulation_fleet(FleetSimulationRequest(sites=sites, horizon_days=2))
+    stored = run_simulation_fleet(FleetSimulationRequest(sites=sites, horizon_days=2, profile_source="store"))
+    np.testing.assert_allclose(stored["sites"]["optimized_total_cost"],
+                               builtin["sites"]["optimized_total_cost"], atol=0.01)
+
+    client = TestClient(main.app)
+    request = {"profile_source": "store", "horizon_days": 2, "timestep_minutes": 15}
+    lines = [json.loads(line) for line in client.post("/simulate/stream", json=request).text.splitlines()]
+    assert lines[-1]["type"] == "summary"
+    assert lines[-1]["summary"] == client.post("/simulate", json=request).json()["summary"]
+
+
+def test_store_errors(store, monkeypatch):
+    client = TestClient(main.app)
+    short = {"profile_source": "store", "horizon_days": 4}
+    for path, request in (("/simulate", short), ("/simulate/stream", short),
+                          ("/simulate/fleet", {**short, "sites": [{}]})):
+        response = client.post(path, json=request)
+        assert response.status_code == 400
+        assert "No stored" in response.json()["detail"]
+
+    _fill(store)
+    for path, request in (("/simulate", short), ("/simulate/stream", short),
+                          ("/simulate/fleet", {**short, "sites": [{}]})):
+        response = client.post(path, json=request)
+        assert response.status_code == 400
+        assert "outside the stored" in response.json()["detail"]
+
+    store.write("price", get_price_profile(72) * 3, timestep_minutes=20)
+    response = client.post("/simulate", json={"profile_source": "store", "timestep_minutes": 15})
+    assert response.status_code == 400
+
+    monkeypatch.setattr(profile_store, "_store", None)
+    response = client.post("/simulate", json={"profile_source": "store"})
+    assert response.status_code == 400
+    assert "MICROGRID_PROFILE_DIR" in response.json()["detail"]
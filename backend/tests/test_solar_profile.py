@@ -0,0 +1,39 @@
+"""
+Solar profiles: the 6 kW reference system is reproduced exactly and
+other system sizes scale linearly.
+"""
+
+import pytest
+
+from data.solar_profile import (
+    REFERENCE_CAPACITY_KW, _reference_profile, get_solar_profile, get_solar_shape, get_total_daily_solar
+)
+
+# The daily profile before it was normalized per kWp (kWh per hour, 6 kW)
+REFERENCE = [
+    0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.5, 1.5, 2.5, 3.5, 4.0, 4.8,
+    5.0, 4.8, 4.2, 3.8, 3.0, 2.0, 1.0, 0.3, 0.0, 0.0, 0.0, 0.0
+]
+
+
+def test_reference_system_is_exact():
+    assert _reference_profile() == REFERENCE
+    assert get_solar_profile() == REFERENCE
+    assert get_solar_profile(solar_capacity=6) == REFERENCE
+    assert get_solar_profile(solar_capacity=REFERENCE_CAPACITY_KW) == REFERENCE
+    # Longer horizons and offsets repeat the same values
+    assert get_solar_profile(72, solar_capacity=6) == REFERENCE * 3
+    assert get_solar_profile(30, start_hour=10, solar_capacity=6) == (REFERENCE * 3)[10:40]
+    assert get_total_daily_solar() == sum(REFERENCE)
+
+
+@pytest.mark.parametrize("solar_capacity", [0.5, 3.0, 7.3, 12.0, 250.0])
+def test_other_sizes_scale_linearly(solar_capacity):
+    scale = solar_capacity / REFERENCE_CAPACITY_KW
+    assert get_solar_profile(48, start_hour=5, solar_capacity=solar_capacity) == pytest.approx(
+        [value * scale for value in (REFERENCE * 3)[5:53]], rel=1e-12
+    )
+    assert get_total_daily_solar(solar_capacity) == pytest.approx(sum(REFERENCE) * scale, rel=1e-12)
+    assert get_solar_profile(solar_capacity=solar_capacity) == [
+        value * solar_capacity for value in get_solar_shape()
+    ]
@@ -0,0 +1,26 @@
+"""
+Cold start: importing the app leaves optional subsystems unimported.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+# Imported on first use, never by `import main`
+LAZY_MODULES = ("scipy", "uvicorn", "simulator.jobs", "simulator.monte_carlo")
+
+
+def test_import_main_stays_lean():
+    # A fresh interpreter: this test session has imported everything already
+    script = (
+        "import json, sys\n"
+        "import main\n"
+        f"print(json.dumps([name for name in {LAZY_MODULES!r} if name in sys.modules]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND, capture_output=True, text=True, check=True
+    )
+    assert json.loads(result.stdout.splitlines()[-1]) == []
@@ -0,0 +1,88 @@
+"""
+Streaming (/simulate/stream) against the buffered /simulate response,
+and the buffered rows limit.
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from main import SimulationRequest, build_simulation_response, stream_simulation
+
+
+def _stream(request):
+    chunks = list(stream_simulation(request))
+    lines = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    return chunks, lines
+
+
+def _buffered(request):
+    response = build_simulation_response(request).model_dump()
+    response["summary"].pop("scheduler_stats", None)
+    return response
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"horizon_days": 10, "timestep_minutes": 15, "enable_weather_uncertainty": True, "seed": 5},
+    {"horizon_days": 9, "scheduler": "dp", "degradation": {}},
+    {"horizon_days": 3, "scheduler": "mpc", "timestep_minutes": 30, "enable_weather_uncertainty": True, "seed": 2},
+    {"horizon_days": 8, "outputs": [], "reference_window_hours": 24},
+])
+def test_rows_match_simulate(options):
+    request = SimulationRequest(**options)
+    chunks, lines = _stream(request)
+    buffered = _buffered(request)
+
+    steps = [line for line in lines if line.pop("type") == "step"]
+    assert steps == buffered["hourly_results"]
+    summary = lines[-1]
+    summary["summary"].pop("scheduler_stats", None)
+    for name in ("config", "summary", "baseline_total_cost", "optimized_total_cost",
+                 "total_cost_savings", "savings_percentage"):
+        assert summary[name] == buffered[name]
+    # One chunk per one-week block, plus the summary
+    assert len(chunks) == -(-request.horizon_days * 24 // main.SIMULATION_CHUNK_HOURS) + 1
+
+
+def test_columnar_blocks_match_simulate():
+    request = SimulationRequest(horizon_days=15, timestep_minutes=30, response_format="columnar")
+    _, lines = _stream(request)
+    buffered = _buffered(request)
+
+    blocks = [line for line in lines if line["type"] == "block"]
+    assert [block["start_step"] for block in blocks] == [0, 336, 672]
+    columns = {name: [value for block in blocks for value in block["columns"][name]]
+               for name in blocks[0]["columns"]}
+    assert columns == buffered["hourly_columns"]
+    assert lines[-1]["summary"] == buffered["summary"]
+
+
+def test_failure_is_reported_in_band(monkeypatch):
+    def failing(config):
+        yield from ()
+        raise RuntimeError("profile unavailable")
+
+    monkeypatch.setattr(main, "iter_simulation", failing)
+    client = TestClient(main.app)
+    response = client.post("/simulate/stream", json={})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert json.loads(response.text.splitlines()[-1]) == {
+        "type": "error", "detail": "Simulation failed: profile unavailable"
+    }
+
+
+def test_rows_step_limit():
+    client = TestClient(main.app)
+    response = client.post("/simulate", json={"horizon_days": 367, "timestep_minutes": 15, "outputs": []})
+    assert response.status_code == 422
+    assert "/simulate/stream" in response.json()["detail"]
+
+    # Columnar has no row limit
+    columnar = {"horizon_days": 367, "timestep_minutes": 15, "outputs": [], "response_format": "columnar"}
+    response = client.post("/simulate", json=columnar)
+    assert response.status_code == 200
+    assert len(response.json()["hourly_columns"]["cost_usd"]) == 367 * 96